@@ -4,7 +4,7 @@ import synapsis
 def price_event(price, symbol, state: synapsis.StrategyState):
     """ This function will give an updated price every 15 seconds from our definition below """
     state.variables['history'].append(price)
-    rsi = synapsis.indicators.rsi(state.variables['history'])
+    rsi = synapsis.indicators.rsi(state.variables['history'].close)
     if rsi[-1] < 30 and not state.variables['owns_position']:
         # Dollar cost average buy
         buy = synapsis.trunc(state.interface.cash/price, 2)
@@ -19,8 +19,10 @@ def price_event(price, symbol, state: synapsis.StrategyState):
 
 def init(symbol, state: synapsis.StrategyState):
     # Download price data to give context to the algo
-    state.variables['history'] = state.interface.history(symbol, to=150, return_as='deque',
-                                                         resolution=state.resolution)['close']
+    history = state.interface.history(symbol, to=150, return_as='array', resolution=state.resolution)
+    # Keep the last 150 closes without copying them on every price
+    state.variables['history'] = synapsis.RollingWindow(150, columns=('close',))
+    state.variables['history'].extend(history)
     state.variables['owns_position'] = False
 
 
@@ -38,7 +38,7 @@ setup(
         'newnewtulipy >= 0.4.6.3',
         'numpy >= 1.21.4',
         'pandas >= 1.1.5',
-        'python-binance >= 1.0.15',
+        'python-binance >= 1.0.23',
         'requests >= 2.26.0',
         'websocket-client >= 1.2.1',
     ],
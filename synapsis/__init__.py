@@ -36,10 +36,12 @@ from synapsis.exchanges.managers.ticker_manager import TickerManager
 from synapsis.exchanges.managers.orderbook_manager import OrderbookManager
 from synapsis.exchanges.managers.general_stream_manager import GeneralManager
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface as Interface
+from synapsis.exchanges.interfaces.async_interface import AsyncInterface, run_concurrently
 from synapsis.frameworks.multiprocessing.synapsis_bot import SynapsisBot
 from synapsis.utils.utils import trunc
 import synapsis.utils.utils as utils
 from synapsis.utils.scheduler import Scheduler
+from synapsis.utils.rolling_window import RollingWindow
 import synapsis.indicators as indicators
 from synapsis.utils import time_builder
 
@@ -16,7 +16,8 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from synapsis.data.data_reader import PriceReader, JsonEventReader, TickReader, DataTypes
+from synapsis.data.data_reader import PriceReader, JsonEventReader, TickReader, OrderbookReader, DataTypes
+from synapsis.data.recorder import TickRecorder, OrderbookRecorder
 
 """
 Some datatype examples
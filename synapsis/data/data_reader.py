@@ -20,6 +20,7 @@ import json
 import pandas as pd
 from enum import Enum
 
+from synapsis.data.recorder import read_recording
 from synapsis.utils import convert_epochs
 from synapsis.exchanges.interfaces.futures_exchange_interface import FuturesExchangeInterface
 
@@ -29,6 +30,7 @@ class DataTypes(Enum):
     tick_csv = 1
     ohlcv_json = 2
     event_json = 3
+    orderbook = 4
 
 
 """
@@ -273,12 +275,81 @@ class FundingRateEventReader(EventReader):
 
 
 class TickReader(__FormatReader):
+    def _parse_recorded_ticks(self, file_paths: list, symbols: list) -> None:
+        if symbols is not None and len(file_paths) != len(symbols):
+            raise LookupError(f"Mismatching symbol & file path lengths, got {len(file_paths)} and {len(symbols)} for "
+                              f"file paths and symbol lengths.")
+
+        for index in range(len(file_paths)):
+            info, contents = read_recording(file_paths[index])
+            if info['kind'] != 'ticks':
+                raise LookupError(f"{file_paths[index]} is a {info['kind']} recording, not a tick recording.")
+
+            self._check_length(contents, file_paths[index])
+
+            # Recordings know their own symbol
+            symbol = info['symbol'] if symbols is None else symbols[index]
+            self._internal_dataset[symbol] = contents.sort_values('time', kind='stable')
+
     def __init__(self, file_path: [str, list], symbol: [str, list] = None):
+        """
+        Read in trade ticks from csv files with at least 'time' and 'price' columns or from .ticks recordings made by a
+        TickRecorder
+
+        Args:
+            file_path (str or list): A single file path or list of filepaths
+            symbol (str or list): The symbols matching each file path. Optional for .ticks recordings
+        """
         super().__init__(DataTypes.tick_csv)
         file_paths, symbols = self._convert_to_list(file_path, symbol)
 
-        try:
-            assert file_path[-3:] == 'csv'
-        except AssertionError:
-            raise AssertionError(f"The filepath did not have a \'csv\' ending - got: {file_path[-3:]}")
+        if all(path[-6:] == '.ticks' for path in file_paths):
+            self._parse_recorded_ticks(file_paths, symbols)
+            return
+
+        for path in file_paths:
+            try:
+                assert path[-3:] == 'csv'
+            except AssertionError:
+                raise AssertionError(f"The filepath did not have a \'csv\' or \'ticks\' ending - got: {path[-3:]}")
         self._parse_csv_prices(file_paths, symbols, {'time', 'price'})
+
+
+class OrderbookReader(__FormatReader):
+    def __init__(self, file_path: [str, list], symbol: [str, list] = None):
+        """
+        Read in L2 orderbook data for backtesting orderbook events. Files can be .book recordings made by an
+        OrderbookRecorder or csv files with time, side (0 for bids, 1 for asks), price and size columns and an optional
+        snapshot column. Rows with a size of 0 remove the level.
+
+        Args:
+            file_path (str or list): A single file path or list of filepaths
+            symbol (str or list): The symbols matching each file path. Optional for .book recordings
+        """
+        super().__init__(DataTypes.orderbook)
+        file_paths, symbols = self._convert_to_list(file_path, symbol)
+
+        if symbols is not None and len(file_paths) != len(symbols):
+            raise LookupError(f"Mismatching symbol & file path lengths, got {len(file_paths)} and {len(symbols)} for "
+                              f"file paths and symbol lengths.")
+
+        for index in range(len(file_paths)):
+            path = file_paths[index]
+            if path[-5:] == '.book':
+                info, contents = read_recording(path)
+                if info['kind'] != 'book':
+                    raise LookupError(f"{path} is a {info['kind']} recording, not an orderbook recording.")
+                symbol_ = info['symbol'] if symbols is None else symbols[index]
+            elif path[-3:] == 'csv':
+                if symbols is None:
+                    raise LookupError("Must pass one or more symbols to identify the csv files")
+                contents = pd.read_csv(path)
+                columns = {'time', 'side', 'price', 'size'}
+                assert (columns.issubset(contents.columns)), f"{columns} not subset of {contents.columns}"
+                symbol_ = symbols[index]
+            else:
+                raise LookupError(f"Unknown filetype for {path}")
+
+            self._check_length(contents, path)
+            # A stable sort keeps the snapshot rows in front of deltas that share their timestamp
+            self._internal_dataset[symbol_] = contents.sort_values('time', kind='stable', ignore_index=True)
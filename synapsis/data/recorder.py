@@ -0,0 +1,219 @@
+"""
+    Buffered binary recorders for websocket ticks and orderbook deltas
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import struct
+import threading
+import time
+import traceback
+import zlib
+
+import numpy as np
+import pandas as pd
+
+"""
+A recording is a sequence of chunks appended to one file. Each chunk is:
+
+    <8 byte little endian header length><json header><zlib compressed column>...
+
+The header holds the kind of recording, the symbol, the row count and the dtype and compressed length of each column
+so every column can be decompressed straight into a numpy array.
+"""
+
+__header_length = struct.Struct('<Q')
+
+tick_columns = (('time', '<f8'), ('price', '<f8'), ('size', '<f8'), ('trade_id', '<i8'))
+
+# Side is 0 for bids and 1 for asks. Snapshot rows replace the whole book, the rest are deltas where a size of 0
+# removes the level
+book_columns = (('time', '<f8'), ('side', '<i1'), ('price', '<f8'), ('size', '<f8'), ('snapshot', '<i1'))
+
+BID = 0
+ASK = 1
+
+
+def write_chunk(file, kind: str, symbol: str, columns: tuple, rows: dict, compression_level: int = 6):
+    """
+    Write a single columnar chunk to an open binary file
+    """
+    row_count = len(rows[columns[0][0]])
+    blobs = []
+    header = {'kind': kind, 'symbol': symbol, 'rows': row_count, 'columns': []}
+    for name, dtype in columns:
+        blob = zlib.compress(np.asarray(rows[name], dtype=dtype).tobytes(), compression_level)
+        header['columns'].append([name, dtype, len(blob)])
+        blobs.append(blob)
+
+    encoded_header = json.dumps(header).encode()
+    file.write(__header_length.pack(len(encoded_header)))
+    file.write(encoded_header)
+    for blob in blobs:
+        file.write(blob)
+
+
+def read_recording(file_path: str) -> (dict, pd.DataFrame):
+    """
+    Read every chunk in a recording into a single DataFrame
+
+    Returns:
+        A tuple of the recording info ({'kind': ..., 'symbol': ...}) and the DataFrame of all rows
+    """
+    info = None
+    columns = {}
+    with open(file_path, 'rb') as file:
+        while True:
+            length = file.read(__header_length.size)
+            if len(length) < __header_length.size:
+                break
+            header = json.loads(file.read(__header_length.unpack(length)[0]))
+            if info is None:
+                info = {'kind': header['kind'], 'symbol': header['symbol']}
+            for name, dtype, size in header['columns']:
+                column = np.frombuffer(zlib.decompress(file.read(size)), dtype=dtype)
+                columns.setdefault(name, []).append(column)
+
+    if info is None:
+        raise LookupError(f"No recorded data found in {file_path}")
+
+    return info, pd.DataFrame({name: np.concatenate(chunks) for name, chunks in columns.items()})
+
+
+class Recorder:
+    def __init__(self, file_path: str, kind: str, symbol: str, columns: tuple,
+                 flush_interval: float = 5, chunk_size: int = 50000):
+        """
+        Buffer rows in memory and flush them to disk as compressed column chunks from a background thread
+
+        Args:
+            file_path: The file to append the recording to
+            kind: The kind of data being recorded, stored in each chunk header
+            symbol: The symbol being recorded
+            columns: Tuple of (name, numpy dtype) pairs
+            flush_interval: Seconds between flushes
+            chunk_size: Flush early once this many rows are buffered
+        """
+        self.file_path = file_path
+        self.kind = kind
+        self.symbol = symbol
+        self.columns = columns
+        self.flush_interval = flush_interval
+        self.chunk_size = chunk_size
+
+        self.__buffer = self.__empty_buffer()
+        self.__buffered = 0
+        self.__lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__closed = False
+
+        self.rows_written = 0
+        self.chunks_written = 0
+
+        self.__thread = threading.Thread(target=self.__flush_loop, daemon=True)
+        self.__thread.start()
+
+    def __empty_buffer(self) -> dict:
+        return {name: [] for name, _ in self.columns}
+
+    def _append(self, row: tuple):
+        with self.__lock:
+            for (name, _), value in zip(self.columns, row):
+                self.__buffer[name].append(value)
+            self.__buffered += 1
+            if self.__buffered >= self.chunk_size:
+                self.__wake.set()
+
+    def flush(self):
+        """
+        Write everything that is currently buffered
+        """
+        with self.__lock:
+            if self.__buffered == 0:
+                return
+            rows, self.__buffer = self.__buffer, self.__empty_buffer()
+            count, self.__buffered = self.__buffered, 0
+
+        # Appending happens outside the buffer lock so the websocket thread never waits on disk
+        with self.__write_lock:
+            with open(self.file_path, 'ab') as file:
+                write_chunk(file, self.kind, self.symbol, self.columns, rows)
+            self.rows_written += count
+            self.chunks_written += 1
+
+    def __flush_loop(self):
+        while not self.__closed:
+            self.__wake.wait(self.flush_interval)
+            self.__wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc()
+
+    def close(self):
+        """
+        Stop the background thread and write anything left in the buffer
+        """
+        self.__closed = True
+        self.__wake.set()
+        self.__thread.join()
+        self.flush()
+
+
+class TickRecorder(Recorder):
+    def __init__(self, file_path: str, symbol: str = None, flush_interval: float = 5, chunk_size: int = 50000):
+        """
+        Record normalized ticks. The recorder is callable so it can be passed straight to
+        TickerManager.create_ticker or appended as a websocket callback. The file can be read back with TickReader.
+        If no symbol is given the symbol of the first tick is used.
+        """
+        super().__init__(file_path, 'ticks', symbol, tick_columns, flush_interval, chunk_size)
+
+    def __call__(self, tick: dict, **kwargs):
+        self.record_tick(tick)
+
+    def record_tick(self, tick: dict):
+        if self.symbol is None:
+            self.symbol = tick.get('symbol')
+        trade_id = tick.get('trade_id')
+        self._append((tick['time'], tick['price'], tick.get('size', np.nan), -1 if trade_id is None else trade_id))
+
+
+class OrderbookRecorder(Recorder):
+    def __init__(self, file_path: str, symbol: str, flush_interval: float = 5, chunk_size: int = 50000):
+        """
+        Record full book snapshots followed by individual level changes
+        """
+        super().__init__(file_path, 'book', symbol, book_columns, flush_interval, chunk_size)
+
+    def record_snapshot(self, bids: list, asks: list, time_: float = None):
+        """
+        Record a full book of (price, size) tuples which replaces everything before it
+        """
+        if time_ is None:
+            time_ = time.time()
+        for price, size in bids:
+            self._append((time_, BID, price, size, 1))
+        for price, size in asks:
+            self._append((time_, ASK, price, size, 1))
+
+    def record_delta(self, side: int, price: float, size: float, time_: float = None):
+        """
+        Record a change to a single level. A size of 0 removes the level.
+        """
+        if time_ is None:
+            time_ = time.time()
+        self._append((time_, side, price, size, 0))
@@ -489,6 +489,31 @@ def synapsis_key(args):
     func(args)
 
 
+def synapsis_metadata(args):
+    import synapsis
+    from synapsis.utils.metadata_cache import get_metadata_cache
+
+    cache = get_metadata_cache()
+    if args.clear:
+        cache.clear(args.exchange)
+        print_success('Cleared saved exchange metadata')
+        return
+
+    exchange = next((e for e in EXCHANGES if e.name == args.exchange), None)
+    if exchange is None:
+        print_failure(f'Unknown exchange {args.exchange}, choose one of: {", ".join(e.name for e in EXCHANGES)}')
+        return
+    symbols = args.symbols or exchange.symbols
+    with show_spinner(f'Downloading {exchange.display_name} metadata') as spinner:
+        try:
+            interface = getattr(synapsis, exchange.python_class)().interface
+            cache.warm(exchange.name, interface, symbols)
+        except Exception as e:
+            spinner.fail(f'Failed to download metadata: {e}')
+            return
+        spinner.ok(f'Saved products, fees and order filters for {", ".join(symbols)} to {cache.location}')
+
+
 def main():
     parser = argparse.ArgumentParser(prog='synapsis', description='Synapsis CLI & deployment tool')
     subparsers = parser.add_subparsers(required=True)
@@ -521,8 +546,17 @@ def main():
     key_add_parser = key_subparsers.add_parser('add', help='Add an API Key to this model')
     key_add_parser.set_defaults(func=synapsis_add_key)
 
+    metadata_parser = subparsers.add_parser('metadata', help='Save exchange metadata so backtests can run offline')
+    metadata_parser.add_argument('exchange', nargs='?', help='exchange to download metadata from')
+    metadata_parser.add_argument('symbols', nargs='*', help='symbols to save fees and order filters for')
+    metadata_parser.add_argument('--clear', action='store_true',
+                                 help='delete saved metadata for the exchange, or for every exchange if none is given')
+    metadata_parser.set_defaults(func=synapsis_metadata)
+
     # run the selected command
     args = parser.parse_args()
+    if args.func is synapsis_metadata and args.exchange is None and not args.clear:
+        metadata_parser.error('an exchange is required unless --clear is given')
     try:
         args.func(args)
     except KeyboardInterrupt:
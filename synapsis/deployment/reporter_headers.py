@@ -117,6 +117,13 @@ class Reporter:
         """
         pass
 
+    def export_websocket_health(self, health: dict):
+        """
+        Export the message rate, latency, reconnects and queue depth of each websocket as
+        {exchange: {symbol: stats}}
+        """
+        pass
+
     def export_used_symbol(self, symbol):
         """
         Export the currency name for a used currency
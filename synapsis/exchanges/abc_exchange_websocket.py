@@ -47,6 +47,14 @@ class ABCExchangeWebsocket(abc.ABC):
     def get_feed(self):
         pass
 
+    @abc.abstractmethod
+    def get_feed_arrays(self, since: int = None):
+        pass
+
+    @abc.abstractmethod
+    def get_health(self):
+        pass
+
     @abc.abstractmethod
     def get_response(self):
         pass
@@ -22,6 +22,7 @@ import synapsis
 from synapsis.exchanges.abc_exchange import ABCExchange
 from synapsis.exchanges.auth.utils import write_auth_cache
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
+from synapsis.exchanges.interfaces.async_interface import AsyncInterface
 from synapsis.exchanges.interfaces.coinbase_pro.coinbase_pro_interface import CoinbaseProInterface
 from synapsis.exchanges.interfaces.oanda.oanda_interface import OandaInterface
 from synapsis.exchanges.interfaces.ftx.ftx_interface import FTXInterface
@@ -48,6 +49,8 @@ class Exchange(ABCExchange, abc.ABC):
         # Fill this in the method below
         self.calls = None
 
+        self.__async_interface = None
+
     # TODO this will be removed in the next update
     def evaluate_sandbox(self, auth):
         """
@@ -83,6 +86,9 @@ class Exchange(ABCExchange, abc.ABC):
         elif self.__type == "okx":
             self.interface = OkxInterface(self.__type, calls)
 
+        if self.preferences['settings']['user_stream']['enabled']:
+            self.interface.start_user_stream()
+
         synapsis.reporter.export_used_exchange(self.__type)
 
         write_auth_cache(self.__type, self.__name, calls)
@@ -102,6 +108,15 @@ class Exchange(ABCExchange, abc.ABC):
         """
         return self.interface
 
+    def get_async_interface(self) -> AsyncInterface:
+        """
+        Get an async version of the interface. Its calls can be awaited, or run together from normal code with
+        synapsis.run_concurrently.
+        """
+        if self.__async_interface is None:
+            self.__async_interface = AsyncInterface(self.get_interface())
+        return self.__async_interface
+
     def start_models(self, symbol=None):
         """
         Start all models or a specific one after appending it to the exchange.
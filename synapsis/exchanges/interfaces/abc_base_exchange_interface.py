@@ -20,6 +20,7 @@ import abc
 import time
 import warnings
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 from typing import Union
 
@@ -29,6 +30,10 @@ import pandas as pd
 
 from synapsis import utils
 from synapsis.utils import time_interval_to_seconds
+from synapsis.utils.exceptions import BatchOrderException, InvalidOrder
+from synapsis.utils.history_cache import get_history_cache
+
+order_types = ('market', 'limit', 'take_profit', 'stop_loss')
 
 
 # A lot of this class is just glue between ExchangeInterface and the new Futures classes.
@@ -53,7 +58,17 @@ class ABCBaseExchangeInterface(abc.ABC):
 
         start, stop, res_seconds, to, present = self.calculate_epochs(start_date, end_date, resolution, to)
 
-        response = self.overridden_history(symbol, start, stop, res_seconds, to=to,)
+        if present and isinstance(to, int) and self.backtesting_time() is None and \
+                utils.load_user_preferences()['settings']['history_cache']['enabled']:
+            # Live rolling windows only download the candles that closed since the last call
+            def fetch(epoch_start, epoch_stop):
+                return self.overridden_history(symbol, epoch_start, epoch_stop, res_seconds,
+                                               to=to if epoch_start == start else None)
+
+            response = get_history_cache().history((self.get_exchange_type(), symbol, res_seconds), start, stop, to,
+                                                   fetch)
+        else:
+            response = self.overridden_history(symbol, start, stop, res_seconds, to=to,)
 
         # Add a check to make sure that coinbase pro has updated
         # I tried to delete this code but the entire function broke :(
@@ -96,6 +111,152 @@ class ABCBaseExchangeInterface(abc.ABC):
         # response.index = pd.to_datetime(response['time'], unit='s')
         return self.cast_type(response, return_as, point_count)
 
+    def get_prices(self, symbols: list) -> dict:
+        """
+        Get the price of several symbols at once. Interfaces with a batch ticker endpoint override this, otherwise
+        the symbols are requested concurrently.
+
+        Args:
+            symbols: List of assets such as ['BTC-USD', 'ETH-USD']
+
+        Returns:
+            Dictionary of prices keyed by symbol
+        """
+        return self._map_symbols(self.get_price, symbols)
+
+    def history_many(self,
+                     symbols: list,
+                     to: Union[str, int] = 200,
+                     resolution: Union[str, float] = '1d',
+                     start_date: Union[str, dt, float] = None,
+                     end_date: Union[str, dt, float] = None,
+                     return_as: str = 'df') -> dict:
+        """
+        Download history for several symbols concurrently. Takes the same arguments as history.
+
+        Returns:
+            Dictionary of history keyed by symbol
+        """
+        def download(symbol):
+            return self.history(symbol, to=to, resolution=resolution, start_date=start_date, end_date=end_date,
+                                return_as=return_as)
+
+        return self._map_symbols(download, symbols)
+
+    def batch_order(self, orders: list) -> list:
+        """
+        Place several orders at once. Interfaces with a batch order endpoint override this, otherwise the orders are
+        sent concurrently.
+
+        Args:
+            orders: List of dictionaries holding the arguments of the matching order function and a type of market,
+             limit, take_profit or stop_loss. Orders with a price and no type are limit orders, without a price they
+             are market orders. Example::
+             [{'type': 'limit', 'symbol': 'BTC-USD', 'side': 'buy', 'price': 30000, 'size': .01},
+              {'symbol': 'ETH-USD', 'side': 'sell', 'size': .5}]
+
+        Returns:
+            The placed orders in the same order. Every order is attempted, if any of them fail a
+            BatchOrderException is raised that holds the orders that were placed.
+        """
+        return self._check_batch(self._attempt_concurrently(self._submit_order, orders))
+
+    def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        """
+        Cancel several orders on one symbol. Interfaces with a batch cancel endpoint override this, otherwise the
+        orders are cancelled concurrently.
+
+        Args:
+            symbol: The asset the orders are under
+            order_ids: The unique IDs of the orders
+
+        Returns:
+            The result of cancel_order for each ID in the same order
+        """
+        return self._map_concurrently(lambda order_id: self.cancel_order(symbol, order_id), order_ids)
+
+    def cancel_all(self, symbol: str = None) -> list:
+        """
+        Cancel every open order, or only the open orders on one symbol
+
+        Args:
+            symbol (optional): Only cancel orders on this asset
+
+        Returns:
+            The result of cancel_order for each cancelled order
+        """
+        open_orders = [self._order_identity(order) for order in self.get_open_orders(symbol)]
+        return self._map_concurrently(lambda identity: self.cancel_order(*identity), open_orders)
+
+    @staticmethod
+    def _split_order(order: dict) -> (str, dict):
+        """
+        Separate the type of an order passed to batch_order from the arguments of its order function
+        """
+        arguments = dict(order)
+        order_type = arguments.pop('type', 'limit' if 'price' in arguments else 'market')
+        if order_type not in order_types:
+            raise InvalidOrder(f"Order type {order_type} can't be placed in a batch.")
+        return order_type, arguments
+
+    def _submit_order(self, order: dict):
+        order_type, arguments = self._split_order(order)
+        return getattr(self, f'{order_type}_order')(**arguments)
+
+    @staticmethod
+    def _order_identity(order) -> (str, str):
+        """
+        Get the symbol and ID of an order returned by get_open_orders
+        """
+        if isinstance(order, dict):
+            return order['symbol'], order['id']
+        return order.symbol, order.id
+
+    @staticmethod
+    def _map_concurrently(function, items: list, max_workers: int = None) -> list:
+        """
+        Call function on every item with at most max_workers calls in flight, which defaults to the http pool_size
+        setting so the calls never wait on a connection
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [function(item) for item in items]
+        if max_workers is None:
+            max_workers = utils.load_user_preferences()['settings']['http']['pool_size']
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    @staticmethod
+    def _attempt(function, item):
+        """
+        Call function on item and return the exception instead of raising it
+        """
+        try:
+            return function(item)
+        except Exception as e:
+            return e
+
+    @classmethod
+    def _attempt_concurrently(cls, function, items: list, max_workers: int = None) -> list:
+        """
+        Like _map_concurrently, but an exception is returned in the place of the item that raised it
+        """
+        return cls._map_concurrently(lambda item: cls._attempt(function, item), items, max_workers)
+
+    @staticmethod
+    def _check_batch(results: list) -> list:
+        """
+        Raise a BatchOrderException holding every result if any order of a batch failed, otherwise return the results
+        """
+        errors = [str(result) for result in results if isinstance(result, Exception)]
+        if errors:
+            raise BatchOrderException("Invalid Order: " + ", ".join(errors), results)
+        return results
+
+    def _map_symbols(self, function, symbols: list, max_workers: int = None) -> dict:
+        symbols = list(symbols)
+        return dict(zip(symbols, self._map_concurrently(function, symbols, max_workers)))
+
     def calculate_epochs(self, start_date, end_date, resolution, to):
         is_backtesting = self.backtesting_time()
         if is_backtesting is not None and end_date is None:
@@ -152,7 +313,9 @@ class ABCBaseExchangeInterface(abc.ABC):
 
     @staticmethod
     def cast_type(response: pd.DataFrame, return_as: str, point_count=None):
-        if return_as != 'df' and return_as != 'deque':
+        if return_as == 'array':
+            return utils.to_history_arrays(response)
+        elif return_as != 'df' and return_as != 'deque':
             return response.to_dict(return_as)
         elif return_as == 'deque':
             # Create a deque object that has the same length
@@ -19,6 +19,7 @@
 import time
 import warnings
 from datetime import datetime as dt, timezone
+from typing import Union
 
 import alpaca_trade_api
 import pandas as pd
@@ -372,22 +373,7 @@ class AlpacaInterface(ExchangeInterface):
         if not self.user_preferences['settings']['alpaca']['use_yfinance']:
             assert isinstance(self.calls, alpaca_trade_api.REST)
 
-            resolution = time_interval_to_seconds(resolution)
-
-            supported_multiples = [60, 3600, 86400]
-            if resolution not in supported_multiples:
-                utils.info_print("Granularity is not an accepted granularity...rounding to nearest valid value.")
-                resolution = supported_multiples[min(range(len(supported_multiples)),
-                                                     key=lambda i: abs(supported_multiples[i] - resolution))]
-
-            found_multiple, row_divisor = super().evaluate_multiples(supported_multiples, resolution)
-
-            if found_multiple == 60:
-                time_interval = TimeFrame.Minute
-            elif found_multiple == 3600:
-                time_interval = TimeFrame.Hour
-            else:
-                time_interval = TimeFrame.Day
+            time_interval, row_divisor = self.__bar_timeframe(resolution)
 
             epoch_start_str = dt.fromtimestamp(epoch_start, tz=timezone.utc).isoformat()
             epoch_stop_str = dt.fromtimestamp(epoch_stop, tz=timezone.utc).isoformat()
@@ -420,16 +406,97 @@ class AlpacaInterface(ExchangeInterface):
                         return pd.DataFrame(columns=['time', 'open', 'high', 'low', 'close', 'volume'])
                 else:
                     raise e
-            bars.rename(columns={"t": "time", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume"},
-                        inplace=True)
-
-            if bars.empty:
-                return pd.DataFrame(columns=['time', 'open', 'high', 'low', 'close', 'volume'])
-            return utils.get_ohlcv(bars, row_divisor, from_zero=False)
+            return self.__format_bars(bars, row_divisor)
         else:
             # This runs yfinance on the symbol
             return self.parse_yfinance(symbol, epoch_start, epoch_stop, resolution)
 
+    def __bar_timeframe(self, resolution) -> (TimeFrame, int):
+        """
+        Find the alpaca timeframe to request and how many of its bars make up one bar at this resolution
+        """
+        resolution = time_interval_to_seconds(resolution)
+
+        supported_multiples = [60, 3600, 86400]
+        if resolution not in supported_multiples:
+            utils.info_print("Granularity is not an accepted granularity...rounding to nearest valid value.")
+            resolution = supported_multiples[min(range(len(supported_multiples)),
+                                                 key=lambda i: abs(supported_multiples[i] - resolution))]
+
+        found_multiple, row_divisor = self.evaluate_multiples(supported_multiples, resolution)
+
+        if found_multiple == 60:
+            return TimeFrame.Minute, row_divisor
+        elif found_multiple == 3600:
+            return TimeFrame.Hour, row_divisor
+        else:
+            return TimeFrame.Day, row_divisor
+
+    @staticmethod
+    def __format_bars(bars: pd.DataFrame, row_divisor: int) -> pd.DataFrame:
+        bars = bars.rename(columns={"t": "time", "o": "open", "h": "high", "l": "low", "c": "close", "v": "volume"})
+
+        if bars.empty:
+            return pd.DataFrame(columns=['time', 'open', 'high', 'low', 'close', 'volume'])
+        return utils.get_ohlcv(bars, row_divisor, from_zero=False)
+
+    def history_many(self,
+                     symbols: list,
+                     to: Union[str, int] = 200,
+                     resolution: Union[str, float] = '1d',
+                     start_date: Union[str, dt, float] = None,
+                     end_date: Union[str, dt, float] = None,
+                     return_as: str = 'df') -> dict:
+        """
+        Download the bars of every symbol in one request and split them by symbol. Takes the same arguments as
+        history.
+
+        Returns:
+            Dictionary of history keyed by symbol
+        """
+        if self.user_preferences['settings']['alpaca']['use_yfinance']:
+            return super().history_many(symbols, to=to, resolution=resolution, start_date=start_date,
+                                        end_date=end_date, return_as=return_as)
+
+        symbols = list(symbols)
+        start, stop, resolution_seconds, count, _ = self.calculate_epochs(start_date, end_date, resolution, to)
+        time_interval, row_divisor = self.__bar_timeframe(resolution_seconds)
+
+        histories = {}
+        missing = symbols
+        span = stop - start
+        try:
+            # Market hours leave fewer bars than the range holds, so short symbols are requested again from further
+            #  back the way history does
+            for _ in range(6):
+                bars = self.calls.get_bars(missing, time_interval, utils.iso8601_from_epoch(stop - span),
+                                           utils.iso8601_from_epoch(stop), adjustment='raw').df
+                short = []
+                for symbol in missing:
+                    symbol_bars = bars if bars.empty else bars[bars['symbol'] == symbol].drop(columns=['symbol'])
+                    histories[symbol] = self.__format_bars(symbol_bars, row_divisor)
+                    if isinstance(count, int) and len(histories[symbol]) < count:
+                        short.append(symbol)
+                missing = short
+                if len(missing) == 0:
+                    break
+                span *= 2
+        except (AlpacaAPIError, TypeError):
+            # Limited subscriptions and empty ranges are handled symbol by symbol
+            return super().history_many(symbols, to=to, resolution=resolution, start_date=start_date,
+                                        end_date=end_date, return_as=return_as)
+
+        if isinstance(count, int):
+            point_count = count
+        else:
+            point_count = int((stop - start) / resolution_seconds + 1)
+        for symbol in symbols:
+            history = histories[symbol]
+            if isinstance(count, int):
+                history = history.tail(count).reset_index(drop=True)
+            histories[symbol] = self.cast_type(history, return_as, point_count)
+        return histories
+
     def overridden_history(self, symbol, epoch_start, epoch_stop, resolution_seconds, **kwargs) -> pd.DataFrame:
         to = kwargs['to']
         # If it's a string alpaca is an edge case where epoch can be used
@@ -624,6 +691,16 @@ class AlpacaInterface(ExchangeInterface):
         response = self.calls.get_latest_trade(symbol=symbol)
         return float(response['p'])
 
+    def get_prices(self, symbols: list) -> dict:
+        assert isinstance(self.calls, alpaca_trade_api.REST)
+        response = self.calls.get_latest_trades(list(symbols))
+        prices = {}
+        for symbol in symbols:
+            if symbol not in response:
+                raise APIException(f"No price found for {symbol}.")
+            prices[symbol] = float(response[symbol].price)
+        return prices
+
     @staticmethod
     def parse_yfinance(symbol: str, epoch_start: [int, float], epoch_stop: [int, float], resolution: int):
         try:
@@ -16,7 +16,6 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import collections
 import ssl
 import threading
 import time
@@ -29,6 +28,8 @@ import synapsis
 from synapsis.utils.utils import info_print
 from synapsis.exchanges.abc_exchange_websocket import ABCExchangeWebsocket
 from synapsis.exchanges.auth.utils import load_auth
+from synapsis.exchanges.interfaces.feed_buffer import TickerFeed, TimeFeed
+from synapsis.exchanges.interfaces.websocket_health import WebsocketHealth
 from synapsis.exchanges.interfaces.alpaca.alpaca_websocket_utils import parse_alpaca_timestamp, switch_type
 
 
@@ -130,8 +131,10 @@ class Tickers(ABCExchangeWebsocket):
         # Reload preferences
         self.__preferences = synapsis.utils.load_user_preferences()
         buffer_size = self.__preferences["settings"]["websocket_buffer_size"]
-        self.__ticker_feed = collections.deque(maxlen=buffer_size)
-        self.__time_feed = collections.deque(maxlen=buffer_size)
+        self.__ticker_feed = TickerFeed(buffer_size)
+        self.__time_feed = TimeFeed(buffer_size)
+
+        self.health = WebsocketHealth(f'{symbol}@{stream}')
 
         # Start the websocket
         if not initially_stopped:
@@ -152,6 +155,7 @@ class Tickers(ABCExchangeWebsocket):
                 pass
             else:
                 # Use recursion to restart, continue appending to time feed and ticker feed
+                self.health.record_reconnect()
                 self.ws = None
                 self.start_websocket()
 
@@ -184,11 +188,14 @@ class Tickers(ABCExchangeWebsocket):
                 self.__most_recent_tick = interface_message
                 self.__ticker_feed.append(interface_message)
 
+                self.health.record_message(recent_time)
+                start = time.perf_counter()
                 try:
                     for i in self.__callbacks:
                         i(interface_message, **self.__kwargs)
                 except Exception:
                     traceback.print_exc()
+                self.health.record_callbacks(time.perf_counter() - start)
 
                 counter += 1
             except Exception:
@@ -200,6 +207,7 @@ class Tickers(ABCExchangeWebsocket):
                           self.__stream + ": attempting to re-initialize")
                     # Give a delay so this doesn't eat up from the main thread if it takes many tries to initialize
                     time.sleep(2)
+                    self.health.record_reconnect()
                     self.ws.close()
                     self.ws = create_ticker_connection(self.__symbol, self.URL, self.__stream)
                     # Update response
@@ -215,7 +223,8 @@ class Tickers(ABCExchangeWebsocket):
 
     """ Required in manager """
 
-    def append_callback(self, obj):
+    def append_callback(self, obj, fields: tuple = None):
+        # Alpaca messages are msgpack and always fully normalized, so the fields aren't used
         self.__callbacks.append(obj)
 
     """ Define a variable each time so there is no array manipulation """
@@ -232,13 +241,23 @@ class Tickers(ABCExchangeWebsocket):
     """ Required in manager """
 
     def get_time_feed(self):
-        return list(self.__time_feed)
+        return self.__time_feed.to_list('time')
 
     """ Parallel with time feed """
     """ Required in manager """
 
     def get_feed(self):
-        return list(self.__ticker_feed)
+        return self.__ticker_feed.to_list()
+
+    """ Required in manager """
+
+    def get_feed_arrays(self, since: int = None):
+        return self.__ticker_feed.since(since)
+
+    """ Required in manager """
+
+    def get_health(self):
+        return self.health.get_stats()
 
     """ Required in manager """
 
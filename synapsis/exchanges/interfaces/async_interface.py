@@ -0,0 +1,105 @@
+"""
+    Async counterpart of the exchange interfaces for concurrent calls across exchanges.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union
+
+from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
+from synapsis.utils import event_loop
+from synapsis.utils.utils import load_user_preferences
+
+
+class AsyncInterface:
+    def __init__(self, interface: ABCExchangeInterface, max_workers: int = None):
+        """
+        Wrap an exchange interface so its calls can be awaited. Each call runs on a worker pool sized to the
+        connection pool of the HTTP sessions, so calls to several exchanges, or several calls to one, overlap
+        instead of adding up.
+
+        Args:
+            interface: The authenticated interface to wrap
+            max_workers: Number of calls in flight at once. Defaults to the http pool_size setting
+        """
+        if max_workers is None:
+            max_workers = load_user_preferences()['settings']['http']['pool_size']
+        self.interface = interface
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers,
+                                             thread_name_prefix=f'synapsis-{interface.get_exchange_type()}')
+
+    async def _call(self, function, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, functools.partial(function, *args, **kwargs))
+
+    async def get_price(self, symbol: str) -> float:
+        return await self._call(self.interface.get_price, symbol)
+
+    async def get_prices(self, symbols: list) -> dict:
+        return await self._call(self.interface.get_prices, symbols)
+
+    async def get_account(self, symbol: str = None):
+        return await self._call(self.interface.get_account, symbol)
+
+    async def get_open_orders(self, symbol: str = None) -> list:
+        return await self._call(self.interface.get_open_orders, symbol)
+
+    async def get_order(self, symbol: str, order_id: str) -> dict:
+        return await self._call(self.interface.get_order, symbol, order_id)
+
+    async def market_order(self, symbol: str, side: str, size: float, **kwargs):
+        return await self._call(self.interface.market_order, symbol, side, size, **kwargs)
+
+    async def limit_order(self, symbol: str, side: str, price: float, size: float, **kwargs):
+        return await self._call(self.interface.limit_order, symbol, side, price, size, **kwargs)
+
+    async def cancel_order(self, symbol: str, order_id: str) -> dict:
+        return await self._call(self.interface.cancel_order, symbol, order_id)
+
+    async def batch_order(self, orders: list) -> list:
+        return await self._call(self.interface.batch_order, orders)
+
+    async def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        return await self._call(self.interface.cancel_orders, symbol, order_ids)
+
+    async def cancel_all(self, symbol: str = None) -> list:
+        return await self._call(self.interface.cancel_all, symbol)
+
+    async def history(self, symbol: str, to: Union[str, int] = 200, resolution: Union[str, float] = '1d',
+                      start_date=None, end_date=None, return_as: str = 'df'):
+        return await self._call(self.interface.history, symbol, to=to, resolution=resolution,
+                                start_date=start_date, end_date=end_date, return_as=return_as)
+
+    def close(self):
+        """
+        Stop the worker pool once the calls in flight finish
+        """
+        self.__executor.shutdown(wait=False)
+
+
+def run_concurrently(*coroutines, timeout: float = None) -> list:
+    """
+    Sync facade for strategies that aren't async. Runs the coroutines together on the shared event loop and returns
+    their results in order, raising the first exception.
+
+    Example:
+        price_a, price_b = run_concurrently(coinbase.get_price('BTC-USD'), binance.get_price('BTC-USDT'))
+    """
+    async def gather():
+        return await asyncio.gather(*coroutines)
+
+    return event_loop.run_coroutine(gather(), timeout)
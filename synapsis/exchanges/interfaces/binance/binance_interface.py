@@ -15,18 +15,18 @@
     You should have received a copy of the GNU Lesser General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
-import time
-
 import pandas as pd
 
 import synapsis.utils.exceptions as exceptions
 import synapsis.utils.utils
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.exchange_interface import ExchangeInterface
+from synapsis.exchanges.interfaces.binance.binance_user_stream import BinanceUserStream
 from synapsis.exchanges.orders.limit_order import LimitOrder
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.stop_loss import StopLossOrder
 from synapsis.exchanges.orders.take_profit import TakeProfitOrder
+from synapsis.utils.history_downloader import download_windows, split_windows
 
 
 class BinanceInterface(ExchangeInterface):
@@ -57,6 +57,8 @@ class BinanceInterface(ExchangeInterface):
         for i in symbols:
             assets.append(i["baseAsset"])
             assets.append(i["quoteAsset"])
+        utils.symbol_registry.register('binance',
+                                       {i["baseAsset"] + "-" + i["quoteAsset"]: i["symbol"] for i in symbols})
 
         # Because these come down as trading pairs we have to filter for duplicates
         filtered_base_assets = []
@@ -66,6 +68,14 @@ class BinanceInterface(ExchangeInterface):
                 filtered_base_assets.append(i)
         self.__available_currencies = filtered_base_assets
 
+    def start_user_stream(self):
+        if self.user_stream is not None:
+            return
+        if self.calls.testnet:
+            self.user_stream = BinanceUserStream(self, websocket_url="wss://testnet.binance.vision/ws/{1}")
+        else:
+            self.user_stream = BinanceUserStream(self)
+
     def get_products(self):
         needed = self.needed['get_products']
         """
@@ -133,9 +143,13 @@ class BinanceInterface(ExchangeInterface):
         ]
         """
         products = self.calls.get_exchange_info()["symbols"]
+        # The products say exactly where each symbol splits, which parsing the suffix can only guess
+        symbols = {}
         for i in range(len(products)):
             # Rename needed
+            exchange_symbol = products[i]["symbol"]
             products[i]["symbol"] = products[i]["baseAsset"] + "-" + products[i]["quoteAsset"]
+            symbols[products[i]["symbol"]] = exchange_symbol
             products[i]["base_asset"] = products[i].pop("baseAsset")
             products[i]["quote_asset"] = products[i].pop("quoteAsset")
             filters = products[i]["filters"]
@@ -154,6 +168,7 @@ class BinanceInterface(ExchangeInterface):
             products[i]["base_increment"] = base_increment
             # Isolate keys unimportant for the interface's functionality
             products[i] = utils.isolate_specific(needed, products[i])
+        utils.symbol_registry.register('binance', symbols)
         return products
 
     @utils.enforce_base_asset
@@ -168,6 +183,9 @@ class BinanceInterface(ExchangeInterface):
         binance: get_account["balances"]
         """
         symbol = super().get_account(symbol=symbol)
+        cached = self._from_user_stream('get_account', symbol)
+        if cached is not None:
+            return cached
 
         # TODO this should really use the get_asset_balance() function from binance.
         """
@@ -547,6 +565,30 @@ class BinanceInterface(ExchangeInterface):
         response = utils.rename_to(renames, response)
         return utils.isolate_specific(needed, response)
 
+    def cancel_all(self, symbol: str = None) -> list:
+        """
+        Cancel every open order with one request per symbol.
+        """
+        if symbol is None:
+            symbols = sorted(set(order['symbol'] for order in self.get_open_orders()))
+        else:
+            symbols = [symbol]
+
+        def cancel_symbol(symbol_):
+            return self.calls.cancel_all_open_orders(symbol=utils.to_exchange_symbol(symbol_, 'binance'))
+
+        needed = self.needed['cancel_order']
+        renames = [
+            ["orderId", "order_id"]
+        ]
+        cancelled = []
+        for response in self._map_concurrently(cancel_symbol, symbols):
+            # OCO lists are reported alongside the orders they contain
+            for order in response:
+                if 'orderId' in order:
+                    cancelled.append(utils.isolate_specific(needed, utils.rename_to(renames, order)))
+        return cancelled
+
     def get_open_orders(self, symbol=None):
         """
         List open orders.
@@ -575,6 +617,9 @@ class BinanceInterface(ExchangeInterface):
             }
         ]
         """
+        cached = self._from_user_stream('get_open_orders', symbol)
+        if cached is not None:
+            return cached
         renames = [
             ["orderId", "id"],
             ["origQty", "size"],
@@ -619,6 +664,9 @@ class BinanceInterface(ExchangeInterface):
             "time": 1499827319559
         }
         """
+        cached = self._from_user_stream('get_order', order_id)
+        if cached is not None:
+            return cached
         renames = [
             ["orderId", "id"],
             ["origQty", "size"],
@@ -700,10 +748,11 @@ class BinanceInterface(ExchangeInterface):
         Returns:
             Dataframe with *at least* 'time (epoch)', 'low', 'high', 'open', 'close', 'volume' as columns.
         """
-        return self._binance_get_product_history(self.calls, symbol, epoch_start, epoch_stop, resolution)
+        return self._binance_get_product_history(self.calls, symbol, epoch_start, epoch_stop, resolution,
+                                                 self.user_preferences['settings']['history_download'])
 
     @staticmethod
-    def _binance_get_product_history(calls, symbol, epoch_start, epoch_stop, resolution):
+    def _binance_get_product_history(calls, symbol, epoch_start, epoch_stop, resolution, settings: dict = None):
         resolution = synapsis.time_builder.time_interval_to_seconds(resolution)
 
         # epoch_start, epoch_stop = super().get_product_history(symbol, epoch_start, epoch_stop, resolution)
@@ -738,30 +787,17 @@ class BinanceInterface(ExchangeInterface):
         }
         gran_string = lookup_dict[resolution]
 
-        # Figure out how many points are needed
-        need = int((epoch_stop - epoch_start) / resolution)
-        initial_need = need
-        window_open = epoch_start
-        history = []
-
         # Convert coin id to binance coin
         symbol = utils.to_exchange_symbol(symbol, 'binance')
-        while need > 1000:
-            # Close is always 300 points ahead
-            window_close = int(window_open + 1000 * resolution)
-            history = history + calls.get_klines(symbol=symbol, startTime=window_open * 1000,
-                                                 endTime=window_close * 1000, interval=gran_string,
-                                                 limit=1000)
-
-            window_open = window_close
-            need -= 1000
-            time.sleep(.2)
-            utils.update_progress((initial_need - need) / initial_need)
-
-        # Fill the remainder
-        history_block = history + calls.get_klines(symbol=symbol, startTime=window_open * 1000,
-                                                   endTime=epoch_stop * 1000, interval=gran_string,
-                                                   limit=1000)
+
+        def fetch(window_open, window_close):
+            return calls.get_klines(symbol=symbol, startTime=window_open * 1000, endTime=window_close * 1000,
+                                    interval=gran_string, limit=1000)
+
+        # A kline request for 1000 candles weighs 2 against the request weight limit
+        windows = split_windows(epoch_start, epoch_stop, resolution, 1000)
+        history_block = download_windows(fetch, windows, 'binance', weight=2, settings=settings)
+        history_block.sort(key=lambda x: x[0])
 
         data_frame = pd.DataFrame(history_block, columns=['time', 'open', 'high', 'low', 'close', 'volume',
                                                           'close time', 'quote asset volume', 'number of trades',
@@ -1104,3 +1140,16 @@ class BinanceInterface(ExchangeInterface):
         symbol = utils.to_exchange_symbol(symbol, "binance")
         response = self.calls.get_symbol_ticker(symbol=symbol)
         return float(response['price'])
+
+    def get_prices(self, symbols: list) -> dict:
+        """
+        Returns the prices of several assets from a single all tickers request.
+        """
+        tickers = {ticker['symbol']: ticker['price'] for ticker in self.calls.get_symbol_ticker()}
+        prices = {}
+        for symbol in symbols:
+            exchange_symbol = utils.to_exchange_symbol(symbol, "binance")
+            if exchange_symbol not in tickers:
+                raise exceptions.APIException(f"No price found for {symbol}.")
+            prices[symbol] = float(tickers[exchange_symbol])
+        return prices
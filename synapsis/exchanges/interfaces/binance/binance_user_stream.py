@@ -0,0 +1,69 @@
+"""
+    Binance user data stream.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from synapsis.exchanges.interfaces.user_stream import UserStream
+from synapsis.utils import utils
+
+# Listen keys expire after an hour without a keepalive
+KEEPALIVE_INTERVAL = 30 * 60
+
+
+class BinanceUserStream(UserStream):
+    def __init__(self, interface, websocket_url="wss://stream.binance.{}:9443/ws/{}", **kwargs):
+        """
+        Follow executionReport and outboundAccountPosition events on a listen key
+
+        Args:
+            interface: The authenticated BinanceInterface
+            websocket_url: Formatted with the tld setting and the listen key
+        """
+        self.__websocket_url = websocket_url
+        self.__listen_key = None
+        super().__init__(interface, websocket_url, **kwargs)
+
+    def get_url(self) -> str:
+        # A new key is requested on every connection, Binance returns the same one while it is still valid
+        self.__listen_key = self.interface.get_calls().stream_get_listen_key()
+        tld = self.preferences['settings']['binance']['binance_tld']
+        return self.__websocket_url.format(tld, self.__listen_key)
+
+    def authenticate(self, ws):
+        # The listen key in the URL is the subscription
+        self.repeat(KEEPALIVE_INTERVAL, lambda: self.interface.get_calls().stream_keepalive(self.__listen_key))
+        self.subscribed()
+
+    def handle(self, message: dict):
+        event = message.get('e')
+        if event == 'executionReport':
+            self.cache.update_order(self.shape_order({
+                'id': message['i'],
+                'symbol': utils.to_synapsis_symbol(message['s'], 'binance'),
+                'side': message['S'].lower(),
+                'type': message['o'].lower(),
+                'status': self.interface.homogenize_order_status('binance', message['X'].lower()),
+                'price': message['p'],
+                'size': message['q'],
+                'funds': message['Z'],
+                'time_in_force': message['f'],
+                'created_at': message['O'] / 1000
+            }))
+        elif event == 'outboundAccountPosition':
+            for balance in message['B']:
+                self.cache.update_balance(balance['a'], float(balance['f']), float(balance['l']))
+        elif event == 'listenKeyExpired':
+            # Reconnecting fetches a fresh key
+            self.ws.close()
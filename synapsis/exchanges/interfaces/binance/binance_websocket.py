@@ -27,7 +27,7 @@ from synapsis.utils.utils import info_print
 
 class Tickers(Websocket):
     def __init__(self, symbol, stream, log=None, initially_stopped=False,
-                 websocket_url="wss://stream.binance.{}:9443/ws", **kwargs):
+                 websocket_url="wss://stream.binance.{}:9443/ws", transport=None, **kwargs):
         """
         Create and initialize the ticker
         Args:
@@ -35,6 +35,7 @@ class Tickers(Websocket):
             stream: Stream to use, such as "depth" or "trade"
             log: Fill this with a path to a log file that should be created
             websocket_url: Default websocket URL feed.
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
         """
         # Reload preferences
         self.__preferences = synapsis.utils.load_user_preferences()
@@ -42,7 +43,8 @@ class Tickers(Websocket):
         self.__logging_callback, self.__interface_callback, log_message = websocket_utils.switch_type(stream)
         url = websocket_url.format(self.__preferences['settings']['binance']['binance_tld'])
 
-        super().__init__(symbol, stream, log, log_message, url, None, kwargs)
+        super().__init__(symbol, stream, log, log_message, url, None, kwargs, transport)
+        self.field_extractors = websocket_utils.field_extractors(stream)
 
         # Start the websocket
         if not initially_stopped:
@@ -64,18 +66,17 @@ class Tickers(Websocket):
         Exchange specific actions to perform when receiving a message
         """
         self.message_count += 1
-        message = json.loads(message)
+        message = self.loads(message)
         try:
             self.most_recent_time = message['E']
             self.time_feed.append(self.most_recent_time)
 
             self.log_response(self.__logging_callback, message)
 
-            interface_message = self.__interface_callback(message)
+            interface_message = self.normalize(message, self.__interface_callback)
             self.ticker_feed.append(interface_message)
             self.most_recent_tick = interface_message
-            for i in self.callbacks:
-                i(interface_message, **self.kwargs)
+            self.run_callbacks(interface_message)
         except KeyError:
             # If the try below figures this out then we don't have to traceback
             error_found = False
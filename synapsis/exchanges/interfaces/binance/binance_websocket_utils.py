@@ -33,6 +33,15 @@ def switch_type(stream):
         return no_callback, no_callback, ""
 
 
+def field_extractors(stream):
+    """
+    Functions that read a single interface field out of a raw message, used when callbacks only need a few fields
+    """
+    if stream == "aggTrade":
+        return trade_fields
+    return None
+
+
 def no_callback(message):
     return message
 
@@ -105,3 +114,13 @@ def trade_interface(message):
     isolated['symbol'] = utils.to_synapsis_symbol(isolated['symbol'], 'binance')
 
     return isolated
+
+
+# The same conversions as trade_interface, one field at a time
+trade_fields = {
+    'symbol': lambda message: utils.to_synapsis_symbol(message['s'], 'binance'),
+    'price': lambda message: float(message['p']),
+    'size': lambda message: float(message['q']),
+    'time': lambda message: message['T'] / 1000,
+    'trade_id': lambda message: int(message['a']),
+}
@@ -15,6 +15,7 @@
     You should have received a copy of the GNU Lesser General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import dataclasses
 import time
 from operator import itemgetter
 from typing import Optional
@@ -42,6 +43,7 @@ from synapsis.utils import utils, time_builder
 from synapsis.enums import MarginType, PositionMode, Side, TimeInForce, HedgeMode, OrderType, ContractType, OrderStatus
 from synapsis.exchanges.interfaces.futures_exchange_interface import FuturesExchangeInterface
 from synapsis.exchanges.orders.futures.futures_order import FuturesOrder
+from synapsis.utils.exceptions import InvalidOrder
 
 BINANCE_FUTURES_FEES = [
     (0.00020, 0.00040),
@@ -361,6 +363,69 @@ class BinanceFuturesInterface(FuturesExchangeInterface):
         res = self.calls.futures_cancel_order(symbol=symbol, orderId=order_id)
         return self.parse_order_response(res)
 
+    def _batch_order_params(self, order: dict) -> Optional[dict]:
+        """
+        Build the parameters of a market or limit order for the batch endpoint, other types return None
+        """
+        order_type, arguments = self._split_order(order)
+        if order_type not in ('market', 'limit'):
+            return None
+        params = {
+            'type': order_type.upper(),
+            'symbol': self.to_exchange_symbol(arguments['symbol']),
+            'side': arguments['side'].upper(),
+            'quantity': arguments['size'],
+            'positionSide': arguments.get('position', PositionMode.BOTH).upper(),
+            'reduceOnly': arguments.get('reduce_only', False)
+        }
+        if order_type == 'limit':
+            params['price'] = arguments['price']
+            # Accept the enum or its value such as 'GTC'
+            params['timeInForce'] = TimeInForce(arguments.get('time_in_force', TimeInForce.GTC)).value
+        # Values inside a batch are sent as JSON strings
+        return {key: str(value).lower() if isinstance(value, bool) else str(value) for key, value in params.items()}
+
+    @utils.order_protection
+    def batch_order(self, orders: list) -> list:
+        """
+        Market and limit orders are sent through batchOrders five at a time, other types are placed one by one.
+        """
+        params = [self._batch_order_params(order) for order in orders]
+        batched = [index for index, order_params in enumerate(params) if order_params is not None]
+        chunks = [batched[i:i + 5] for i in range(0, len(batched), 5)]
+        responses = self._attempt_concurrently(
+            lambda chunk: self.calls.futures_place_batch_order(batchOrders=[params[index] for index in chunk]),
+            chunks)
+
+        results = [None] * len(orders)
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                # None of the orders in a failed request were placed
+                for index in chunk:
+                    results[index] = response
+                continue
+            for index, placed in zip(chunk, response):
+                if 'code' in placed:
+                    results[index] = InvalidOrder(f"{orders[index]['symbol']}: {placed['msg']}")
+                else:
+                    results[index] = self.parse_order_response(placed)
+        others = [index for index, order_params in enumerate(params) if order_params is None]
+        for index, result in zip(others, self._attempt_concurrently(self._submit_order,
+                                                                    [orders[index] for index in others])):
+            results[index] = result
+        return self._check_batch(results)
+
+    def cancel_all(self, symbol: str = None) -> list:
+        """
+        Cancel every open order with one request per symbol. Returns the orders that were open before cancelling.
+        """
+        open_orders = self.get_open_orders(symbol)
+        symbols = sorted(set(order.symbol for order in open_orders))
+        self._map_concurrently(
+            lambda symbol_: self.calls.futures_cancel_all_open_orders(symbol=self.to_exchange_symbol(symbol_)),
+            symbols)
+        return [dataclasses.replace(order, status=OrderStatus.CANCELED) for order in open_orders]
+
     def get_open_orders(self, symbol: str = None) -> list:
         if symbol:
             symbol = self.to_exchange_symbol(symbol)
@@ -401,7 +466,8 @@ class BinanceFuturesInterface(FuturesExchangeInterface):
     def get_product_history(self, symbol, epoch_start, epoch_stop,
                             resolution) -> pd.DataFrame:
         # reuse impl from SPOT interface, it's the same thing
-        return BinanceInterface._binance_get_product_history(self.calls, symbol, epoch_start, epoch_stop, resolution)
+        return BinanceInterface._binance_get_product_history(self.calls, symbol, epoch_start, epoch_stop, resolution,
+                                                             self.user_preferences['settings']['history_download'])
 
     def get_funding_rate_history(self, symbol: str, epoch_start: int,
                                  epoch_stop: int) -> list:
@@ -19,11 +19,11 @@ import hmac
 import json
 import time
 
-import requests
 from requests.auth import AuthBase
 
 # Create custom authentication for Exchange
 from synapsis.utils.utils import info_print
+from synapsis.utils.http_session import get_session
 
 
 class CoinbaseExchangeAuth(AuthBase):
@@ -62,7 +62,25 @@ class API:
     def __init__(self, api_key: str, api_secret: str, api_pass: str, api_url: str = 'https://api.pro.coinbase.com/'):
         self.__auth = CoinbaseExchangeAuth(api_key, api_secret, api_pass)
         self.__api_url = api_url
-        self.session = requests.Session()
+        self.session = get_session('coinbase_pro')
+
+    @property
+    def is_sandbox(self) -> bool:
+        return 'sandbox' in self.__api_url
+
+    def get_websocket_auth(self) -> dict:
+        """
+        Signed fields to add to a websocket subscribe message for the authenticated channels
+        """
+        timestamp = str(time.time())
+        headers = get_auth_headers(timestamp, timestamp + 'GET/users/self/verify', self.__auth.api_key,
+                                   self.__auth.secret_key, self.__auth.passphrase)
+        return {
+            'signature': headers['CB-ACCESS-SIGN'],
+            'key': headers['CB-ACCESS-KEY'],
+            'passphrase': headers['CB-ACCESS-PASSPHRASE'],
+            'timestamp': timestamp
+        }
 
     """
     Public Client Calls
@@ -87,7 +105,7 @@ class API:
                     }
                 ]
         """
-        return requests.get(self.__api_url + 'products', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'products', auth=self.__auth).json()
 
     def get_product_order_book(self, product_id, level=1):
         """Get a list of open orders for a product.
@@ -128,7 +146,7 @@ class API:
             info_print("Abuse of polling at level 3 can result in a block. Consider using the websocket.")
 
         params = {'level': level}
-        return requests.get(self.__api_url + "products/{}/book".format(product_id), params=params).json()
+        return self.session.get(self.__api_url + "products/{}/book".format(product_id), params=params).json()
 
     """ PAGINATED """ """ Full interface support """
 
@@ -210,7 +228,7 @@ class API:
 
         params['granularity'] = granularity
 
-        return requests.get(self.__api_url + 'products/{}/candles'.format(product_id), params=params).json()
+        return self.session.get(self.__api_url + 'products/{}/candles'.format(product_id), params=params).json()
 
     def get_product_24hr_stats(self, product_id):
         """Get 24 hr stats for the product.
@@ -229,7 +247,7 @@ class API:
                     }
 
         """
-        return requests.get(self.__api_url + 'products/{}/stats'.format(product_id), auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'products/{}/stats'.format(product_id), auth=self.__auth).json()
 
     """ Full interface support """
 
@@ -249,7 +267,7 @@ class API:
                 }]
 
         """
-        return requests.get(self.__api_url + 'currencies', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'currencies', auth=self.__auth).json()
 
     def get_time(self):
         """Get the API server time.
@@ -263,7 +281,7 @@ class API:
                     }
 
         """
-        return requests.get(self.__api_url + 'time', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'time', auth=self.__auth).json()
 
     """
     Private API Calls
@@ -295,7 +313,7 @@ class API:
 
         * Additional info included in response for margin accounts.
         """
-        return requests.get(self.__api_url + 'accounts', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'accounts', auth=self.__auth).json()
 
     """ Full interface support """
 
@@ -317,7 +335,7 @@ class API:
                     "currency": "USD"
                 }
         """
-        return requests.get(self.__api_url + 'accounts/' + account_id, auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'accounts/' + account_id, auth=self.__auth).json()
 
     """ PAGINATED """
 
@@ -492,7 +510,7 @@ class API:
                   'side': side,
                   'type': order_type}
         params.update(kwargs)
-        return requests.post(self.__api_url + 'orders', data=json.dumps(params), auth=self.__auth).json()
+        return self.session.post(self.__api_url + 'orders', data=json.dumps(params), auth=self.__auth).json()
 
     def place_limit_order(self, product_id, side, price, size,
                           client_oid=None,
@@ -656,7 +674,27 @@ class API:
                 [ "c5ab5eae-76be-480e-8961-00792dc7e138" ]
 
         """
-        return requests.delete(self.__api_url + 'orders/' + order_id, auth=self.__auth).json()
+        return self.session.delete(self.__api_url + 'orders/' + order_id, auth=self.__auth).json()
+
+    def cancel_all(self, product_id=None):
+        """ With best effort, cancel all open orders.
+
+        Args:
+            product_id (Optional[str]): Only cancel orders for this
+                product_id
+
+        Returns:
+            list: A list of ids of the canceled orders. Example::
+                [
+                    "144c6f8e-713f-4682-8435-5280fbe8b2b4",
+                    "debe4907-95dc-442f-af3b-cec12f42ebda"
+                ]
+
+        """
+        params = {}
+        if product_id is not None:
+            params['product_id'] = product_id
+        return self.session.delete(self.__api_url + 'orders', params=params, auth=self.__auth).json()
 
     """ PAGINATED """
     """ Full interface support (untested) """
@@ -761,7 +799,7 @@ class API:
                 }
 
         """
-        return requests.get(self.__api_url + "orders/" + order_id, auth=self.__auth).json()
+        return self.session.get(self.__api_url + "orders/" + order_id, auth=self.__auth).json()
 
     """ PAGINATED """
 
@@ -835,7 +873,7 @@ class API:
                 'usd_volume': '37.69'
             }
         """
-        return requests.get(self.__api_url + "fees", auth=self.__auth).json()
+        return self.session.get(self.__api_url + "fees", auth=self.__auth).json()
 
     def _send_paginated_message(self, endpoint, params=None):
         """ Send API message that results in a paginated response.
@@ -863,8 +901,7 @@ class API:
         if params is None:
             params = dict()
         while True:
-            r = requests.get(self.__api_url + endpoint, params=params, auth=self.__auth, timeout=30)
-            # r = self.session.get(url, params=params, auth=self.auth, timeout=30)
+            r = self.session.get(self.__api_url + endpoint, params=params, auth=self.__auth, timeout=30)
             results = r.json()
             for result in results:
                 yield result
@@ -927,7 +964,7 @@ class API:
             params['account_id'] = account_id
         if email is not None:
             params['email'] = email
-        return requests.post(self.__api_url + "reports", data=json.dumps(params), auth=self.__auth).json()
+        return self.session.post(self.__api_url + "reports", data=json.dumps(params), auth=self.__auth).json()
 
     def get_report(self, report_id):
         """ Get report status.
@@ -941,7 +978,7 @@ class API:
             dict: Report details, including file url once it is created.
 
         """
-        return requests.get(self.__api_url + "reports/" + report_id, auth=self.__auth).json()
+        return self.session.get(self.__api_url + "reports/" + report_id, auth=self.__auth).json()
 
     def get_trailing_volume(self):
         """  Get your 30-day trailing volume for all products.
@@ -963,7 +1000,7 @@ class API:
                 ]
 
         """
-        return requests.get(self.__api_url + "users/self/trailing-volume", auth=self.__auth).json()
+        return self.session.get(self.__api_url + "users/self/trailing-volume", auth=self.__auth).json()
 
     def get_coinbase_accounts(self):
         """ Get a list of your coinbase accounts.
@@ -972,7 +1009,7 @@ class API:
             list: Coinbase account details.
 
         """
-        return requests.get(self.__api_url + 'coinbase-accounts', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'coinbase-accounts', auth=self.__auth).json()
 
     def get_product_ticker(self, product_id):
         """ Get recent market data for a product
@@ -989,7 +1026,7 @@ class API:
                 "time": "2015-11-14T20:46:03.511254Z"
             }
         """
-        return requests.get(self.__api_url + 'products/' + product_id + '/ticker', auth=self.__auth).json()
+        return self.session.get(self.__api_url + 'products/' + product_id + '/ticker', auth=self.__auth).json()
 
 # # Create custom authentication for Exchange
 # class CoinbaseExchangeAuth(AuthBase):
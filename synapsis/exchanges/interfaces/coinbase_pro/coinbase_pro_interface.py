@@ -16,19 +16,19 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import time
-
 import pandas as pd
 
 import synapsis.utils.time_builder
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.exchange_interface import ExchangeInterface
+from synapsis.exchanges.interfaces.coinbase_pro.coinbase_pro_user_stream import CoinbaseProUserStream
 from synapsis.exchanges.orders.limit_order import LimitOrder
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.stop_limit import StopLimit
 from synapsis.exchanges.orders.stop_loss import StopLossOrder
 from synapsis.exchanges.orders.take_profit import TakeProfitOrder
 from synapsis.utils.exceptions import APIException, InvalidOrder
+from synapsis.utils.history_downloader import download_windows, split_windows
 
 
 class CoinbaseProInterface(ExchangeInterface):
@@ -48,6 +48,15 @@ class CoinbaseProInterface(ExchangeInterface):
         except KeyError:
             pass
 
+    def start_user_stream(self):
+        if self.user_stream is not None:
+            return
+        if self.calls.is_sandbox:
+            self.user_stream = CoinbaseProUserStream(self,
+                                                     websocket_url="wss://ws-feed-public.sandbox.pro.coinbase.com")
+        else:
+            self.user_stream = CoinbaseProUserStream(self)
+
     def get_products(self):
         needed = self.needed['get_products']
         """
@@ -93,6 +102,9 @@ class CoinbaseProInterface(ExchangeInterface):
         Coinbase Pro: get_account
         """
         symbol = super().get_account(symbol=symbol)
+        cached = self._from_user_stream('get_account', symbol)
+        if cached is not None:
+            return cached
 
         needed = self.needed['get_account']
         """
@@ -353,6 +365,19 @@ class CoinbaseProInterface(ExchangeInterface):
         """
         return {"order_id": self.calls.cancel_order(order_id)}
 
+    def cancel_all(self, symbol: str = None) -> list:
+        """
+        Cancel every open order, or every open order on a symbol, in one request.
+
+        Returns:
+            list: Containing the order_id of each cancelled order. Example::
+            [{ "order_id": "c5ab5eae-76be-480e-8961-00792dc7e138" }]
+        """
+        response = self.calls.cancel_all(product_id=symbol)
+        if isinstance(response, dict):
+            raise APIException(response.get('message', response))
+        return [{"order_id": order_id} for order_id in response]
+
     def get_open_orders(self, symbol=None):
         """
         List open orders.
@@ -381,6 +406,9 @@ class CoinbaseProInterface(ExchangeInterface):
             }
         ]
         """
+        cached = self._from_user_stream('get_open_orders', symbol)
+        if cached is not None:
+            return cached
         if symbol is None:
             orders = list(self.calls.get_orders())
         else:
@@ -438,6 +466,9 @@ class CoinbaseProInterface(ExchangeInterface):
             'settled': True
         }
         """
+        cached = self._from_user_stream('get_order', order_id)
+        if cached is not None:
+            return cached
         response = self.calls.get_order(order_id)
         if 'message' in response:
             # This part will run through all orders if the user enables the setting
@@ -517,34 +548,17 @@ class CoinbaseProInterface(ExchangeInterface):
 
         resolution = int(resolution)
 
-        # Figure out how many points are needed
-        need = int((epoch_stop - epoch_start) / resolution)
-        initial_need = need
-        window_open = epoch_start
-        history = []
-        # Iterate while its more than max
-        while need > 300:
-            # Close is always 300 points ahead
-            window_close = window_open + 300 * resolution
-            open_iso = utils.iso8601_from_epoch(window_open)
-            close_iso = utils.iso8601_from_epoch(window_close)
-            response = self.calls.get_product_historic_rates(symbol, open_iso, close_iso, resolution)
+        def fetch(window_open, window_close):
+            response = self.calls.get_product_historic_rates(symbol, utils.iso8601_from_epoch(window_open),
+                                                             utils.iso8601_from_epoch(window_close), resolution)
             if isinstance(response, dict):
                 raise APIException(response['message'])
-            history = history + response
+            return response
 
-            window_open = window_close
-            need -= 300
-            time.sleep(.2)
-            utils.update_progress((initial_need - need) / initial_need)
-
-        # Fill the remainder
-        open_iso = utils.iso8601_from_epoch(window_open)
-        close_iso = utils.iso8601_from_epoch(epoch_stop)
-        response = self.calls.get_product_historic_rates(symbol, open_iso, close_iso, resolution)
-        if isinstance(response, dict):
-            raise APIException(response['message'])
-        history_block = history + response
+        # Coinbase returns at most 300 candles per request
+        windows = split_windows(epoch_start, epoch_stop, resolution, 300)
+        history_block = download_windows(fetch, windows, 'coinbase_pro',
+                                         settings=self.user_preferences['settings']['history_download'])
         history_block.sort(key=lambda x: x[0])
 
         df = pd.DataFrame(history_block, columns=['time', 'low', 'high', 'open', 'close', 'volume'])
@@ -0,0 +1,88 @@
+"""
+    Coinbase Pro authenticated user channel.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+
+from dateutil import parser
+
+from synapsis.exchanges.interfaces.user_stream import UserStream
+from synapsis.utils.utils import info_print
+
+# Message types on the user channel that describe one of our orders
+order_messages = {
+    'received': 'pending',
+    'open': 'open',
+    'change': 'open',
+    'done': 'done'
+}
+
+
+class CoinbaseProUserStream(UserStream):
+    def __init__(self, interface, websocket_url="wss://ws-feed.pro.coinbase.com", **kwargs):
+        """
+        Follow the authenticated user channel. It reports orders but not balances, so balances are downloaded again
+        in the background whenever an order changes them.
+
+        Args:
+            interface: The authenticated CoinbaseProInterface
+            websocket_url: Websocket feed URL
+        """
+        self.__product_ids = None
+        super().__init__(interface, websocket_url, **kwargs)
+
+    def get_url(self) -> str:
+        # The user channel only reports the products it is subscribed to
+        if self.__product_ids is None:
+            self.__product_ids = [product['symbol'] for product in self.interface.get_products()]
+        return self.url
+
+    def authenticate(self, ws):
+        ws.send(json.dumps({
+            'type': 'subscribe',
+            'product_ids': self.__product_ids,
+            'channels': ['user'],
+            **self.interface.get_calls().get_websocket_auth()
+        }))
+
+    def handle(self, message: dict):
+        message_type = message.get('type')
+        if message_type == 'subscriptions':
+            self.subscribed()
+        elif message_type == 'error':
+            info_print(f"Coinbase Pro user stream error: {message.get('message')} {message.get('reason', '')}")
+        elif message_type in order_messages:
+            order = {
+                'id': message['order_id'],
+                'symbol': message['product_id'],
+                'side': message['side'],
+                'status': order_messages[message_type]
+            }
+            if message_type == 'received':
+                order['type'] = message['order_type']
+                order['created_at'] = parser.isoparse(message['time']).timestamp()
+                if 'price' in message:
+                    order['price'] = message['price']
+                    order['time_in_force'] = 'GTC'
+                if 'size' in message:
+                    order['size'] = message['size']
+            elif message_type == 'change' and 'new_size' in message:
+                order['size'] = message['new_size']
+            self.cache.update_order(self.shape_order(order) if 'type' in order else order)
+            # Placing, filling or cancelling moves funds between available and hold
+            self.refresh_account()
+        elif message_type == 'match':
+            self.refresh_account()
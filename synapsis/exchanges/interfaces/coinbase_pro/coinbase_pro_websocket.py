@@ -17,7 +17,6 @@
 """
 
 import json
-import time
 import traceback
 
 import synapsis
@@ -26,44 +25,22 @@ from synapsis.exchanges.interfaces.websocket import Websocket
 from synapsis.utils.utils import info_print
 
 
-def create_ticker_connection(id, url, channel):
-    ws = None  # create_connection(url, sslopt={"cert_reqs": ssl.CERT_NONE})
-    request = """{
-    "type": "subscribe",
-    "product_ids": [
-        \"""" + id + """\"
-    ],
-    "channels": [ \"""" + channel + """\" ]
-    }"""
-    ws.send(request)
-    return ws
-
-
-# This could be needed:
-# "channels": [
-#     {
-#         "name": "ticker",
-#         "product_ids": [
-#             \"""" + id + """\"
-#         ]
-#     }
-# ]
-
-
 class Tickers(Websocket):
     def __init__(self, symbol, stream, log=None,
                  pre_event_callback=None, initially_stopped=False, websocket_url="wss://ws-feed.pro.coinbase.com",
-                 **kwargs):
+                 transport=None, **kwargs):
         """
         Create and initialize the ticker
         Args:
             symbol: Currency to initialize on such as "BTC-USD"
             log: Fill this with a path to a log file that should be created
             websocket_url: Default websocket URL feed.
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
         """
         self.__logging_callback, self.__interface_callback, log_message = websocket_utils.switch_type(stream)
 
-        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs)
+        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs, transport)
+        self.field_extractors = websocket_utils.field_extractors(stream)
 
         self.__pre_event_callback_filled = False
 
@@ -80,73 +57,12 @@ class Tickers(Websocket):
     def run_forever(self):
         """
         This is the target from the super
-
-        It's renamed to run_forever in coinbase pro because I think that ancient code below is cool
         """
         self.ws.run_forever()
 
-    """
-    This function has some of the oldest code in the entire package
-    """
-    def read_websocket(self):
-        # This is unique because coinbase first sends the entire orderbook to use
-        if self.__pre_event_callback is not None and self.__stream == "level2":
-            received_string = json.loads(self.ws.recv())
-            if received_string['type'] == 'snapshot':
-                try:
-                    self.__pre_event_callback(received_string)
-                except Exception:
-                    traceback.print_exc()
-
-        counter = 0
-        # TODO port this to "WebSocketApp" found in the websockets documentation
-        while self.ws.connected:
-            # In case the user closes while its reading from the websocket, this will let it expire
-            persist_connected = self.ws.connected
-            try:
-                received_string = self.ws.recv()
-                received = json.loads(received_string)
-                # Modify time to use epoch
-                self.__most_recent_time = synapsis.utils.epoch_from_iso8601(received["time"])
-                received["time"] = self.__most_recent_time
-                self.__time_feed.append(self.__most_recent_time)
-
-                if self.__log:
-                    if counter % 100 == 0:
-                        self.__file.close()
-                        self.__file = open(self.__filePath, 'a')
-                    line = self.__logging_callback(received)
-                    self.__file.write(line)
-
-                # Manage price events and fire for each manager attached
-                interface_message = self.__interface_callback(received)
-                self.__ticker_feed.append(interface_message)
-                self.__most_recent_tick = interface_message
-
-                try:
-                    for i in self.__callbacks:
-                        i(interface_message)
-                except Exception:
-                    traceback.print_exc()
-
-                counter += 1
-            except Exception as e:
-                if persist_connected:
-                    traceback.print_exc()
-                    pass
-                else:
-                    traceback.print_exc()
-                    print("Error reading ticker websocket for " + self.__id + " on " +
-                          self.__stream + ": attempting to re-initialize")
-                    # Give a delay so this doesn't eat up from the main thread if it takes many tries to initialize
-                    time.sleep(2)
-                    self.ws.close()
-                    # Update response
-                    self.response = self.ws.recv()
-
     def on_message(self, ws, message):
         received_string = message
-        received = json.loads(received_string)
+        received = self.loads(received_string)
 
         if received['type'] == 'subscriptions':
             info_print(f"Subscribed to {received['channels']}")
@@ -172,13 +88,12 @@ class Tickers(Websocket):
         self.log_response(self.__logging_callback, received)
 
         # Manage price events and fire for each manager attached
-        interface_message = self.__interface_callback(received)
+        interface_message = self.normalize(received, self.__interface_callback)
         self.ticker_feed.append(interface_message)
         self.most_recent_tick = interface_message
 
         try:
-            for i in self.callbacks:
-                i(interface_message, **self.kwargs)
+            self.run_callbacks(interface_message)
         except Exception:
             traceback.print_exc()
 
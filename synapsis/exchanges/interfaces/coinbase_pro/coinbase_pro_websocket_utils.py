@@ -35,6 +35,15 @@ def switch_type(stream):
         return no_callback, no_callback, ""
 
 
+def field_extractors(stream):
+    """
+    Functions that read a single interface field out of a raw message, used when callbacks only need a few fields
+    """
+    if stream == "ticker":
+        return trade_fields
+    return None
+
+
 def no_callback(message):
     return message
 
@@ -73,3 +82,13 @@ def trade_interface(message):
     message['symbol'] = message.pop('product_id')
     message['size'] = message.pop('last_size')
     return utils.isolate_specific(needed, message)
+
+
+# The same conversions as trade_interface, one field at a time
+trade_fields = {
+    'symbol': lambda message: message['product_id'],
+    'price': lambda message: float(message['price']),
+    'size': lambda message: float(message['last_size']),
+    'time': lambda message: float(message['time']),
+    'trade_id': lambda message: int(message['trade_id']),
+}
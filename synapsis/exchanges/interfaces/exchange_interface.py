@@ -21,6 +21,7 @@ from functools import lru_cache
 
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
+from synapsis.exchanges.interfaces.order_filter import OrderFilter
 
 
 # TODO: need to add a cancel all orders function
@@ -36,6 +37,12 @@ class ExchangeInterface(ABCExchangeInterface, abc.ABC):
         # Some exchanges like binance will not return a value of 0.00 if there is no balance
         self.available_currencies = {}
 
+        # Private stream that serves balances and orders locally once started
+        self.user_stream = None
+
+        # symbol -> OrderFilter, the increments and limits don't change so each is compiled once
+        self.compiled_order_filters = {}
+
         self.needed = {
             '__init_exchange__': [
                 ['maker_fee_rate', float],
@@ -192,6 +199,31 @@ class ExchangeInterface(ABCExchangeInterface, abc.ABC):
         """
         return None
 
+    def start_user_stream(self):
+        """
+        Subscribe to the exchange's private stream so get_account, get_open_orders and get_order are answered from
+        memory. Overridden by interfaces that have one, the rest keep using REST.
+        """
+        utils.info_print(f"No user data stream is available for {self.exchange_name}, using REST.")
+
+    def get_user_data_cache(self):
+        """
+        Returns:
+            The user stream cache if it is in sync with the exchange, otherwise None
+        """
+        if self.user_stream is not None and self.user_stream.cache.synced:
+            return self.user_stream.cache
+        return None
+
+    def _from_user_stream(self, query: str, *args):
+        """
+        Answer get_account, get_open_orders or get_order from the user stream cache. None means REST is needed.
+        """
+        cache = self.get_user_data_cache()
+        if cache is None:
+            return None
+        return getattr(cache, query)(*args)
+
     @staticmethod
     def evaluate_multiples(valid_resolutions: list, resolution_seconds: float):
         found_multiple = -1
@@ -258,6 +290,16 @@ class ExchangeInterface(ABCExchangeInterface, abc.ABC):
     def should_auto_trunc(self):
         return self.user_preferences['settings'].get('auto_truncate', False)
 
+    def get_compiled_order_filter(self, symbol: str) -> OrderFilter:
+        """
+        The order filter of a symbol compiled for validating and rounding orders without parsing it each time
+        """
+        order_filter = self.compiled_order_filters.get(symbol)
+        if order_filter is None:
+            order_filter = OrderFilter(self.get_order_filter(symbol))
+            self.compiled_order_filters[symbol] = order_filter
+        return order_filter
+
     @lru_cache(None)
     def get_asset_precision(self, asset):
         try:
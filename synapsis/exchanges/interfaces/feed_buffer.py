@@ -0,0 +1,152 @@
+"""
+    Preallocated ring buffers for the ticker and time feeds of a websocket.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+from synapsis.utils.utils import AttributeDict
+
+sides = {'buy': 1, 'sell': -1}
+
+
+class FeedBuffer:
+    def __init__(self, capacity: int, columns: dict, keep_messages: bool = False):
+        """
+        Keep the last capacity entries of a feed in typed arrays that are allocated once. Every entry is written
+        twice, half the array apart, so the newest entries are always one contiguous slice and can be read as views.
+
+        A cursor counts every entry ever written. Readers remember the cursor they last saw and ask for only the
+        entries written since then. The websocket is the only writer and moves the cursor once an entry is written.
+        A spare slot keeps the entry being written out of every view, so readers don't need a lock.
+
+        Args:
+            capacity: Number of entries kept
+            columns: Column name -> numpy dtype
+            keep_messages: Also keep the original message of each entry so get_feed can return them
+        """
+        if capacity < 1:
+            raise ValueError("The capacity of a feed buffer must be at least 1.")
+        self.capacity = capacity
+        self.columns = dict(columns)
+        self.__slots = capacity + 1
+        self.arrays = {column: np.zeros(2 * self.__slots, dtype=dtype) for column, dtype in self.columns.items()}
+        self.messages = np.empty(2 * self.__slots, dtype=object) if keep_messages else None
+        self.cursor = 0
+
+    def write(self, values: dict, message=None):
+        """
+        Args:
+            values: Value of each column, missing columns are written as zero
+            message: Original message, kept if keep_messages was set
+        """
+        index = self.cursor % self.__slots
+        mirror = index + self.__slots
+        for column, array in self.arrays.items():
+            array[index] = array[mirror] = values.get(column, 0)
+        if self.messages is not None:
+            self.messages[index] = self.messages[mirror] = message
+        self.cursor += 1
+
+    def __len__(self) -> int:
+        return min(self.cursor, self.capacity)
+
+    def __bounds(self, cursor: int, since: int = None) -> (int, int):
+        length = min(cursor, self.capacity)
+        if since is not None:
+            # Entries older than the buffer are gone, only what is left is returned
+            length = min(length, max(cursor - since, 0))
+        end = cursor % self.__slots + self.__slots
+        return end - length, end
+
+    def view(self, column: str, since: int = None) -> np.ndarray:
+        """
+        Read only view of a column, oldest first. The view is overwritten as entries are added, copy it to keep it.
+
+        Args:
+            column: Name of the column
+            since: Only include entries written after this cursor
+        """
+        start, end = self.__bounds(self.cursor, since)
+        view = self.arrays[column][start:end]
+        view.flags.writeable = False
+        return view
+
+    def since(self, cursor: int = None) -> (AttributeDict, int):
+        """
+        Get a view of every column and the cursor to pass next time to only get newer entries
+
+        Args:
+            cursor: Cursor returned by the last call, None for every entry in the buffer
+        """
+        # Read the cursor once so every column covers the same entries
+        current = self.cursor
+        start, end = self.__bounds(current, cursor)
+        views = AttributeDict()
+        for column, array in self.arrays.items():
+            view = array[start:end]
+            view.flags.writeable = False
+            views[column] = view
+        return views, current
+
+    def to_list(self, column: str = None) -> list:
+        """
+        Copy the messages, or a column if given, into a list
+        """
+        start, end = self.__bounds(self.cursor)
+        if column is None:
+            return list(self.messages[start:end])
+        return self.arrays[column][start:end].tolist()
+
+
+class TimeFeed(FeedBuffer):
+    def __init__(self, capacity: int):
+        """
+        Times of the messages received by a websocket
+        """
+        super().__init__(capacity, {'time': np.float64})
+
+    def append(self, time: float):
+        try:
+            time = float(time)
+        except (TypeError, ValueError):
+            time = np.nan
+        self.write({'time': time})
+
+
+class TickerFeed(FeedBuffer):
+    def __init__(self, capacity: int):
+        """
+        Interface messages received by a websocket, with their time, price, size and side in typed columns. Side is
+        1 for buys, -1 for sells and 0 if the exchange doesn't say. Messages without a price, such as orderbook
+        updates, have NaN prices.
+        """
+        super().__init__(capacity, {'time': np.float64, 'price': np.float64, 'size': np.float64, 'side': np.int8},
+                         keep_messages=True)
+
+    def append(self, message: dict):
+        self.write({
+            'time': self.__number(message, 'time'),
+            'price': self.__number(message, 'price'),
+            'size': self.__number(message, 'size'),
+            'side': sides.get(message.get('side'), 0) if isinstance(message, dict) else 0
+        }, message)
+
+    @staticmethod
+    def __number(message: dict, key: str) -> float:
+        try:
+            return float(message[key])
+        except (KeyError, TypeError, ValueError):
+            return np.nan
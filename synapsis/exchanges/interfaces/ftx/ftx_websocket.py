@@ -27,17 +27,19 @@ from synapsis.utils.utils import info_print
 
 class Tickers(Websocket):
     def __init__(self, symbol, stream, log=None,
-                 pre_event_callback=None, initially_stopped=False, websocket_url="wss://ftx.com/ws/", **kwargs):
+                 pre_event_callback=None, initially_stopped=False, websocket_url="wss://ftx.com/ws/", transport=None,
+                 **kwargs):
         """
         Create and initialize the ticker
         Args:
             symbol: Currency to initialize on such as "BTC-USD"
             log: Fill this with a path to a log file that should be created
             websocket_url: Default websocket URL feed.
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
         """
         self.__logging_callback, self.__interface_callback, log_message = websocket_utils.switch_type(stream)
 
-        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs)
+        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs, transport)
 
         self.__pre_event_callback_filled = False
 
@@ -61,7 +63,7 @@ class Tickers(Websocket):
         """
         Behavior for this exchange
         """
-        received_dict = json.loads(message)
+        received_dict = self.loads(message)
         if received_dict['type'] == 'subscribed':
             info_print(f"Subscribed to {received_dict['channel']}")
             return
@@ -85,8 +87,7 @@ class Tickers(Websocket):
 
             try:
                 interface_response['symbol'] = received_dict['market']
-                for i in self.callbacks:
-                    i(interface_response, **self.kwargs)
+                self.run_callbacks(interface_response)
             except Exception as e:
                 info_print(e)
                 traceback.print_exc()
@@ -104,8 +105,7 @@ class Tickers(Websocket):
                 self.log_response(self.__logging_callback, received)
 
                 try:
-                    for i in self.callbacks:
-                        i(interface_response)
+                    self.run_callbacks(interface_response)
                 except Exception as e:
                     info_print(e)
                     traceback.print_exc()
@@ -16,18 +16,18 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import time
-
 import pandas as pd
 
 import synapsis.utils.time_builder
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.exchange_interface import ExchangeInterface
+from synapsis.exchanges.interfaces.kucoin.kucoin_user_stream import KucoinUserStream
 from synapsis.exchanges.orders.limit_order import LimitOrder
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.stop_loss import StopLossOrder
 from synapsis.exchanges.orders.take_profit import TakeProfitOrder
 from synapsis.utils.exceptions import APIException, InvalidOrder
+from synapsis.utils.history_downloader import download_windows, split_windows
 
 
 class KucoinInterface(ExchangeInterface):
@@ -57,6 +57,11 @@ class KucoinInterface(ExchangeInterface):
         except KeyError:
             pass
 
+    def start_user_stream(self):
+        if self.user_stream is not None:
+            return
+        self.user_stream = KucoinUserStream(self)
+
     @staticmethod
     def __correct_api_call(response):
         if isinstance(response, dict):
@@ -115,6 +120,9 @@ class KucoinInterface(ExchangeInterface):
                 These arguments are mutually exclusive
         """
         symbol = super().get_account(symbol=symbol)
+        cached = self._from_user_stream('get_account', symbol)
+        if cached is not None:
+            return cached
 
         """
         [
@@ -313,6 +321,9 @@ class KucoinInterface(ExchangeInterface):
             ]
          }
         """
+        cached = self._from_user_stream('get_open_orders', symbol)
+        if cached is not None:
+            return cached
         if symbol is None:
             open_orders = list(self.__correct_api_call(self._trade.get_order_list(status='active')["items"]))
         else:
@@ -374,6 +385,9 @@ class KucoinInterface(ExchangeInterface):
             "tradeType": "TRADE"
         }
         """
+        cached = self._from_user_stream('get_order', order_id)
+        if cached is not None:
+            return cached
         response = self._trade.get_order_details(order_id)
         response = self.__correct_api_call(response)
 
@@ -475,36 +489,18 @@ class KucoinInterface(ExchangeInterface):
         }
         gran_string = lookup_dict[resolution]
 
-        # Figure out how many points are needed
-        need = int((epoch_stop - epoch_start) / resolution)
-        initial_need = need
-        window_open = epoch_start
-        history = []
-
-        while need > 1500:
-            # Close is always 300 points ahead
-            window_close = int(window_open + 1500 * resolution)
-            response = self._market.get_kline(symbol, gran_string,
-                                              startAt=window_open, endAt=window_close)
-            response = self.__correct_api_call(response)
+        def fetch(window_open, window_close):
+            response = self.__correct_api_call(self._market.get_kline(symbol, gran_string,
+                                                                      startAt=window_open, endAt=window_close))
             if isinstance(response, dict):
                 raise APIException(response['msg'])
-            history = history + response
-
-            window_open = window_close
-            need -= 1500
-            time.sleep(1)
-            utils.update_progress((initial_need - need) / initial_need)
-
-        # Fill the remainder
-        response = self._market.get_kline(symbol, gran_string,
-                                          startAt=window_open, endAt=epoch_stop)
-        response = self.__correct_api_call(response)
-        if isinstance(response, dict):
-            raise APIException(response['msg'])
+            return response
 
-        history = history + response
-        history.sort(key=lambda x: x[0])
+        # Kucoin returns at most 1500 candles per request and each request weighs 3
+        windows = split_windows(epoch_start, epoch_stop, resolution, 1500)
+        history = download_windows(fetch, windows, 'kucoin', weight=3,
+                                   settings=self.user_preferences['settings']['history_download'])
+        history.sort(key=lambda x: int(x[0]))
 
         df = pd.DataFrame(history, columns=['time', 'open', 'close', 'high', 'low', 'volume', 'turnover'])
         del df['turnover']
@@ -622,3 +618,18 @@ class KucoinInterface(ExchangeInterface):
                 raise APIException("Unknown API error")
             raise APIException("Error: " + response['msg'])
         return float(response['price'])
+
+    def get_prices(self, symbols: list) -> dict:
+        """
+        Returns the last traded prices of several symbols from a single all tickers request.
+        """
+        response = self.__correct_api_call(self._market.get_all_tickers())
+        if response is None:
+            raise APIException("Unknown API error")
+        tickers = {ticker['symbol']: ticker['last'] for ticker in response['ticker']}
+        prices = {}
+        for symbol in symbols:
+            if tickers.get(symbol) is None:
+                raise APIException(f"No price found for {symbol}.")
+            prices[symbol] = float(tickers[symbol])
+        return prices
@@ -0,0 +1,85 @@
+"""
+    Kucoin private order and balance topics.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import random
+
+from synapsis.exchanges.interfaces.user_stream import UserStream
+from synapsis.utils.utils import info_print
+
+topics = ('/spotMarket/tradeOrders', '/account/balance')
+
+
+class KucoinUserStream(UserStream):
+    def __init__(self, interface, **kwargs):
+        """
+        Follow the private tradeOrders and balance topics
+
+        Args:
+            interface: The authenticated KucoinInterface
+        """
+        self.__ping_interval = 18
+        self.__acknowledged = set()
+        super().__init__(interface, None, **kwargs)
+
+    def get_url(self) -> str:
+        # Private tokens come from a signed request that the client library doesn't wrap
+        token = self.interface.get_calls()['user']._request('POST', '/api/v1/bullet-private')
+        server = token['instanceServers'][0]
+        self.__ping_interval = server['pingInterval'] / 1000
+        return f"{server['endpoint']}?token={token['token']}&connectId={random.randint(1, 100000000)}"
+
+    def authenticate(self, ws):
+        # Kucoin sends a welcome message first, the subscriptions are sent once it arrives
+        self.__acknowledged = set()
+
+    def handle(self, message: dict):
+        message_type = message.get('type')
+        if message_type == 'welcome':
+            for topic in topics:
+                self.ws.send(json.dumps({
+                    'id': topic,
+                    'type': 'subscribe',
+                    'topic': topic,
+                    'privateChannel': True,
+                    'response': True
+                }))
+            self.repeat(self.__ping_interval, lambda: self.ws.send(json.dumps({'id': 'ping', 'type': 'ping'})))
+        elif message_type == 'ack' and message.get('id') in topics:
+            self.__acknowledged.add(message['id'])
+            if len(self.__acknowledged) == len(topics):
+                self.subscribed()
+        elif message_type == 'error':
+            info_print(f"Kucoin user stream error: {message.get('data')}")
+        elif message_type == 'message':
+            data = message['data']
+            if message['topic'] == '/spotMarket/tradeOrders':
+                order = {
+                    'id': data['orderId'],
+                    'symbol': data['symbol'],
+                    'side': data['side'],
+                    'type': data['orderType'],
+                    'status': 'done' if data['type'] in ('filled', 'canceled') else 'pending',
+                    'size': data.get('size', 0),
+                    'created_at': data['orderTime'] / 1e6
+                }
+                if 'price' in data:
+                    order['price'] = data['price']
+                    order['time_in_force'] = 'GTC'
+                self.cache.update_order(self.shape_order(order))
+            elif message['topic'] == '/account/balance':
+                self.cache.update_balance(data['currency'], float(data['available']), float(data['hold']))
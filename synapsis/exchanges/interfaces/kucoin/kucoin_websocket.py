@@ -28,18 +28,20 @@ from synapsis.utils.utils import info_print
 class Tickers(Websocket):
     def __init__(self, symbol, stream, websocket_url, log=None,
                  pre_event_callback=None, initially_stopped=False,
-                 id_=None, **kwargs):
+                 id_=None, transport=None, **kwargs):
         """
         Create and initialize the ticker
         Args:
             symbol: Currency to initialize on such as "BTC-USD"
             log: Fill this with a path to a log file that should be created
             websocket_url: Default websocket URL feed.
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
         """
         self.id = id_
         self.__logging_callback, self.__interface_callback, log_message = websocket_utils.switch_type(stream)
 
-        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs)
+        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs, transport)
+        self.field_extractors = websocket_utils.field_extractors(stream)
 
         # Start the websocket
         if not initially_stopped:
@@ -60,7 +62,7 @@ class Tickers(Websocket):
         Exchange specific actions to perform when receiving a message
         """
         # print(message)
-        message = json.loads(message)
+        message = self.loads(message)
 
         if message['type'] == 'subscribe':
             channel = message['topic'].split(":", 1)[0].split("/", 2)[2]
@@ -79,13 +81,12 @@ class Tickers(Websocket):
         self.log_response(self.__logging_callback, message)
 
         # Manage price events and fire for each manager attached
-        interface_message = self.__interface_callback(message)
+        interface_message = self.normalize(message, self.__interface_callback)
         self.ticker_feed.append(interface_message)
         self.most_recent_tick = interface_message
 
         try:
-            for i in self.callbacks:
-                i(interface_message, **self.kwargs)
+            self.run_callbacks(interface_message)
         except Exception as e:
             info_print(e)
             traceback.print_exc()
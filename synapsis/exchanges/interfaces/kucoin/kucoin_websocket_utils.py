@@ -16,6 +16,15 @@ def switch_type(stream):
         return no_callback, no_callback, ""
 
 
+def field_extractors(stream):
+    """
+    Functions that read a single interface field out of a raw message, used when callbacks only need a few fields
+    """
+    if stream == "ticker":
+        return trade_fields
+    return None
+
+
 def no_callback(message):
     return message
 
@@ -51,3 +60,13 @@ def trade_interface(message):
     isolated = isolate_specific(needed, message)
 
     return isolated
+
+
+# The same conversions as trade_interface, one field at a time
+trade_fields = {
+    'symbol': lambda message: message['topic'].split(":", 1)[1],
+    'price': lambda message: float(message['data']['price']),
+    'size': lambda message: float(message['data']['size']),
+    'time': lambda message: time.time(),
+    'trade_id': lambda message: int(message['data']['sequence']),
+}
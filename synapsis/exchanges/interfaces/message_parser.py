@@ -0,0 +1,81 @@
+"""
+    Fast json decoding and per field extraction of websocket messages.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+json_backends = ('auto', 'orjson', 'json')
+
+# Fields that are always extracted because the websocket keeps them in its ticker feed and most recent tick
+feed_fields = ('symbol', 'time', 'price', 'size', 'side')
+
+
+def get_loads(backend: str = 'auto'):
+    """
+    Get the function used to decode websocket messages
+
+    Args:
+        backend: 'orjson', 'json' or 'auto' to use orjson when it is installed
+    """
+    if backend not in json_backends:
+        raise ValueError(f"Websocket json backend must be one of {json_backends}, got: {backend}")
+    if backend == 'orjson' and orjson is None:
+        raise ImportError("Please \"pip install orjson\" to use the orjson websocket json backend.")
+    if backend != 'json' and orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+def merge_fields(declared, fields):
+    """
+    Combine the fields read by the callbacks of a websocket. None means a callback reads the whole message, which
+    then has to be fully normalized for every callback.
+
+    Args:
+        declared: Fields declared so far, None once any callback reads everything
+        fields: Fields the new callback reads, or None
+    """
+    if declared is None or fields is None:
+        return None
+    return tuple(dict.fromkeys((*declared, *fields)))
+
+
+def compile_extractors(extractors: dict, fields):
+    """
+    Pick the extractors for a set of fields, along with the feed fields the exchange provides. Returns None if the
+    message has to be normalized the usual way, because the fields aren't known or one of them can't be extracted on
+    its own.
+
+    Args:
+        extractors: Field name -> function of the raw message, from the exchange websocket utils
+        fields: Fields read by the callbacks
+    """
+    if not fields or extractors is None or any(field not in extractors for field in fields):
+        return None
+    fields = merge_fields(fields, [field for field in feed_fields if field in extractors])
+    return tuple((field, extractors[field]) for field in fields)
+
+
+def extract(message: dict, extractors: tuple) -> dict:
+    """
+    Build an interface message containing only the compiled fields
+    """
+    return {field: extractor(message) for field, extractor in extractors}
@@ -19,10 +19,10 @@
 
 import json
 
-import requests
 from collections import OrderedDict
 
 from synapsis.utils.exceptions import APIException
+from synapsis.utils.http_session import HTTPSession
 
 
 def api_error_handler(func):
@@ -51,7 +51,7 @@ class OandaAPI:
         self.session = self._init_session()
 
     def _init_session(self):
-        session = requests.session()
+        session = HTTPSession('oanda')
         session.headers.update({"Content-Type": "application/json",
                                 "Accept-Datetime-Format": "UNIX",
                                 'Authorization': 'Bearer {}'.format(self.__api_key)})
@@ -1,10 +1,12 @@
-import requests
 import hmac
 import base64
 import datetime
-# import time
+import time
 import json
 
+from synapsis.utils.clock_offset import get_clock
+from synapsis.utils.http_session import get_session
+
 CONTENT_TYPE = 'Content-Type'
 OK_ACCESS_KEY = 'OK-ACCESS-KEY'
 OK_ACCESS_SIGN = 'OK-ACCESS-SIGN'
@@ -22,6 +24,9 @@ POST = "POST"
 
 SERVER_TIMESTAMP_URL = '/api/v5/public/time'
 
+# Error codes for a request timestamp that is expired or too far from the server time
+TIMESTAMP_ERRORS = ('50102', '50112')
+
 # account
 POSITION_RISK = '/api/v5/account/account-position-risk'
 ACCOUNT_INFO = '/api/v5/account/balance'
@@ -196,8 +201,11 @@ def parse_params_to_str(params):
     return url[0:-1]
 
 
-def get_timestamp():
-    now = datetime.datetime.utcnow()
+def get_timestamp(epoch: float = None):
+    if epoch is None:
+        now = datetime.datetime.utcnow()
+    else:
+        now = datetime.datetime.utcfromtimestamp(epoch)
     t = now.isoformat("T", "milliseconds")
     return t + "Z"
 
@@ -268,6 +276,10 @@ class Client(object):
         self._sandbox = sandbox
 
         self.api_url = 'https://www.okx.com'
+        self.session = get_session('okx')
+
+        # Timestamps are signed from the local clock corrected by an offset that is measured occasionally
+        self.clock = get_clock('okx', self._get_server_time) if use_server_time else None
 
     def _request(self, method, request_path, params):
 
@@ -276,31 +288,37 @@ class Client(object):
         # url
         url = self.api_url + request_path
 
-        timestamp = get_timestamp()
-
-        # sign & header
-        if self.use_server_time:
-            timestamp = self._get_timestamp()
-
         body = json.dumps(params) if method == POST else ""
 
-        sign_ = sign(pre_hash(timestamp, method, request_path, str(body)), self.API_SECRET_KEY)
-        header = get_header(self.API_KEY, sign_, timestamp, self.PASSPHRASE, self.flag)
-        if self._sandbox:
-            header["x-simulated-trading"] = '1'
+        # A rejected timestamp is retried once after measuring the clock again
+        attempts = 2 if self.use_server_time else 1
+        for attempt in range(attempts):
+            # sign & header
+            if self.use_server_time:
+                timestamp = get_timestamp(self.clock.time())
+            else:
+                timestamp = get_timestamp()
 
-        # send request
-        response = None
+            sign_ = sign(pre_hash(timestamp, method, request_path, str(body)), self.API_SECRET_KEY)
+            header = get_header(self.API_KEY, sign_, timestamp, self.PASSPHRASE, self.flag)
+            if self._sandbox:
+                header["x-simulated-trading"] = '1'
 
-        if method == GET:
-            response = requests.get(url, headers=header)
-        elif method == POST:
-            response = requests.post(url, data=body, headers=header)
+            # send request
+            response = None
 
-        if not str(response.status_code).startswith('2'):
-            raise OkxAPIException(response)
+            if method == GET:
+                response = self.session.get(url, headers=header)
+            elif method == POST:
+                response = self.session.post(url, data=body, headers=header)
+
+            if str(response.status_code).startswith('2'):
+                return response.json()
 
-        return response.json()
+            exception = OkxAPIException(response)
+            if exception.code not in TIMESTAMP_ERRORS or attempt == attempts - 1:
+                raise exception
+            self.clock.refresh()
 
     def _request_without_params(self, method, request_path):
         return self._request(method, request_path, {})
@@ -308,13 +326,28 @@ class Client(object):
     def _request_with_params(self, method, request_path, params):
         return self._request(method, request_path, params)
 
-    def _get_timestamp(self):
+    def get_websocket_login(self) -> dict:
+        """
+        Build the login message for the private websocket
+        """
+        timestamp = str(int(self.clock.time() if self.use_server_time else time.time()))
+        sign_ = sign(pre_hash(timestamp, GET, '/users/self/verify', ''), self.API_SECRET_KEY)
+        return {
+            'op': 'login',
+            'args': [{
+                'apiKey': self.API_KEY,
+                'passphrase': self.PASSPHRASE,
+                'timestamp': timestamp,
+                'sign': sign_.decode('utf-8')
+            }]
+        }
+
+    def _get_server_time(self) -> float:
         url = self.api_url + SERVER_TIMESTAMP_URL
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()['ts']
-        else:
-            return ""
+        response = self.session.get(url)
+        if response.status_code != 200:
+            raise OkxAPIException(response)
+        return int(response.json()['data'][0]['ts']) / 1000
 
 
 class MarketAPI(Client):
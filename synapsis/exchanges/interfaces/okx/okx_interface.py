@@ -3,11 +3,13 @@ import pandas as pd
 import synapsis.utils.time_builder
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.exchange_interface import ExchangeInterface
+from synapsis.exchanges.interfaces.okx.okx_user_stream import OkxUserStream
 from synapsis.exchanges.interfaces.okx.okx_api import MarketAPI, AccountAPI, TradeAPI, ConvertAPI, FundingAPI, PublicAPI
 from synapsis.exchanges.orders.limit_order import LimitOrder
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.take_profit import TakeProfitOrder
 from synapsis.utils.exceptions import APIException, InvalidOrder
+from synapsis.utils.history_downloader import download_windows
 
 
 class OkxInterface(ExchangeInterface):
@@ -33,6 +35,15 @@ class OkxInterface(ExchangeInterface):
         except KeyError:
             pass
 
+    def start_user_stream(self):
+        if self.user_stream is not None:
+            return
+        if self._trade._sandbox:
+            self.user_stream = OkxUserStream(self, self._trade,
+                                             websocket_url="wss://wspap.okx.com:8443/ws/v5/private?brokerId=9999")
+        else:
+            self.user_stream = OkxUserStream(self, self._trade)
+
     def get_products(self):
         instrument_type = "SPOT"
         needed = self.needed['get_products']
@@ -57,6 +68,9 @@ class OkxInterface(ExchangeInterface):
         """
 
         symbol = super().get_account(symbol=symbol)
+        cached = self._from_user_stream('get_account', symbol)
+        if cached is not None:
+            return cached
         needed = self.needed['get_account']
         accounts = self._account.get_account()
 
@@ -195,6 +209,104 @@ class OkxInterface(ExchangeInterface):
         response = self._trade.cancel_order(symbol, ordId=order_id)
         return {"order_id": response['data'][0]['ordId']}
 
+    @utils.order_protection
+    def batch_order(self, orders: list) -> list:
+        """
+        Market and limit orders are sent through batch-orders twenty at a time, other types are placed one by one.
+        The orders are built from the batch response instead of being fetched again one at a time.
+        """
+        results = [None] * len(orders)
+        batched = []
+        for index, order in enumerate(orders):
+            order_type, arguments = self._split_order(order)
+            if order_type not in ('market', 'limit'):
+                continue
+            size = arguments['size']
+            if self.should_auto_trunc:
+                size = utils.trunc(size, self.get_asset_precision(arguments['symbol']))
+            order_data = {
+                'instId': arguments['symbol'],
+                'tdMode': 'cash',
+                'side': arguments['side'],
+                'ordType': order_type,
+                'sz': str(size)
+            }
+            if order_type == 'limit':
+                order_data['px'] = str(arguments['price'])
+            batched.append((index, order_type, order_data))
+
+        for i in range(0, len(batched), 20):
+            chunk = batched[i:i + 20]
+            try:
+                response = self._trade.place_multiple_orders([order_data for _, _, order_data in chunk])
+                if len(response['data']) == 0:
+                    raise APIException("Error: " + response['msg'])
+            except Exception as e:
+                # None of the orders in a failed request were placed, the next chunks are still sent
+                for index, _, _ in chunk:
+                    results[index] = e
+                continue
+            for (index, order_type, order_data), placed in zip(chunk, response['data']):
+                if placed['sCode'] != '0':
+                    results[index] = InvalidOrder(f"{order_data['instId']}: {placed['sMsg']}")
+                    continue
+                price = order_data.get('px', 0)
+                response_details = {
+                    'created_at': time.time(),
+                    'id': placed['ordId'],
+                    'status': 'live',
+                    'symbol': order_data['instId'],
+                    'size': order_data['sz'],
+                    'side': order_data['side'],
+                    'price': price,
+                    'type': order_type
+                }
+                if order_type == 'limit':
+                    response_details['time_in_force'] = 'GTC'
+                response_details = utils.isolate_specific(self.needed[f'{order_type}_order'], response_details)
+                order_info = utils.build_order_info(price, order_data['side'], order_data['sz'],
+                                                    order_data['instId'], order_type)
+                if order_type == 'limit':
+                    results[index] = LimitOrder(order_info, response_details, self)
+                else:
+                    results[index] = MarketOrder(order_info, response_details, self)
+
+        batched_indexes = set(index for index, _, _ in batched)
+        others = [index for index in range(len(orders)) if index not in batched_indexes]
+        for index, result in zip(others, self._attempt_concurrently(self._submit_order,
+                                                                    [orders[index] for index in others])):
+            results[index] = result
+        return self._check_batch(results)
+
+    def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        """
+        Cancel through cancel-batch-orders twenty at a time.
+        """
+        return self.__cancel_batch([(symbol, order_id) for order_id in order_ids])
+
+    def cancel_all(self, symbol: str = None) -> list:
+        """
+        Cancel every open order through cancel-batch-orders, which accepts orders on different symbols together.
+        """
+        return self.__cancel_batch([self._order_identity(order) for order in self.get_open_orders(symbol)])
+
+    def __cancel_batch(self, identities: list) -> list:
+        cancelled = []
+        errors = []
+        for i in range(0, len(identities), 20):
+            response = self._trade.cancel_multiple_orders([{'instId': symbol, 'ordId': order_id}
+                                                           for symbol, order_id in identities[i:i + 20]])
+            if len(response['data']) == 0:
+                raise APIException("Error: " + response['msg'])
+            for result in response['data']:
+                if result['sCode'] != '0':
+                    errors.append(f"{result['ordId']}: {result['sMsg']}")
+                else:
+                    cancelled.append({"order_id": result['ordId']})
+        if errors:
+            raise APIException("Error: " + ", ".join(errors))
+        return cancelled
+
     def get_open_orders(self,
                         symbol: str = None) -> list:
         """
@@ -228,6 +340,9 @@ class OkxInterface(ExchangeInterface):
             }
         ]
         """
+        cached = self._from_user_stream('get_open_orders', symbol)
+        if cached is not None:
+            return cached
         if symbol is None:
             orders = self._trade.get_order_list()
         else:
@@ -254,6 +369,9 @@ class OkxInterface(ExchangeInterface):
         return orders['data']
 
     def get_order(self, symbol, order_id) -> dict:
+        cached = self._from_user_stream('get_order', order_id)
+        if cached is not None:
+            return cached
         response = self._trade.get_orders(symbol, ordId=order_id)
 
         if 'message' in response:
@@ -348,17 +466,22 @@ class OkxInterface(ExchangeInterface):
 
         gran_string = lookup_dict[resolution]
 
-        history = []
+        # Okx pages backwards from the after timestamp, 100 candles at a time
+        page = 100 * 1000 * resolution
+        windows = []
         while init_epoch_start < init_epoch_stop + resolution * 100 * 1100:
-            response = self._market.get_history_candlesticks(symbol, after=init_epoch_start, bar=gran_string, limit=100)
-
-            if len(response['data']) != 0:
-                history = history + response['data']
-            init_epoch_start = init_epoch_start + (100 * 1000 * resolution)
-
-        history.sort(key=lambda x: x[0])
-        new_history = list(set(tuple(sub) for sub in history))
-        new_history.sort(key=lambda x: x[0])
+            windows.append((init_epoch_start, init_epoch_start + page))
+            init_epoch_start += page
+
+        def fetch(after, _):
+            response = self._market.get_history_candlesticks(symbol, after=after, bar=gran_string, limit=100)
+            if 'data' not in response:
+                raise APIException(response.get('msg', response))
+            return response['data']
+
+        rows = download_windows(fetch, windows, 'okx', settings=self.user_preferences['settings']['history_download'])
+        new_history = [tuple(row) for row in rows]
+        new_history.sort(key=lambda x: int(x[0]))
         df = pd.DataFrame(new_history, columns=['time', 'open', 'high', 'low', 'close', 'volume', 'volume_currency'])
         df = df.drop(columns=['volume_currency'])
         df[['time']] = df[['time']].astype('int64').div(1000).astype(int)
@@ -427,3 +550,21 @@ class OkxInterface(ExchangeInterface):
         if len(response['msg']) != 0:
             raise APIException("Error: " + response['msg'])
         return float(response['data'][0]['idxPx'])
+
+    def get_prices(self, symbols: list) -> dict:
+        """
+        Returns the prices of several currency pairs with one index ticker request per quote currency.
+        """
+        index_prices = {}
+        for quote in set(utils.get_quote_asset(symbol) for symbol in symbols):
+            response = self._market.get_index_ticker(quoteCcy=quote)
+            if len(response['msg']) != 0:
+                raise APIException("Error: " + response['msg'])
+            for ticker in response['data']:
+                index_prices[ticker['instId']] = ticker['idxPx']
+        prices = {}
+        for symbol in symbols:
+            if symbol not in index_prices:
+                raise APIException(f"No price found for {symbol}.")
+            prices[symbol] = float(index_prices[symbol])
+        return prices
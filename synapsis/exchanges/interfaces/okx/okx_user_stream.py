@@ -0,0 +1,83 @@
+"""
+    OKX private orders and account channels.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+
+from synapsis.exchanges.interfaces.user_stream import UserStream
+from synapsis.utils.utils import info_print
+
+# OKX drops connections that are quiet for 30 seconds
+PING_INTERVAL = 25
+
+channels = [
+    {'channel': 'orders', 'instType': 'SPOT'},
+    {'channel': 'account'}
+]
+
+
+class OkxUserStream(UserStream):
+    def __init__(self, interface, client, websocket_url="wss://ws.okx.com:8443/ws/v5/private", **kwargs):
+        """
+        Log in to the private endpoint and follow the orders and account channels
+
+        Args:
+            interface: The authenticated OkxInterface
+            client: Any authenticated okx_api client, used to sign the login
+            websocket_url: Private websocket URL
+        """
+        self.__client = client
+        self.__subscribed = set()
+        super().__init__(interface, websocket_url, **kwargs)
+
+    def authenticate(self, ws):
+        self.__subscribed = set()
+        ws.send(json.dumps(self.__client.get_websocket_login()))
+        self.repeat(PING_INTERVAL, lambda: self.ws.send('ping'))
+
+    def handle(self, message: dict):
+        event = message.get('event')
+        if event == 'login':
+            if message.get('code') != '0':
+                info_print(f"OKX user stream login failed: {message.get('msg')}")
+                return
+            self.ws.send(json.dumps({'op': 'subscribe', 'args': channels}))
+        elif event == 'subscribe':
+            self.__subscribed.add(message['arg']['channel'])
+            if len(self.__subscribed) == len(channels):
+                self.subscribed()
+        elif event == 'error':
+            info_print(f"OKX user stream error: {message.get('msg')}")
+        elif 'data' in message:
+            channel = message['arg']['channel']
+            if channel == 'orders':
+                for order in message['data']:
+                    self.cache.update_order(self.shape_order({
+                        'id': order['ordId'],
+                        'symbol': order['instId'],
+                        'side': order['side'],
+                        'type': order['ordType'],
+                        'status': order['state'],
+                        'price': order['px'] or None,
+                        'size': order['sz'],
+                        'time_in_force': 'GTC',
+                        'created_at': order['cTime']
+                    }))
+            elif channel == 'account':
+                for account in message['data']:
+                    for detail in account['details']:
+                        self.cache.update_balance(detail['ccy'], float(detail['availBal']),
+                                                  float(detail['frozenBal']))
@@ -27,17 +27,19 @@ from synapsis.utils.utils import info_print
 class Tickers(Websocket):
     def __init__(self, symbol, stream, log=None,
                  pre_event_callback=None, initially_stopped=False, websocket_url="wss://ws.okx.com:8443/ws/v5/public",
-                 **kwargs):
+                 transport=None, **kwargs):
         """
         Create and initialize the ticker
         Args:
             symbol: Currency to initialize on such as "BTC-USD"
             log: Fill this with a path to a log file that should be created
             websocket_url: Default websocket URL feed.
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
         """
         self.__logging_callback, self.__interface_callback, log_message = websocket_utils.switch_type(stream)
 
-        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs)
+        super().__init__(symbol, stream, log, log_message, websocket_url, pre_event_callback, kwargs, transport)
+        self.field_extractors = websocket_utils.field_extractors(stream)
 
         self.__pre_event_callback_filled = False
 
@@ -57,7 +59,7 @@ class Tickers(Websocket):
         self.ws.run_forever()
 
     def on_message(self, ws, message):
-        received_dict = json.loads(message)
+        received_dict = self.loads(message)
         if len(received_dict) == 2 and self.checked is not True:
             info_print(f"Subscribed to {received_dict['arg']['channel']}")
             self.checked = True
@@ -82,13 +84,12 @@ class Tickers(Websocket):
         if self.stream == "books":
             interface_message = self.__interface_callback(received_dict)
         else:  # self.stream == 'tickers':
-            interface_message = self.__interface_callback(received_dict['data'][0])
+            interface_message = self.normalize(received_dict['data'][0], self.__interface_callback)
         self.ticker_feed.append(interface_message)
         self.most_recent_tick = interface_message
 
         try:
-            for i in self.callbacks:
-                i(interface_message, **self.kwargs)
+            self.run_callbacks(interface_message)
         except Exception as e:
             info_print(e)
             traceback.print_exc()
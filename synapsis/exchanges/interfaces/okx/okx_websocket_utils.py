@@ -17,6 +17,15 @@ def switch_type(stream):
         return no_callback, no_callback, ""
 
 
+def field_extractors(stream):
+    """
+    Functions that read a single interface field out of a raw message, used when callbacks only need a few fields
+    """
+    if stream == "tickers":
+        return trade_fields
+    return None
+
+
 def no_callback(message):
     return message
 
@@ -49,3 +58,13 @@ def trade_interface(message):
     message['time'] = message['ts']
 
     return utils.isolate_specific(needed, message)
+
+
+# The same conversions as trade_interface, one field at a time
+trade_fields = {
+    'symbol': lambda message: '-'.join(message['instId'].split('-')[:2]),
+    'price': lambda message: float(message['last']),
+    'size': lambda message: float(message['lastSz']),
+    'time': lambda message: float(message['ts']),
+    'trade_id': lambda message: None,
+}
@@ -0,0 +1,159 @@
+"""
+    Order filters compiled once per symbol for fast order validation and rounding.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import math
+
+from synapsis.utils.exceptions import InvalidOrder
+from synapsis.utils.utils import count_decimals
+
+# Scaled values this close to a whole number of units are treated as whole, which absorbs float noise like 0.29 * 100
+_tolerance = 1e-9
+
+
+def _scale(value: float, decimals: int) -> (float, int):
+    """
+    Returns the value in units of 10^-decimals and the nearest whole number of units
+    """
+    scaled = value * 10 ** decimals
+    return scaled, round(scaled)
+
+
+def fits_resolution(value: float, decimals: int) -> bool:
+    """
+    Check that a value has no more than the given number of decimals
+    """
+    scaled, units = _scale(value, decimals)
+    return abs(scaled - units) <= _tolerance * max(1.0, abs(scaled))
+
+
+def truncate(value: float, decimals: int) -> float:
+    """
+    Truncate a value to the given number of decimals using whole units, so trunc(0.29, 2) stays 0.29
+    """
+    scaled, units = _scale(value, decimals)
+    if abs(scaled - units) > _tolerance * max(1.0, abs(scaled)):
+        units = math.trunc(scaled)
+    return units / 10 ** decimals
+
+
+class OrderFilter:
+    def __init__(self, order_filter: dict):
+        """
+        Read the increments and limits out of an order filter from get_order_filter so orders can be checked
+        without parsing the dictionary or counting decimals each time.
+
+        Args:
+            order_filter: Order filter dictionary for a single symbol
+        """
+        limit = order_filter['limit_order']
+        market = order_filter['market_order']
+        exchange_specific = order_filter.get('exchange_specific', {})
+
+        self.symbol = order_filter['symbol']
+
+        self.market_min_size = float(market['base_min_size'])
+        self.market_max_size = float(market['base_max_size'])
+        self.market_size_increment = market['base_increment']
+        self.market_size_decimals = count_decimals(self.market_size_increment)
+        self.quote_increment = market['quote_increment']
+        self.quote_decimals = count_decimals(self.quote_increment)
+
+        self.limit_min_size = float(limit['base_min_size'])
+        self.limit_max_size = float(limit['base_max_size'])
+        self.size_increment = limit['base_increment']
+        self.size_decimals = count_decimals(self.size_increment)
+        self.price_increment = limit['price_increment']
+        self.price_decimals = count_decimals(self.price_increment)
+        self.min_price = float(limit['min_price'])
+        self.max_price = float(limit['max_price'])
+
+        # Binance bounds limit prices to a band around the current price instead of fixed values
+        self.multiplier_up = exchange_specific.get('limit_multiplier_up')
+        self.multiplier_down = exchange_specific.get('limit_multiplier_down')
+        self.shortable = exchange_specific.get('shortable', False)
+
+    @property
+    def needs_reference_price(self) -> bool:
+        """
+        True if limit prices are bounded around the current price, which then has to be passed to check_limit_order
+        """
+        return self.multiplier_up is not None and self.multiplier_down is not None
+
+    def price_bounds(self, reference_price: float = None) -> (float, float):
+        if self.needs_reference_price and reference_price is not None:
+            return self.multiplier_down * reference_price, self.multiplier_up * reference_price
+        return self.min_price, self.max_price
+
+    def check_market_order(self, size: float, auto_truncate: bool) -> float:
+        """
+        Validate a market order and return its size, truncated to the increment if auto_truncate is set
+
+        Args:
+            size: Base size of the order
+            auto_truncate: Truncate the size instead of rejecting it if it has too many decimals
+        """
+        if size < self.market_min_size:
+            raise InvalidOrder(f"Size is too small. Minimum is: {self.market_min_size}. You requested {size}.")
+
+        if size > self.market_max_size:
+            raise InvalidOrder(f"Size is too large. Maximum is: {self.market_max_size}. You requested {size}.")
+
+        if auto_truncate:
+            size = truncate(size, self.market_size_decimals)
+        elif not fits_resolution(size, self.market_size_decimals):
+            raise InvalidOrder("Size resolution is too high, the highest resolution allowed for this symbol is: " +
+                               str(self.market_size_increment) + ". You specified " + str(size) +
+                               ". Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.")
+        return size
+
+    def check_limit_order(self, size: float, price: float, auto_truncate: bool,
+                          reference_price: float = None) -> (float, float):
+        """
+        Validate a limit order and return its size and price, truncated to the increments if auto_truncate is set
+
+        Args:
+            size: Base size of the order
+            price: Limit price
+            auto_truncate: Truncate the size and price instead of rejecting them if they have too many decimals
+            reference_price: Current price, needed when needs_reference_price is True
+        """
+        if size < self.limit_min_size:
+            raise InvalidOrder("Order quantity is too small. Minimum is: " + str(self.limit_min_size))
+
+        if size > self.limit_max_size:
+            raise InvalidOrder("Order quantity is too large. Maximum is: " + str(self.limit_max_size))
+
+        min_price, max_price = self.price_bounds(reference_price)
+
+        if price < min_price:
+            raise InvalidOrder("Limit price is too small. Minimum is: " + str(min_price))
+
+        if price > max_price:
+            raise InvalidOrder("Limit price is too large. Maximum is: " + str(max_price))
+
+        if auto_truncate:
+            price = truncate(price, self.price_decimals)
+        elif not fits_resolution(price, self.price_decimals):
+            raise InvalidOrder("Fund resolution is too high, minimum resolution is: " + str(self.price_increment) +
+                               ". Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.")
+
+        if auto_truncate:
+            size = truncate(size, self.size_decimals)
+        elif not fits_resolution(size, self.size_decimals):
+            raise InvalidOrder("Fund resolution is too high, minimum resolution is: " + str(self.size_increment) +
+                               '. Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.')
+        return size, price
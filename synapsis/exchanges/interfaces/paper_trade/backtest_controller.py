@@ -46,7 +46,9 @@ from synapsis.exchanges.interfaces.paper_trade.backtest.format_platform_result i
 
 from synapsis.exchanges.interfaces.paper_trade.abc_backtest_controller import ABCBacktestController
 from synapsis.exchanges.exchange import ABCExchange
-from synapsis.data.data_reader import PriceReader, TickReader, DataReader, FundingRateEventReader
+from synapsis.data.data_reader import PriceReader, TickReader, OrderbookReader, DataReader, FundingRateEventReader
+from synapsis.exchanges.interfaces.paper_trade.orderbook_replay import OrderbookReplay
+from synapsis.exchanges.interfaces.paper_trade.tick_replay import TickReplay
 
 
 def to_string_key(separated_list):
@@ -212,6 +214,10 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
         self.__price_readers = []
         self.__event_readers = []
         self.__tick_readers = []
+        self.__orderbook_readers = []
+
+        # Recorded ticks and orderbooks, these are stepped in time order alongside the events
+        self.replays = []
 
     class PriceIdentifiers(enum.Enum):
         exchange: str = 0
@@ -256,18 +262,13 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
                 self.__check_user_time_bounds(tick_reader.data[symbol]['time'].iloc[0],
                                               tick_reader.data[symbol]['time'].iloc[-1],
                                               60)
-                symbol_df: pd.DataFrame = data[symbol]
-
-                records = symbol_df.to_dict(orient='records')
-                data_formatted_records = []
-                for record_index in range(len(records)):
-                    data_formatted_records.append({
-                        'type': '__synapsis__tick',
-                        'data': records[record_index],
-                        'time': records[record_index]['time']
-                    })
+                # Ticks are replayed in batches instead of becoming millions of individual events
+                self.replays.append(TickReplay(symbol, data[symbol]))
 
-                self.events += data_formatted_records
+        for orderbook_reader in self.__orderbook_readers:
+            for symbol, book_df in orderbook_reader.data.items():
+                self.__check_user_time_bounds(book_df['time'].iloc[0], book_df['time'].iloc[-1], 60)
+                self.replays.append(OrderbookReplay(symbol, book_df))
 
         # Now we just need to sort by time
         self.events = sorted(self.events, key=lambda d: d['time'])
@@ -541,6 +542,9 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
     def add_tick_events(self, tick_reader: TickReader):
         self.__tick_readers.append(tick_reader)
 
+    def add_orderbook_events(self, orderbook_reader: OrderbookReader):
+        self.__orderbook_readers.append(orderbook_reader)
+
     def __add_prices(self, symbol, start_time, end_time, resolution, save=False):
         # If it's not loaded then write it to the file
         # Add it as a new price
@@ -708,31 +712,76 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
             elif type_ == "funding_rate":
                 self.interface.do_funding(data['symbol'], data['rate'])
 
+        def handle_replay(replay, stop_time):
+            if not replay.wants_updates(self.model):
+                # Nobody needs the individual updates so only the last price of the batch matters
+                last = replay.step_until(stop_time)
+                if last is not None and last[1] is not None:
+                    self.interface.receive_price(replay.symbol, last[1])
+                return
+
+            receive_time = self.interface.receive_time
+
+            def on_update(update_time, update):
+                self.time = update_time
+                receive_time(self.time)
+                replay.publish(update, self.interface, self.model)
+
+            replay.step_until(stop_time, on_update)
+
+        def next_replay():
+            # Find the replay with the earliest pending update and the time of the one after it
+            earliest = None
+            earliest_time = None
+            following_time = None
+            for replay in self.replays:
+                replay_time = replay.next_time
+                if replay_time is None:
+                    continue
+                if earliest_time is None or replay_time < earliest_time:
+                    following_time = earliest_time
+                    earliest = replay
+                    earliest_time = replay_time
+                elif following_time is None or replay_time < following_time:
+                    following_time = replay_time
+            return earliest, earliest_time, following_time
+
         def run_events():
             # Ensure that we don't index error here
             events_length = len(self.events)
-            # Make sure we don't crash at first
-            if self.event_index >= events_length:
-                return
 
             # Store the time because we need accurate time for the async stuff
             time_backup = self.time
-            while self.events[self.event_index]['time'] < time_backup:
-                # Set time to something different here
-                event = self.events[self.event_index]
-                self.time = event['time']
-                if event['type'][0:11] != '__synapsis__':
-                    self.model.event(event['type'], event['data'])
+            while True:
+                replay, replay_time, following_time = next_replay()
+                has_replay = replay_time is not None and replay_time < time_backup
+                has_event = self.event_index < events_length and self.events[self.event_index]['time'] < time_backup
+
+                if has_event and (not has_replay or self.events[self.event_index]['time'] <= replay_time):
+                    # Set time to something different here
+                    event = self.events[self.event_index]
+                    self.time = event['time']
+                    self.interface.receive_time(self.time)
+                    if event['type'][0:12] != '__synapsis__':
+                        self.model.event(event['type'], event['data'])
+                    else:
+                        handle_synapsis_tick(event['type'][12:], event['data'])
+                    # Fired some event, go to the next one
+                    self.event_index += 1
+                elif has_replay:
+                    # Run every update up to whatever has to happen next
+                    stop_time = time_backup
+                    if following_time is not None:
+                        stop_time = min(stop_time, following_time)
+                    if has_event:
+                        stop_time = min(stop_time, self.events[self.event_index]['time'])
+                    # Another replay at the same time should not stall this one
+                    handle_replay(replay, max(stop_time, np.nextafter(replay_time, np.inf)))
                 else:
-                    handle_synapsis_tick(event['type'][11:], event['data'])
-                # Fired some event, go to the next one
-                self.event_index += 1
-
-                # Just check after doing that if we went outside the index
-                if self.event_index >= events_length:
-                    return
+                    break
 
             self.time = time_backup
+            self.interface.receive_time(self.time)
 
         # Now update the time to match
         self.interface.receive_time(self.time)
@@ -824,7 +873,7 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
                 self.add_custom_events(FundingRateEventReader(symbol, self.user_start, self.user_stop, self.interface))
         # Now ensure all events are processed
         self.parse_events()
-        for symbol in self.prices:
+        for symbol in list(self.prices) + [replay.symbol for replay in self.replays]:
             base = get_base_asset(symbol)
             quote = get_quote_asset(symbol)
             if base not in self.interface.traded_assets:
@@ -889,11 +938,16 @@ class BackTestController(ABCBacktestController):  # circular import to type mode
             self.interface.receive_time(first_time)
             self.price_indexes[frame_symbol] = 0
 
-            # Find the first time in the list
-            self.initial_time = copy.copy(self.user_start)
-            self.interface.initial_time = self.initial_time
+        # Find the first time in the list
+        self.initial_time = copy.copy(self.user_start)
+        self.interface.initial_time = self.initial_time
+
+        # Seed the replayed books so the account can be valued before their first update
+        for replay in self.replays:
+            if replay.symbol not in self.prices:
+                self.interface.receive_price(replay.symbol, replay.seed_price())
 
-        if self.prices == {} and self.events == []:
+        if self.prices == {} and self.events == [] and self.replays == []:
             raise ValueError("No data given. "
                              "Try setting an argument such as to='1y' in the .backtest() command.\n"
                              "Example: strategy.backtest(to='1y')")
@@ -17,12 +17,15 @@
 """
 import time
 
+from synapsis.exchanges.interfaces.paper_trade.orderbook_replay import fill_price
+
 
 class BacktestingWrapper:
     def __init__(self):
         self.backtesting = False
         self.frame = {
             'prices': {},
+            'orderbooks': {},
             'time': 0
         }
 
@@ -40,6 +43,9 @@ class BacktestingWrapper:
     def receive_price(self, asset_id, new_price):
         self.frame['prices'][asset_id] = new_price
 
+    def receive_orderbook(self, asset_id, book: dict):
+        self.frame['orderbooks'][asset_id] = book
+
     def receive_price_cache(self, prices: dict):
         self.full_prices = prices
 
@@ -53,6 +59,17 @@ class BacktestingWrapper:
         except KeyError:
             raise KeyError(f"Price not found in recent frame. Have prices for {asset_id} been downloaded?")
 
+    def get_backtesting_fill_price(self, asset_id, side: str, size: float):
+        """
+        Walk a market order through the replayed orderbook if there is one, otherwise use the most recent price
+        """
+        book = self.frame['orderbooks'].get(asset_id)
+        if book is not None:
+            price = fill_price(book, side, size)
+            if price is not None:
+                return price
+        return self.get_backtesting_price(asset_id)
+
     def time(self):
         if self.backtesting:
             return self.frame['time']
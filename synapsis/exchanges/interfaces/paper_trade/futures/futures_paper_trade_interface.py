@@ -12,6 +12,7 @@ from synapsis.utils import utils as utils
 from copy import deepcopy
 
 from synapsis.utils.exceptions import InvalidOrder, BacktestingException
+from synapsis.utils.metadata_cache import get_metadata_cache
 
 
 class FuturesPaperTradeInterface(FuturesExchangeInterface, BacktestingWrapper):
@@ -100,6 +101,9 @@ class FuturesPaperTradeInterface(FuturesExchangeInterface, BacktestingWrapper):
 
     @functools.lru_cache(None)
     def get_products(self, symbol: str = None) -> dict:
+        if self.backtesting:
+            return get_metadata_cache().get(self.get_exchange_type(), 'products', symbol or '',
+                                            lambda: self.interface.get_products(symbol))
         return self.interface.get_products(symbol)
 
     def get_account(self, symbol: str = None) -> dict:
@@ -189,7 +193,17 @@ class FuturesPaperTradeInterface(FuturesExchangeInterface, BacktestingWrapper):
             raise BacktestingException('order not found')
 
     def get_open_orders(self, symbol: str = None) -> List[FuturesOrder]:
-        return [dataclasses.replace(o) for o in self._placed_orders]
+        return [dataclasses.replace(order) for _, order in self._placed_orders.values()
+                if symbol is None or order.symbol == symbol]
+
+    def batch_order(self, orders: list) -> list:
+        return self._check_batch([self._attempt(self._submit_order, order) for order in orders])
+
+    def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        return [self.cancel_order(symbol, order_id) for order_id in order_ids]
+
+    def cancel_all(self, symbol: str = None) -> list:
+        return [self.cancel_order(order.symbol, order.id) for order in self.get_open_orders(symbol)]
 
     def get_order(self, symbol: str, order_id: int) -> FuturesOrder:
         try:
@@ -228,6 +242,11 @@ class FuturesPaperTradeInterface(FuturesExchangeInterface, BacktestingWrapper):
         else:
             return self.interface.get_price(symbol)
 
+    def get_prices(self, symbols: list) -> dict:
+        if self.backtesting:
+            return {symbol: self.get_price(symbol) for symbol in symbols}
+        return super().get_prices(symbols)
+
     def get_funding_rate_history(self, symbol: str, epoch_start: int, epoch_stop: int) -> list:
         return self.interface.get_funding_rate_history(symbol, epoch_start, epoch_stop)
 
@@ -453,8 +472,12 @@ class FuturesPaperTradeInterface(FuturesExchangeInterface, BacktestingWrapper):
 
     @functools.lru_cache(None)
     def get_maker_fee(self) -> float:
+        if self.backtesting:
+            return get_metadata_cache().get(self.get_exchange_type(), 'fees', 'maker', self.interface.get_maker_fee)
         return self.interface.get_maker_fee()
 
     @functools.lru_cache(None)
     def get_taker_fee(self) -> float:
+        if self.backtesting:
+            return get_metadata_cache().get(self.get_exchange_type(), 'fees', 'taker', self.interface.get_taker_fee)
         return self.interface.get_taker_fee()
@@ -0,0 +1,202 @@
+"""
+    Rebuild L2 orderbooks from recorded snapshots and deltas during a backtest.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from synapsis.data.recorder import BID, ASK
+
+
+class OrderbookReplay:
+    def __init__(self, symbol: str, frame: pd.DataFrame):
+        """
+        Step through a recorded book one timestamp at a time. Every row sharing a timestamp is applied as one update,
+        and snapshot rows clear the book before they are applied.
+
+        Args:
+            symbol: The symbol the book belongs to
+            frame: DataFrame with time, side, price, size and snapshot columns sorted by time
+        """
+        self.symbol = symbol
+
+        # Plain lists are much faster to index one at a time than numpy arrays
+        times = frame['time'].to_numpy(dtype=np.float64)
+        self.__times = times.tolist()
+        self.__sides = frame['side'].to_numpy(dtype=np.int8).tolist()
+        self.__prices = frame['price'].to_numpy(dtype=np.float64).tolist()
+        self.__sizes = frame['size'].to_numpy(dtype=np.float64).tolist()
+        if 'snapshot' in frame:
+            self.__snapshots = frame['snapshot'].to_numpy(dtype=np.int8).tolist()
+        else:
+            self.__snapshots = [0] * len(times)
+
+        # Row index where each timestamp starts, with the total length as the final boundary
+        self.__boundaries = np.concatenate(([0], np.flatnonzero(np.diff(times)) + 1, [len(times)])).tolist()
+        self.__group = 0
+
+        # Each side keeps a sorted price list and a price to size map
+        self.__levels = ([], [])
+        self.__depth = ({}, {})
+
+    @property
+    def next_time(self):
+        """
+        The time of the next update, or None when the replay is finished
+        """
+        if self.__group >= len(self.__boundaries) - 1:
+            return None
+        return self.__times[self.__boundaries[self.__group]]
+
+    def __clear(self):
+        for side in (BID, ASK):
+            self.__levels[side].clear()
+            self.__depth[side].clear()
+
+    def __apply(self, side: int, price: float, size: float):
+        levels = self.__levels[side]
+        depth = self.__depth[side]
+        if size == 0:
+            if price in depth:
+                del depth[price]
+                del levels[bisect.bisect_left(levels, price)]
+        else:
+            if price not in depth:
+                bisect.insort(levels, price)
+            depth[price] = size
+
+    def wants_updates(self, model) -> bool:
+        """
+        Book events need every intermediate book
+        """
+        return True
+
+    def publish(self, book: dict, interface, model):
+        """
+        Pass a book from step_until to the paper interface and the model
+        """
+        interface.receive_orderbook(self.symbol, book)
+        mid_price = self.get_mid_price()
+        if mid_price is not None:
+            interface.receive_price(self.symbol, mid_price)
+        model.orderbook_update(self.symbol, book)
+
+    def step_until(self, stop_time: float, on_update=None):
+        """
+        Apply every update earlier than stop_time
+
+        Args:
+            stop_time: Updates at or after this time are left for later
+            on_update: Called as on_update(time, book) after each update is applied
+
+        Returns:
+            The time and mid price after the last update applied, or None if there were no updates before stop_time
+        """
+        last_time = None
+        while self.next_time is not None and self.next_time < stop_time:
+            last_time = self.next_time
+            self.step()
+            if on_update is not None:
+                on_update(last_time, self.get_book())
+        if last_time is None:
+            return None
+        return last_time, self.get_mid_price()
+
+    def step(self):
+        """
+        Apply the next update
+        """
+        start = self.__boundaries[self.__group]
+        stop = self.__boundaries[self.__group + 1]
+        self.__group += 1
+
+        cleared = False
+        for row in range(start, stop):
+            if self.__snapshots[row] and not cleared:
+                self.__clear()
+                cleared = True
+            self.__apply(self.__sides[row], self.__prices[row], self.__sizes[row])
+
+    def get_book(self) -> dict:
+        """
+        Get the book in the same format as the OrderbookManager, both sides sorted from low to high price
+        """
+        bids = self.__depth[BID]
+        asks = self.__depth[ASK]
+        return {
+            'bids': [(price, bids[price]) for price in self.__levels[BID]],
+            'asks': [(price, asks[price]) for price in self.__levels[ASK]]
+        }
+
+    def get_mid_price(self):
+        """
+        Get the midpoint of the best bid and ask, or the only side that exists
+        """
+        bids = self.__levels[BID]
+        asks = self.__levels[ASK]
+        if bids and asks:
+            return (bids[-1] + asks[0]) / 2
+        elif bids:
+            return bids[-1]
+        elif asks:
+            return asks[0]
+        return None
+
+    def seed_price(self):
+        """
+        Get the mid price of the next update without applying it. The levels of that update are read as a fresh book,
+        which is exact for the snapshot that every recording starts with.
+        """
+        if self.next_time is None:
+            return self.get_mid_price()
+        start = self.__boundaries[self.__group]
+        stop = self.__boundaries[self.__group + 1]
+        bids = [self.__prices[row] for row in range(start, stop) if self.__sides[row] == BID and self.__sizes[row]]
+        asks = [self.__prices[row] for row in range(start, stop) if self.__sides[row] == ASK and self.__sizes[row]]
+        if bids and asks:
+            return (max(bids) + min(asks)) / 2
+        elif bids:
+            return max(bids)
+        elif asks:
+            return min(asks)
+        return None
+
+
+def fill_price(book: dict, side: str, size: float):
+    """
+    Find the volume weighted price of a market order walked through the book. If the book is too thin the remainder
+    fills at the last level. Returns None if the side being taken is empty.
+    """
+    if size <= 0:
+        return None
+    levels = book['asks'] if side == 'buy' else reversed(book['bids'])
+    remaining = size
+    cost = 0
+    price = None
+    for price, level_size in levels:
+        filled = min(remaining, level_size)
+        cost += filled * price
+        remaining -= filled
+        if remaining <= 0:
+            break
+
+    if price is None:
+        return None
+    if remaining > 0:
+        cost += remaining * price
+    return cost / size
@@ -21,17 +21,23 @@ import time
 import traceback
 import warnings
 
+import pandas as pd
+
 import synapsis.exchanges.interfaces.paper_trade.utils as paper_trade
 import synapsis.utils.utils as utils
 from synapsis.exchanges.interfaces.paper_trade.local_account.trade_local import LocalAccount
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
 from synapsis.exchanges.interfaces.exchange_interface import ExchangeInterface
 from synapsis.exchanges.interfaces.paper_trade.backtesting_wrapper import BacktestingWrapper
+from synapsis.exchanges.interfaces.paper_trade.resting_orders import RestingOrders
+from synapsis.exchanges.managers import streamed_exchanges
 from synapsis.exchanges.orders.limit_order import LimitOrder
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.stop_loss import StopLossOrder
 from synapsis.exchanges.orders.take_profit import TakeProfitOrder
-from synapsis.utils.exceptions import APIException, InvalidOrder
+from synapsis.utils.exceptions import APIException
+from synapsis.utils.market_data import get_market_data_hub
+from synapsis.utils.metadata_cache import get_metadata_cache, per_symbol_fees
 
 
 class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
@@ -49,10 +55,26 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
         self.get_fees_cache = {}
         self.get_order_filter_cache = {}
 
-        self.__run_watchdog = True
+        # Also decides whether resting orders are streamed, which only happens once the watchdog is started
+        self.__run_watchdog = False
 
         self.__thread = None
 
+        # Pending limit and stop orders by id, and the same orders indexed by trigger price
+        self.__pending_orders = {}
+        self.__resting_orders = RestingOrders()
+        # Held while an order is filled or canceled because ticks fill orders from the websocket threads
+        self.__fill_lock = threading.RLock()
+        # Symbols whose resting orders are filled by a ticker instead of the polling watchdog
+        self.__streamed_symbols = set()
+        self.__fill_ticker_manager = None
+        # Held while fill tickers are opened or closed
+        self.__stream_lock = threading.Lock()
+
+        # Earliest time requested for each (symbol, resolution) of init history, inits can run on several threads
+        self.__warmup_covered = {}
+        self.__warmup_lock = threading.Lock()
+
         # Set the type of the paper trade exchange to be the same as whichever interface its derived from
         ExchangeInterface.__init__(self, derived_interface.get_exchange_type(), derived_interface)
         BacktestingWrapper.__init__(self)
@@ -156,32 +178,82 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
     """ Needs to be overridden here """
 
     def start_paper_trade_watchdog(self):
-        # TODO, this process could use variable update time/websocket usage, poll `time` and a variety of settings
-        #  to create a robust trading system
         # Create the watchdog for watching limit orders
+        self.__run_watchdog = True
         self.__thread = threading.Thread(target=self.__paper_trade_watchdog, daemon=True)
         self.__thread.start()
-        self.__run_watchdog = True
+        # Orders placed before the watch started are streamed from here on
+        for symbol in self.__resting_orders.symbols():
+            self.__stream_fills(symbol)
 
     def stop_paper_trade_watchdog(self):
         self.__run_watchdog = False
+        with self.__stream_lock:
+            if self.__fill_ticker_manager is not None:
+                self.__fill_ticker_manager.close_all_websockets()
+            self.__streamed_symbols.clear()
 
     """ Needs to be overridden here """
 
     def __paper_trade_watchdog(self):
         """
-        Internal order watching system
+        Internal order watching system, polls the symbols that aren't filled from a ticker
         """
-        utils.info_print('Evaluating paper limit orders every 10 seconds...')
+        interval = self.user_preferences['settings']['paper']['poll_interval']
+        utils.info_print(f'Evaluating paper limit orders on each tick, or every {interval} seconds without a ticker...')
         while True:
-            time.sleep(10)
+            time.sleep(interval)
             if not self.__run_watchdog:
                 break
-            self.evaluate_limits()
+            self.__close_idle_streams()
+            polled = [symbol for symbol in self.__resting_orders.symbols() if symbol not in self.__streamed_symbols]
+            self.evaluate_limits(polled)
 
-    @staticmethod
-    def __get_decimals(number) -> int:
-        return utils.count_decimals(number)
+    def __stream_fills(self, symbol: str):
+        """
+        Fill the resting orders on this symbol as each tick arrives. Symbols that can't be streamed are left to the
+        polling watchdog.
+        """
+        if self.backtesting or not self.__run_watchdog or symbol in self.__streamed_symbols or \
+                self.user_preferences['settings']['paper']['fill_source'] != 'websocket' or \
+                self.get_exchange_type() not in streamed_exchanges:
+            return
+        with self.__stream_lock:
+            if symbol in self.__streamed_symbols:
+                return
+            try:
+                if self.__fill_ticker_manager is None:
+                    from synapsis.exchanges.managers.ticker_manager import TickerManager
+                    self.__fill_ticker_manager = TickerManager(self.get_exchange_type(), default_symbol='')
+                self.__fill_ticker_manager.create_ticker(callback=lambda tick: self.__on_tick(symbol, tick),
+                                                         override_symbol=symbol)
+            except Exception:
+                traceback.print_exc()
+                utils.info_print(f"Unable to stream {symbol}, polling its paper orders instead.")
+                return
+            self.__streamed_symbols.add(symbol)
+
+    def __close_idle_streams(self):
+        """
+        Close the fill tickers of symbols that no longer have resting orders. This runs on the watchdog instead of
+        when the last order fills, because fills happen on the ticker's own callback.
+        """
+        with self.__stream_lock:
+            idle = self.__streamed_symbols - set(self.__resting_orders.symbols())
+            for symbol in idle:
+                self.__streamed_symbols.discard(symbol)
+                try:
+                    self.__fill_ticker_manager.close_websocket(override_symbol=symbol)
+                except Exception:
+                    traceback.print_exc()
+
+    def __on_tick(self, symbol: str, tick: dict):
+        if not self.__run_watchdog:
+            return
+        try:
+            self.evaluate_price(symbol, float(tick['price']))
+        except Exception:
+            traceback.print_exc()
 
     def override_local_account(self, value_dictionary: dict):
         """
@@ -205,126 +277,98 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
                 })
         self.local_account.override_local_account(current_account)
 
-    def evaluate_limits(self):
+    def evaluate_limits(self, symbols: list = None):
         """
         When this is run it checks the local paper trade orders to see if any need to go through
+
+        Args:
+            symbols: Only check these symbols. Defaults to every symbol with resting orders
         """
-        used_currencies = []
-        for i in self.paper_trade_orders:
-            if i["symbol"] not in used_currencies:
-                used_currencies.append(i['symbol'])
-        prices = {}
+        if symbols is None:
+            symbols = self.__resting_orders.symbols()
+        if not symbols:
+            return
 
-        decimals_dict = {}
+        prices = self.get_prices(symbols)
+        for symbol in symbols:
+            self.evaluate_price(symbol, prices[symbol])
+
+    def evaluate_price(self, symbol: str, current_price: float):
+        """
+        Fill the resting orders on a symbol that a new price crosses. Orders are indexed by price, so only the
+        orders that fill are looked at.
+
+        Args:
+            symbol: The symbol the price is for
+            current_price: The most recent price of the symbol
+        """
+        with self.__fill_lock:
+            order_ids = self.__resting_orders.pop_triggered(symbol, current_price)
+            if not order_ids:
+                return
+            decimals = self.__fill_decimals(symbol)
+            for order_id in order_ids:
+                self.__fill_order(self.__pending_orders.pop(order_id), decimals)
+
+    def __fill_decimals(self, symbol: str) -> dict:
         # get the market limits so that we can get accurate rounding
-        for i in used_currencies:
-            market_limits = self.get_order_filter(i)
-            decimals_dict[i] = {}
-            decimals_dict[i]['quantity_decimals'] = self.__get_decimals(market_limits['limit_order']['base_increment'])
-            decimals_dict[i]['quote_decimals'] = self.__get_decimals(market_limits['market_order']['quote_increment'])
-
-        for i in used_currencies:
-            prices[i] = self.get_price(i)
-            if not self.backtesting:
-                time.sleep(.2)
-
-        for i in range(len(self.paper_trade_orders)):
-            index = self.paper_trade_orders[i]
-            """
-            Coinbase pro example
-            {
-                "id": "d0c5340b-6d6c-49d9-b567-48c4bfca13d2",
-                "price": "0.10000000",
-                "size": "0.01000000",
-                "product_id": "BTC-USD",
-                "side": "buy",
-                "stp": "dc",
-                "type": "limit",
-                "time_in_force": "GTC",
-                "post_only": false,
-                "created_at": "2016-12-08T20:02:28.53864Z",
-                "fill_fees": "0.0000000000000000",
-                "filled_size": "0.00000000",
-                "executed_value": "0.0000000000000000",
-                "status": "pending",
-                "settled": false
-            }
-            """
-            if index['type'] in ('limit', 'stop_loss') and index['status'] == 'pending':
-                current_price = prices[index['symbol']]
-                limit_price = index['price']
-
-                if index['side'] == 'buy':
-                    if index['price'] > current_price:
-                        # Take everything off hold
-                        asset_id = index['symbol']
-                        quote = utils.get_quote_asset(asset_id)
-
-                        available = self.local_account.get_account(quote)['available']
-                        # Put it back into available
-                        self.local_account.update_available(quote, available + (index['size'] * index['price']))
-
-                        # Take it out of hold
-                        hold = self.local_account.get_account(quote)['hold']
-                        self.local_account.update_hold(quote, hold - (index['size'] * index['price']))
-
-                        order, funds, executed_value, fill_fees, filled_size = self.evaluate_paper_trade(index,
-                                                                                                         index['price'])
-                        self.local_account.trade_local(symbol=index['symbol'],
-                                                       side='buy',
-                                                       base_delta=filled_size,  # Gain filled size after fees
-                                                       quote_delta=funds * -1,  # Loose the original fund amount
-                                                       base_resolution=decimals_dict[index['symbol']]
-                                                       ['quantity_decimals'],
-                                                       quote_resolution=decimals_dict[index['symbol']]
-                                                       ['quote_decimals'])
-                        order['status'] = 'done'
-                        order['settled'] = 'true'
-
-                        # Add this to the executed orders
-                        self.executed_orders.append({
-                            'id': index['id'],
-                            'executed_time': self.time(),
-                        })
+        order_filter = self.get_compiled_order_filter(symbol)
+        return {
+            'quantity_decimals': order_filter.size_decimals,
+            'quote_decimals': order_filter.quote_decimals
+        }
 
-                        self.paper_trade_orders[i] = order
-                elif index['side'] == 'sell':
-                    if limit_price < current_price and index['type'] == 'limit' \
-                            or current_price <= limit_price and index['type'] == 'stop_loss':
-                        # Take everything off hold
-
-                        asset_id = index['symbol']
-                        base = utils.get_base_asset(asset_id)
-
-                        available = self.local_account.get_account(base)['available']
-                        # Put it back into available
-                        self.local_account.update_available(base, available + index['size'])
-
-                        # Remove it from hold
-                        hold = self.local_account.get_account(base)['hold']
-                        self.local_account.update_hold(base, hold - index['size'])
-
-                        order, funds, executed_value, fill_fees, filled_size = self.evaluate_paper_trade(index,
-                                                                                                         index['price'])
-                        self.local_account.trade_local(symbol=index['symbol'],
-                                                       side='sell',
-                                                       base_delta=float(order['size'] * - 1),
-                                                       # Loose size before any fees
-                                                       quote_delta=executed_value,  # Executed value after fees
-                                                       base_resolution=decimals_dict[index['symbol']]
-                                                       ['quantity_decimals'],
-                                                       quote_resolution=decimals_dict[index['symbol']]['quote_decimals']
-                                                       )
-                        order['status'] = 'done'
-                        order['settled'] = 'true'
-
-                        # Add this to the executed orders
-                        self.executed_orders.append({
-                            'id': index['id'],
-                            'executed_time': self.time(),
-                        })
+    def __fill_order(self, order: dict, decimals: dict):
+        """
+        Settle a triggered limit or stop order at its price
+        """
+        if order['side'] == 'buy':
+            # Take everything off hold
+            quote = utils.get_quote_asset(order['symbol'])
+
+            available = self.local_account.get_account(quote)['available']
+            # Put it back into available
+            self.local_account.update_available(quote, available + (order['size'] * order['price']))
 
-                        self.paper_trade_orders[i] = order
+            # Take it out of hold
+            hold = self.local_account.get_account(quote)['hold']
+            self.local_account.update_hold(quote, hold - (order['size'] * order['price']))
+
+            order, funds, executed_value, fill_fees, filled_size = self.evaluate_paper_trade(order, order['price'])
+            self.local_account.trade_local(symbol=order['symbol'],
+                                           side='buy',
+                                           base_delta=filled_size,  # Gain filled size after fees
+                                           quote_delta=funds * -1,  # Loose the original fund amount
+                                           base_resolution=decimals['quantity_decimals'],
+                                           quote_resolution=decimals['quote_decimals'])
+        else:
+            # Take everything off hold
+            base = utils.get_base_asset(order['symbol'])
+
+            available = self.local_account.get_account(base)['available']
+            # Put it back into available
+            self.local_account.update_available(base, available + order['size'])
+
+            # Remove it from hold
+            hold = self.local_account.get_account(base)['hold']
+            self.local_account.update_hold(base, hold - order['size'])
+
+            order, funds, executed_value, fill_fees, filled_size = self.evaluate_paper_trade(order, order['price'])
+            self.local_account.trade_local(symbol=order['symbol'],
+                                           side='sell',
+                                           base_delta=float(order['size'] * - 1),  # Loose size before any fees
+                                           quote_delta=executed_value,  # Executed value after fees
+                                           base_resolution=decimals['quantity_decimals'],
+                                           quote_resolution=decimals['quote_decimals'])
+        # The order is the same dictionary held in paper_trade_orders so it's updated in place
+        order['status'] = 'done'
+        order['settled'] = 'true'
+
+        # Add this to the executed orders
+        self.executed_orders.append({
+            'id': order['id'],
+            'executed_time': self.time(),
+        })
 
     def evaluate_paper_trade(self, order, current_price):
         """
@@ -370,39 +414,24 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
             print("Paper Trading...")
         needed = self.needed['market_order']
         creation_time = self.time()
-        price = self.get_price(symbol)
+        if self.backtesting:
+            # Fill against replayed depth when an orderbook is being backtested
+            price = self.get_backtesting_fill_price(symbol, side, size)
+        else:
+            price = self.get_price(symbol)
         funds = price*size
 
-        market_limits = self.get_order_filter(symbol)
-
-        min_size = market_limits['market_order']["base_min_size"]
-
-        max_size = market_limits['market_order']["base_max_size"]
-
-        if size < min_size:
-            raise InvalidOrder(f"Size is too small. Minimum is: {min_size}. You requested {size}.")
-
-        if size > max_size:
-            raise InvalidOrder(f"Size is too large. Maximum is: {max_size}. You requested {size}.")
-
-        base_increment = market_limits['market_order']['base_increment']
-        base_decimals = self.__get_decimals(base_increment)
-
-        # Test if funds has more decimals than the increment. The increment is the maximum resolution of the quote.
-        if self.should_auto_trunc:
-            size = utils.trunc(size, base_decimals)
-        elif self.__get_decimals(size) > base_decimals:
-            raise InvalidOrder("Size resolution is too high, the highest resolution allowed for this symbol is: " +
-                               str(base_increment) + ". You specified " + str(size) +
-                               ". Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.")
+        order_filter = self.get_compiled_order_filter(symbol)
+        size = order_filter.check_market_order(size, self.should_auto_trunc)
+        base_decimals = order_filter.market_size_decimals
 
         if self.get_exchange_type() == 'alpaca':
             # This could break, but there appears that 10 decimals is about right for alpaca
             quantity_decimals = 10
-            shortable = market_limits['exchange_specific']['shortable']
+            shortable = order_filter.shortable
         else:
             shortable = False
-            quantity_decimals = self.__get_decimals(market_limits['limit_order']['base_increment'])
+            quantity_decimals = order_filter.size_decimals
 
         order = {
             'size': size,
@@ -413,7 +442,7 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
         qty = size
 
         # Test the purchase
-        self.local_account.test_trade(symbol, side, qty, price, market_limits['market_order']["quote_increment"],
+        self.local_account.test_trade(symbol, side, qty, price, order_filter.quote_increment,
                                       quantity_decimals,
                                       (shortable and self.__enable_shorting) or self.__force_shorting,
                                       calculate_margin=self.__calculate_margin)
@@ -520,45 +549,12 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
         }
         creation_time = self.time()
 
-        order_filter = self.get_order_filter(symbol)
-
-        min_base = float(order_filter['limit_order']["base_min_size"])
-        max_base = float(order_filter['limit_order']["base_max_size"])
-
-        if size < min_base:
-            raise InvalidOrder("Order quantity is too small. Minimum is: " + str(min_base))
-
-        if size > max_base:
-            raise InvalidOrder("Order quantity is too large. Maximum is: " + str(max_base))
-
-        min_price = float(order_filter['limit_order']["min_price"])
-        max_price = float(order_filter['limit_order']["max_price"])
-
-        if price < min_price:
-            raise InvalidOrder("Limit price is too small. Minimum is: " + str(min_price))
-
-        if price > max_price:
-            raise InvalidOrder("Limit price is too large. Maximum is: " + str(max_price))
-
-        # Check if the passed parameters are more accurate than either of the max base resolution or max price
-        # resolution
-        price_increment = order_filter['limit_order']['price_increment']
-        price_increment_decimals = self.__get_decimals(price_increment)
-
-        if self.should_auto_trunc:
-            price = utils.trunc(price, price_increment_decimals)
-        elif self.__get_decimals(price) > price_increment_decimals:
-            raise InvalidOrder("Fund resolution is too high, minimum resolution is: " + str(price_increment) +
-                               ". Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.")
-
-        base_increment = order_filter['limit_order']['base_increment']
-        base_decimals = self.__get_decimals(base_increment)
-
-        if self.should_auto_trunc:
-            size = utils.trunc(size, base_decimals)
-        elif self.__get_decimals(size) > base_decimals:
-            raise InvalidOrder("Fund resolution is too high, minimum resolution is: " + str(base_increment) +
-                               '. Try using synapsis.trunc(size, decimal_number) to match the exchange resolution.')
+        order_filter = self.get_compiled_order_filter(symbol)
+        # Binance bounds the limit price around the current price
+        reference_price = self.get_price(symbol) if order_filter.needs_reference_price else None
+        size, price = order_filter.check_limit_order(size, price, self.should_auto_trunc, reference_price)
+        price_increment_decimals = order_filter.price_decimals
+        base_decimals = order_filter.size_decimals
 
         order = {
             'size': size,
@@ -621,6 +617,12 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
             self.local_account.update_hold(base, hold + size)
         else:
             raise APIException(f"Invalid side {side}")
+
+        # Funds are on hold before the order can be filled by a tick
+        with self.__fill_lock:
+            self.__pending_orders[response['id']] = response
+            self.__resting_orders.add(response)
+        self.__stream_fills(symbol)
         # TODO this is super stinky but refactoring this code is even stinkier
         return StopLossOrder(order, response, self) if stop_loss else LimitOrder(order, response, self)
 
@@ -629,16 +631,13 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
         This block could potentially work for both exchanges
         """
         del symbol
-        order_index = None
-        for i in range(len(self.paper_trade_orders)):
-            index = self.paper_trade_orders[i]
-            if index['status'] == 'pending' and index['id'] == order_id:
-                order_index = i
-                break
+        with self.__fill_lock:
+            order = self.__pending_orders.pop(order_id, None)
+            if order is None:
+                raise APIException("Order ID not found.")
+            self.__resting_orders.remove(order_id)
 
-        if order_index is not None:
             # Now that we found it make sure that we move the funds back on available
-            order = self.paper_trade_orders[order_index]
             side = order['side']
             size = order['size']
             symbol = order['symbol']
@@ -663,26 +662,34 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
                 hold = self.local_account.get_account(base_asset)['hold']
                 self.local_account.update_hold(base_asset, hold - size)
 
-            # This saves the order
-            order_id = order['id']
             # Make sure to save this as a canceled order just before closing it
             # Make sure to write in the time also
             self.canceled_orders.append({
-                'id': self.paper_trade_orders[order_index]['id'],
+                'id': order['id'],
                 'canceled_time': self.time()
             })
 
-            del self.paper_trade_orders[order_index]
-            return {"order_id": order_id}
-        else:
-            raise APIException("Order ID not found.")
+            # Compare by identity, the same order can't be listed twice
+            for i in range(len(self.paper_trade_orders)):
+                if self.paper_trade_orders[i] is order:
+                    del self.paper_trade_orders[i]
+                    break
+            return {"order_id": order['id']}
+
+    def batch_order(self, orders: list) -> list:
+        # Orders are local so they're placed one after the other, in the same order the exchange would see them
+        return self._check_batch([self._attempt(self._submit_order, order) for order in orders])
+
+    def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        return [self.cancel_order(symbol, order_id) for order_id in order_ids]
+
+    def cancel_all(self, symbol: str = None) -> list:
+        open_orders = [self._order_identity(order) for order in self.get_open_orders()]
+        return [self.cancel_order(*identity) for identity in open_orders if symbol is None or identity[0] == symbol]
 
     def get_open_orders(self, symbol=None):
-        open_orders = []
-        for i in self.paper_trade_orders:
-            if i["status"] == "pending":
-                open_orders.append(i)
-        return open_orders
+        # Pending orders are kept by id in the order they were placed
+        return [order for order in self.__pending_orders.values() if symbol is None or order['symbol'] == symbol]
 
     def get_order(self, symbol, order_id) -> dict:
         for i in self.paper_trade_orders:
@@ -702,29 +709,32 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
                 if self.get_exchange_type() == 'keyless':
                     get_keyless_products()
                 else:
-                    self.get_products_cache = self.calls.get_products()
+                    self.get_products_cache = get_metadata_cache().get(self.get_exchange_type(), 'products', '',
+                                                                       self.calls.get_products)
             return self.get_products_cache
         else:
             if self.get_exchange_type() == 'keyless':
                 get_keyless_products()
                 return self.get_products_cache
             else:
-                return self.calls.get_products()
+                return get_market_data_hub().products(self.get_exchange_type(), self.calls.get_products)
 
     def get_fees(self, symbol):
         if self.backtesting:
             # Add exchanges that actually require a symbol
             type_ = self.get_exchange_type()
-            if type_ == 'okx' or type_ == 'binance':
+            if type_ in per_symbol_fees:
                 if symbol not in self.get_fees_cache:
-                    self.get_fees_cache[symbol] = self.calls.get_fees(symbol)
+                    self.get_fees_cache[symbol] = get_metadata_cache().get(type_, 'fees', symbol,
+                                                                           lambda: self.calls.get_fees(symbol))
                     return self.get_fees_cache[symbol]
                 else:
                     return self.get_fees_cache[symbol]
             # If it doesn't require a symbol just store it in the root
             else:
                 if self.get_fees_cache == {}:
-                    self.get_fees_cache = self.calls.get_fees(symbol)
+                    self.get_fees_cache = get_metadata_cache().get(type_, 'fees', '',
+                                                                   lambda: self.calls.get_fees(symbol))
                     return self.get_fees_cache
                 else:
                     return self.get_fees_cache
@@ -734,19 +744,64 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
     def get_product_history(self, symbol, epoch_start, epoch_stop, resolution):
         if self.backtesting:
             return utils.extract_price_by_resolution(self.full_prices, symbol, epoch_start, epoch_stop, resolution)
+        elif self.initial_time is not None:
+            # Strategy inits run just before a backtest starts
+            return self.__warmup_history(symbol, epoch_start, epoch_stop, resolution)
         else:
             return self.calls.get_product_history(symbol, epoch_start, epoch_stop, resolution)
 
+    def __warmup_history(self, symbol, epoch_start, epoch_stop, resolution):
+        """
+        Serve init history from the prices downloaded for the backtest. Only the part before those prices is
+        requested from the exchange, and it's merged in so later calls for the same range stay local.
+        """
+        resolution = int(resolution)
+        try:
+            prices = self.full_prices[symbol][resolution]
+        except KeyError:
+            return self.calls.get_product_history(symbol, epoch_start, epoch_stop, resolution)
+        if len(prices) == 0 or prices['time'].iloc[-1] < epoch_stop:
+            return self.calls.get_product_history(symbol, epoch_start, epoch_stop, resolution)
+
+        # Same bounds extract_price_by_resolution trims to
+        start = epoch_start - resolution
+        with self.__warmup_lock:
+            covered_from = self.__warmup_covered.get((symbol, resolution), prices['time'].iloc[0])
+            missing_to = covered_from - resolution
+        if start <= missing_to:
+            head = self.calls.get_product_history(symbol, start, missing_to, resolution)
+            with self.__warmup_lock:
+                merged = pd.concat([head, self.full_prices[symbol][resolution]])
+                self.full_prices[symbol][resolution] = merged.drop_duplicates('time').sort_values(by=['time'],
+                                                                                                   ignore_index=True)
+                # The exchange may have nothing that early, so remember what was asked for instead of what came back
+                self.__warmup_covered[(symbol, resolution)] = min(start, self.__warmup_covered.get(
+                    (symbol, resolution), covered_from))
+        return utils.extract_price_by_resolution(self.full_prices, symbol, epoch_start, epoch_stop, resolution)
+
     def get_order_filter(self, symbol):
         # Don't re-query order filter if its cached
         if symbol not in self.get_order_filter_cache:
-            self.get_order_filter_cache[symbol] = self.calls.get_order_filter(symbol)
+            if self.backtesting:
+                self.get_order_filter_cache[symbol] = get_metadata_cache().get(
+                    self.get_exchange_type(), 'order_filter', symbol, lambda: self.calls.get_order_filter(symbol))
+            else:
+                self.get_order_filter_cache[symbol] = self.calls.get_order_filter(symbol)
 
         if self.get_exchange_type() == 'binance':
             self.get_order_filter_cache[symbol] = self.__evaluate_binance_limits(self.get_price(symbol),
                                                                                  self.get_order_filter_cache[symbol])
         return self.get_order_filter_cache[symbol]
 
+    def get_asset_precision(self, asset):
+        if self.backtesting and self.get_exchange_type() != 'keyless':
+            product = get_metadata_cache().product(self.get_exchange_type(), asset, self.calls.get_products)
+            try:
+                return utils.increment_to_precision(product['base_increment'])
+            except (KeyError, TypeError):
+                return 8
+        return super().get_asset_precision(asset)
+
     def get_price(self, symbol) -> float:
         if self.backtesting:
             return self.get_backtesting_price(symbol)
@@ -761,16 +816,26 @@ class PaperTradeInterface(ExchangeInterface, BacktestingWrapper):
 
                     if most_recent_tick is None:
                         utils.info_print("No data found on ticker yet - using API...")
-                        return self.calls.get_price(symbol)
+                        return self.__live_price(symbol)
                     else:
                         return most_recent_tick['price']
                 else:
                     utils.info_print(f"Creating ticker on symbol {symbol} for exchange {self.get_exchange_type()}...")
                     self.__ticker_manager.create_ticker(callback=self._websocket_update, override_symbol=symbol,
                                                         override_exchange=self.get_exchange_type())
-                    return self.calls.get_price(symbol)
+                    return self.__live_price(symbol)
             else:
-                return self.calls.get_price(symbol)
+                return self.__live_price(symbol)
+
+    def get_prices(self, symbols: list) -> dict:
+        if self.backtesting or self.user_preferences['settings']['paper']['price_source'] == 'websocket':
+            return {symbol: self.get_price(symbol) for symbol in symbols}
+        else:
+            return get_market_data_hub().prices(self.get_exchange_type(), symbols, self.calls.get_prices)
+
+    def __live_price(self, symbol) -> float:
+        # Other strategies in the process asking for the same price share the request
+        return get_market_data_hub().price(self.get_exchange_type(), symbol, lambda: self.calls.get_price(symbol))
 
     @staticmethod
     def __evaluate_binance_limits(price: (int, float), order_filter):
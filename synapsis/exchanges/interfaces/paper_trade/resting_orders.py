@@ -0,0 +1,111 @@
+"""
+    Price indexed resting orders for paper trading.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import bisect
+import itertools
+import threading
+
+
+class RestingOrders:
+    def __init__(self):
+        """
+        Resting paper orders kept sorted by trigger price for each symbol, so a price update only looks at the
+        orders it crosses instead of every open order.
+
+        Orders are split into three books by how they trigger:
+            buy: buy orders, filled when the price falls below the order price
+            sell: limit sells, filled when the price rises above the order price
+            stop: stop loss sells, filled when the price falls to or below the order price
+        """
+        self.__lock = threading.Lock()
+        # symbol -> book -> sorted list of (price, sequence, order id)
+        self.__books = {}
+        # order id -> (symbol, book, entry)
+        self.__index = {}
+        # Breaks price ties and keeps triggered orders in the order they were placed
+        self.__sequence = itertools.count()
+
+    @staticmethod
+    def __book_name(order: dict) -> str:
+        if order['side'] == 'buy':
+            return 'buy'
+        return 'stop' if order['type'] == 'stop_loss' else 'sell'
+
+    def add(self, order: dict):
+        """
+        Add a pending order shaped like the results of get_open_orders
+        """
+        book_name = self.__book_name(order)
+        entry = (float(order['price']), next(self.__sequence), order['id'])
+        with self.__lock:
+            books = self.__books.setdefault(order['symbol'], {'buy': [], 'sell': [], 'stop': []})
+            bisect.insort(books[book_name], entry)
+            self.__index[order['id']] = (order['symbol'], book_name, entry)
+
+    def remove(self, order_id: str) -> bool:
+        """
+        Remove an order, returns False if it wasn't resting
+        """
+        with self.__lock:
+            if order_id not in self.__index:
+                return False
+            symbol, book_name, entry = self.__index.pop(order_id)
+            book = self.__books[symbol][book_name]
+            del book[bisect.bisect_left(book, entry)]
+            return True
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.__index
+
+    def __len__(self) -> int:
+        return len(self.__index)
+
+    def symbols(self) -> list:
+        """
+        Get the symbols that have resting orders
+        """
+        with self.__lock:
+            return [symbol for symbol, books in self.__books.items() if any(books.values())]
+
+    def pop_triggered(self, symbol: str, price: float) -> list:
+        """
+        Remove and return the ids of the orders on this symbol that the price fills, oldest first
+        """
+        with self.__lock:
+            books = self.__books.get(symbol)
+            if books is None:
+                return []
+            # Only the ends of each book can trigger, so each cut is found with one binary search
+            buy = books['buy']
+            cut = bisect.bisect_right(buy, (price, float('inf')))
+            triggered = buy[cut:]
+            del buy[cut:]
+
+            sell = books['sell']
+            cut = bisect.bisect_left(sell, (price,))
+            triggered += sell[:cut]
+            del sell[:cut]
+
+            stop = books['stop']
+            cut = bisect.bisect_left(stop, (price,))
+            triggered += stop[cut:]
+            del stop[cut:]
+
+            for entry in triggered:
+                del self.__index[entry[2]]
+        triggered.sort(key=lambda entry: entry[1])
+        return [entry[2] for entry in triggered]
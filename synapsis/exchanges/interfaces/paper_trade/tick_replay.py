@@ -0,0 +1,102 @@
+"""
+    Replay recorded trade ticks in batches during a backtest.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import bisect
+
+import numpy as np
+import pandas as pd
+
+
+class TickReplay:
+    def __init__(self, symbol: str, frame: pd.DataFrame):
+        """
+        Step through recorded ticks in batches. Every tick before a stop time is consumed at once so the controller
+        only interleaves with other events at batch boundaries.
+
+        Args:
+            symbol: The symbol the ticks belong to
+            frame: DataFrame with at least time and price columns sorted by time
+        """
+        self.symbol = symbol
+
+        # Columns are converted to plain lists once, indexing these is much cheaper than indexing a DataFrame
+        self.__columns = [column for column in frame.columns if column != 'symbol']
+        self.__data = [frame[column].tolist() for column in self.__columns]
+        self.__times = frame['time'].to_numpy(dtype=np.float64).tolist()
+        self.__prices = frame['price'].tolist()
+        self.__index = 0
+
+    def __len__(self):
+        return len(self.__times)
+
+    @property
+    def next_time(self):
+        """
+        The time of the next tick, or None when the replay is finished
+        """
+        if self.__index >= len(self.__times):
+            return None
+        return self.__times[self.__index]
+
+    def seed_price(self):
+        """
+        Get the price of the next tick without consuming it, or the last price once the replay is finished
+        """
+        if not self.__times:
+            return None
+        return self.__prices[min(self.__index, len(self.__prices) - 1)]
+
+    def wants_updates(self, model) -> bool:
+        """
+        Ticks are only built one at a time if the model listens to them, otherwise only the last price matters
+        """
+        return model.listens_to_ticks(self.symbol)
+
+    def publish(self, tick: dict, interface, model):
+        """
+        Pass a tick from step_until to the paper interface and the model
+        """
+        interface.receive_price(self.symbol, tick['price'])
+        model.websocket_update(tick)
+
+    def step_until(self, stop_time: float, on_update=None):
+        """
+        Consume every tick earlier than stop_time
+
+        Args:
+            stop_time: Ticks at or after this time are left for the next batch
+            on_update: Called as on_update(time, tick) for each tick in the batch. If this is None the batch is
+             skipped over without building any ticks
+
+        Returns:
+            The time and price of the last tick consumed, or None if there were no ticks before stop_time
+        """
+        start = self.__index
+        stop = bisect.bisect_left(self.__times, stop_time, start)
+        if stop == start:
+            return None
+        self.__index = stop
+
+        if on_update is not None:
+            symbol = self.symbol
+            columns = self.__columns
+            for row in zip(*(column[start:stop] for column in self.__data)):
+                tick = dict(zip(columns, row))
+                tick['symbol'] = symbol
+                on_update(tick['time'], tick)
+
+        return self.__times[stop - 1], self.__prices[stop - 1]
@@ -0,0 +1,361 @@
+"""
+    Private websocket streams that keep a local copy of account balances and orders.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import abc
+import collections
+import threading
+import time
+import traceback
+
+from synapsis.exchanges.interfaces.websocket import Websocket
+from synapsis.utils.utils import AttributeDict, info_print, isolate_specific
+
+# Orders in these states can't change again and are moved out of the open orders
+closed_statuses = ('filled', 'done', 'canceled', 'cancelled', 'rejected', 'expired')
+
+
+class UserDataCache:
+    def __init__(self, closed_order_history: int = 1000):
+        """
+        Thread safe copy of account balances and orders built from a REST snapshot and kept current by stream events.
+
+        Updates that arrive while a snapshot is being downloaded are held back and replayed on top of it, so nothing
+        is lost between subscribing and the snapshot. Until the first snapshot lands every lookup returns None, which
+        tells the interface to use REST.
+
+        Args:
+            closed_order_history: Number of filled or cancelled orders kept so get_order can still find them
+        """
+        self.__lock = threading.Lock()
+        self.__account = None
+        self.__open_orders = {}
+        self.__closed_orders = collections.OrderedDict()
+        self.__closed_order_history = closed_order_history
+
+        self.__synced = False
+        self.__buffering = False
+        # (received time, function, args) for updates that arrive before the snapshot
+        self.__pending = []
+
+    @property
+    def synced(self) -> bool:
+        return self.__synced
+
+    def begin_sync(self):
+        """
+        Start holding back updates, called when the stream connects and before the snapshot is requested
+        """
+        with self.__lock:
+            self.__synced = False
+            self.__buffering = True
+            self.__pending = []
+
+    def invalidate(self):
+        """
+        Stop serving from the cache, called when the stream disconnects
+        """
+        with self.__lock:
+            self.__synced = False
+            self.__buffering = False
+            self.__pending = []
+
+    def reconcile(self, account: dict, open_orders: list, snapshot_time: float):
+        """
+        Replace the cache with a REST snapshot and replay the updates received after the snapshot was requested
+
+        Args:
+            account: Result of get_account
+            open_orders: Result of get_open_orders
+            snapshot_time: Local time just before the snapshot was requested. Updates received before this are
+             already part of the snapshot
+        """
+        with self.__lock:
+            self.__account = {asset: dict(balance) for asset, balance in account.items()}
+            self.__open_orders = {str(order['id']): dict(order) for order in open_orders}
+            for received, function, args in self.__pending:
+                if received >= snapshot_time:
+                    function(*args)
+            self.__pending = []
+            self.__buffering = False
+            self.__synced = True
+
+    def set_account(self, account: dict):
+        """
+        Replace only the balances, for streams that report orders but not balances
+        """
+        with self.__lock:
+            self.__account = {asset: dict(balance) for asset, balance in account.items()}
+
+    def invalidate_account(self):
+        """
+        Serve balances from REST until set_account is called again
+        """
+        with self.__lock:
+            self.__account = None
+
+    def __apply(self, function, *args):
+        with self.__lock:
+            if self.__synced:
+                function(*args)
+            elif self.__buffering:
+                self.__pending.append((time.time(), function, args))
+
+    def update_order(self, order: dict):
+        """
+        Add or update an order, shaped like the results of get_open_orders
+        """
+        self.__apply(self.__update_order, dict(order))
+
+    def update_balance(self, asset: str, available: float, hold: float):
+        self.__apply(self.__update_balance, asset, available, hold)
+
+    def __update_order(self, order: dict):
+        order_id = str(order['id'])
+        if order.get('status') in closed_statuses:
+            previous = self.__open_orders.pop(order_id, {})
+            self.__closed_orders[order_id] = {**previous, **order}
+            while len(self.__closed_orders) > self.__closed_order_history:
+                self.__closed_orders.popitem(last=False)
+        else:
+            self.__open_orders[order_id] = {**self.__open_orders.get(order_id, {}), **order}
+
+    def __update_balance(self, asset: str, available: float, hold: float):
+        if self.__account is not None:
+            self.__account[asset] = {'available': available, 'hold': hold}
+
+    def get_account(self, symbol: str = None):
+        """
+        Get every balance, or the balance of one asset. Returns None when the cache can't answer.
+        """
+        with self.__lock:
+            if not self.__synced or self.__account is None:
+                return None
+            if symbol is not None:
+                if symbol not in self.__account:
+                    return None
+                return AttributeDict(self.__account[symbol])
+            return AttributeDict({asset: AttributeDict(balance) for asset, balance in self.__account.items()})
+
+    def get_open_orders(self, symbol: str = None):
+        """
+        Get the open orders, or the open orders on one symbol. Returns None when the cache can't answer.
+        """
+        with self.__lock:
+            if not self.__synced:
+                return None
+            return [dict(order) for order in self.__open_orders.values()
+                    if symbol is None or order.get('symbol') == symbol]
+
+    def get_order(self, order_id):
+        """
+        Get an open or recently closed order. Returns None when the cache can't answer.
+        """
+        order_id = str(order_id)
+        with self.__lock:
+            if not self.__synced:
+                return None
+            if order_id in self.__open_orders:
+                return dict(self.__open_orders[order_id])
+            if order_id in self.__closed_orders:
+                return dict(self.__closed_orders[order_id])
+            return None
+
+
+class UserStream(Websocket, abc.ABC):
+    def __init__(self, interface, url: str, initially_stopped: bool = False, transport: str = None):
+        """
+        Base for private account streams. The connection is authenticated and subscribed by the exchange class, which
+        calls subscribed() once updates are flowing. A REST snapshot is then taken and the cache starts answering
+        get_account, get_open_orders and get_order. Dropped connections are reopened and reconciled again.
+
+        Args:
+            interface: The authenticated interface, used for REST snapshots
+            url: Websocket URL, get_url can override this on each connect
+            initially_stopped: Don't connect until start() is called
+            transport: Use 'thread' or 'asyncio', defaults to the websocket_transport setting
+        """
+        super().__init__('user', 'user', None, None, url, None, {}, transport)
+        settings = self.preferences['settings']['user_stream']
+        self.interface = interface
+        self.reconnect_delay = settings['reconnect_delay']
+        self.cache = UserDataCache(settings['closed_order_history'])
+
+        self.__closing = False
+        self.__timers = []
+        # Incremented on every connection so a slow snapshot from an older connection is thrown away
+        self.__connection = 0
+        self.__refresh_lock = threading.Lock()
+        self.__refreshing = False
+        self.__refresh_again = False
+
+        if not initially_stopped:
+            self.start()
+
+    def get_url(self) -> str:
+        """
+        Called before every connection, overridden by exchanges that hand out a new URL or token each time
+        """
+        return self.url
+
+    def start(self):
+        self.__closing = False
+        try:
+            self.url = self.get_url()
+        except Exception:
+            traceback.print_exc()
+            self.__schedule(self.reconnect_delay, self.start)
+            return
+        self.start_websocket(self.on_open, self.on_message, self.on_error, self.on_close, self.read_websocket)
+
+    def read_websocket(self):
+        self.ws.run_forever()
+
+    def __schedule(self, delay: float, function):
+        timer = threading.Timer(delay, function)
+        timer.daemon = True
+        timer.start()
+        self.__timers = [t for t in self.__timers if t.is_alive()] + [timer]
+
+    def repeat(self, interval: float, function):
+        """
+        Run function every interval seconds until this connection closes, used for keepalive pings
+        """
+        connection = self.__connection
+
+        def run():
+            if self.__closing or connection != self.__connection:
+                return
+            try:
+                function()
+            except Exception:
+                traceback.print_exc()
+            self.__schedule(interval, run)
+
+        self.__schedule(interval, run)
+
+    def subscribed(self):
+        """
+        Called by the exchange class once the private channels are confirmed. The snapshot runs on its own thread
+        so the REST calls don't hold up the stream.
+        """
+        threading.Thread(target=self.reconcile, args=(self.__connection,), name='synapsis-user-stream-reconcile',
+                         daemon=True).start()
+
+    def reconcile(self, connection: int):
+        # The cache isn't synced here so the interface answers from REST
+        snapshot_time = time.time()
+        try:
+            account = self.interface.get_account()
+            open_orders = self.interface.get_open_orders()
+        except Exception:
+            traceback.print_exc()
+            info_print("Unable to reconcile the user stream, retrying.")
+            self.__schedule(self.reconnect_delay, lambda: self.reconcile(connection))
+            return
+        if connection == self.__connection and not self.__closing:
+            self.cache.reconcile(account, open_orders, snapshot_time)
+
+    def refresh_account(self):
+        """
+        Download the balances again in the background, for streams that only report orders. Balances are served
+        from REST until the download lands, and requests made during a download are folded into one more.
+        """
+        self.cache.invalidate_account()
+        with self.__refresh_lock:
+            if self.__refreshing:
+                self.__refresh_again = True
+                return
+            self.__refreshing = True
+        threading.Thread(target=self.__refresh_account, name='synapsis-user-stream-account', daemon=True).start()
+
+    def __refresh_account(self):
+        while True:
+            with self.__refresh_lock:
+                self.__refresh_again = False
+            try:
+                account = self.interface.get_account()
+            except Exception:
+                traceback.print_exc()
+                account = None
+            with self.__refresh_lock:
+                if not self.__refresh_again:
+                    if account is not None:
+                        self.cache.set_account(account)
+                    self.__refreshing = False
+                    return
+
+    def shape_order(self, order: dict) -> dict:
+        """
+        Cast an order built from a stream message to the same keys and types get_open_orders returns
+        """
+        try:
+            needed = self.interface.choose_order_specificity(order['type'])
+        except KeyError:
+            needed = self.interface.needed['limit_order']
+        return isolate_specific(needed, order)
+
+    def on_open(self, ws):
+        self.__connection += 1
+        self.cache.begin_sync()
+        self.authenticate(ws)
+
+    def on_message(self, ws, message):
+        self.message_count += 1
+        self.most_recent_time = time.time()
+        try:
+            message = self.loads(message)
+        except ValueError:
+            # Plain text keepalive replies such as pong
+            return
+        self.health.record_message()
+        start = time.perf_counter()
+        try:
+            self.handle(message)
+        except Exception:
+            traceback.print_exc()
+        self.health.record_callbacks(time.perf_counter() - start)
+
+    def on_error(self, ws, error):
+        info_print(error)
+
+    def on_close(self, ws):
+        self.__connection += 1
+        self.cache.invalidate()
+        if not self.__closing:
+            info_print(f"User stream for {self.interface.get_exchange_type()} closed, reconnecting...")
+            self.__schedule(self.reconnect_delay, self.start)
+
+    def close_websocket(self):
+        self.__closing = True
+        for timer in self.__timers:
+            timer.cancel()
+        self.cache.invalidate()
+        super().close_websocket()
+
+    @abc.abstractmethod
+    def authenticate(self, ws):
+        """
+        Send the login and subscription messages
+        """
+        pass
+
+    @abc.abstractmethod
+    def handle(self, message: dict):
+        """
+        Turn a parsed message into cache updates
+        """
+        pass
@@ -16,18 +16,90 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 import abc
-import collections
+import asyncio
 import threading
+import time
 
 import websocket
 
 import synapsis.utils.utils
 from synapsis.exchanges.abc_exchange_websocket import ABCExchangeWebsocket
+from synapsis.exchanges.interfaces.feed_buffer import TickerFeed, TimeFeed
+from synapsis.exchanges.interfaces.message_parser import compile_extractors, extract, get_loads, merge_fields
+from synapsis.exchanges.interfaces.websocket_health import WebsocketHealth
+from synapsis.utils import event_loop
 from synapsis.utils.utils import info_print
 
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+transports = ('thread', 'asyncio')
+
+
+class AsyncWebSocketApp:
+    def __init__(self, url: str, on_open: callable, on_message: callable, on_error: callable, on_close: callable):
+        """
+        Minimal asyncio replacement for websocket.WebSocketApp. The connection runs as a task on the shared event loop
+        instead of owning a thread, and the callbacks keep the (ws, ...) signatures used by WebSocketApp.
+        """
+        self.url = url
+        self.on_open = on_open
+        self.on_message = on_message
+        self.on_error = on_error
+        self.on_close = on_close
+
+        self.__connection = None
+        self.__future = None
+        self.__closing = False
+
+    def start(self):
+        if websockets is None:
+            raise ImportError("Please \"pip install websockets\" to use the asyncio websocket transport.")
+        self.__closing = False
+        self.__future = event_loop.submit(self.__run())
+
+    async def __run(self):
+        try:
+            async with websockets.connect(self.url, max_size=None) as connection:
+                self.__connection = connection
+                self.on_open(self)
+                async for message in connection:
+                    try:
+                        self.on_message(self, message)
+                    except Exception as e:
+                        self.on_error(self, e)
+        except Exception as e:
+            if not self.__closing:
+                self.on_error(self, e)
+        finally:
+            self.__connection = None
+            self.on_close(self)
+
+    def __schedule(self, coroutine):
+        # Callbacks such as on_open run on the loop itself, so they cannot block waiting for the send
+        if event_loop.in_event_loop():
+            asyncio.ensure_future(coroutine)
+        else:
+            event_loop.run_coroutine(coroutine)
+
+    def send(self, data):
+        if self.__connection is None:
+            raise ConnectionError(f"Websocket to {self.url} is not connected.")
+        self.__schedule(self.__connection.send(data))
+
+    def close(self):
+        self.__closing = True
+        if self.__connection is not None:
+            self.__schedule(self.__connection.close())
+
+    def is_running(self) -> bool:
+        return self.__future is not None and not self.__future.done()
+
 
 class Websocket(ABCExchangeWebsocket, abc.ABC):
-    def __init__(self, symbol, stream, log, log_message, url, pre_event_callback, kwargs):
+    def __init__(self, symbol, stream, log, log_message, url, pre_event_callback, kwargs, transport=None):
         self.symbol = symbol
         self.stream = stream
         self.kwargs = kwargs
@@ -36,6 +108,7 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
         if log is not None:
             self.log = True
             self.file_path = log
+            self.__log_lines = []
             try:
                 self.__file = open(log, 'x+')
                 self.__file.write(log_message)
@@ -58,8 +131,27 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
         # Reload preferences
         self.preferences = synapsis.utils.load_user_preferences()
         buffer_size = self.preferences['settings']['websocket_buffer_size']
-        self.ticker_feed = collections.deque(maxlen=buffer_size)
-        self.time_feed = collections.deque(maxlen=buffer_size)
+        self.ticker_feed = TickerFeed(buffer_size)
+        self.time_feed = TimeFeed(buffer_size)
+
+        # Either a thread per websocket or a task on the shared asyncio loop
+        if transport is None:
+            transport = self.preferences['settings']['websocket_transport']
+        if transport not in transports:
+            raise ValueError(f"Websocket transport must be one of {transports}, got: {transport}")
+        self.transport = transport
+
+        # Messages are decoded with orjson when it's available
+        self.loads = get_loads(self.preferences['settings']['websocket_json'])
+
+        # Fields the callbacks read, None once any callback needs the whole message
+        self.fields = ()
+        # Set by exchanges that can extract single fields from their raw messages
+        self.field_extractors = None
+        self.__extractors = None
+
+        # Message rate, latency, reconnects and callback time of this connection
+        self.health = WebsocketHealth(f'{symbol}@{stream}')
 
         self.ws = None
 
@@ -68,7 +160,20 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
         """
         Restart websocket if it was asked to stop.
         """
-        if self.ws is None:
+        if self.transport == 'asyncio':
+            if self.is_websocket_open():
+                info_print("Already running...")
+            else:
+                if self.ws is not None:
+                    self.health.record_reconnect()
+                # The target is not needed because the connection is a task on the shared loop
+                self.ws = AsyncWebSocketApp(self.url,
+                                            on_open=on_open,
+                                            on_message=on_message,
+                                            on_error=on_error,
+                                            on_close=on_close)
+                self.ws.start()
+        elif self.ws is None:
             self.ws = websocket.WebSocketApp(self.url,
                                              on_open=on_open,
                                              on_message=on_message,
@@ -81,23 +186,56 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
                 info_print("Already running...")
             else:
                 # Use recursion to restart, continue appending to time feed and ticker feed
+                self.health.record_reconnect()
                 self.ws = None
                 self.start_websocket(on_open, on_message, on_error, on_close, target)
 
     def log_response(self, logging_callback: callable, message: dict):
-        # Run callbacks on message
+        # Lines are written in batches instead of reopening the file, use a TickRecorder for compact binary logs
         if self.log:
-            if self.message_count % 100 == 0:
-                self.__file.close()
-                self.__file = open(self.file_path, 'a')
-            line = logging_callback(message)
-            self.__file.write(line)
+            self.__log_lines.append(logging_callback(message))
+            if len(self.__log_lines) >= 100:
+                self.flush_log()
+
+    def flush_log(self):
+        if self.log and self.__log_lines:
+            self.__file.write(''.join(self.__log_lines))
+            self.__file.flush()
+            self.__log_lines = []
+
+    def normalize(self, message: dict, interface_callback: callable) -> dict:
+        """
+        Turn a raw message into an interface message. If every callback declared the fields it reads and the exchange
+        can extract them, only those fields and the feed fields are converted instead of the whole message.
+        """
+        if self.__extractors is not None:
+            return extract(message, self.__extractors)
+        return interface_callback(message)
+
+    def run_callbacks(self, message):
+        """
+        Pass an interface message to every callback. Coroutine functions are scheduled on the shared event loop, plain
+        functions are run in place.
+        """
+        self.health.record_message(self.most_recent_time)
+        start = time.perf_counter()
+        try:
+            for callback in self.callbacks:
+                if asyncio.iscoroutinefunction(callback):
+                    event_loop.submit(callback(message, **self.kwargs))
+                else:
+                    callback(message, **self.kwargs)
+        finally:
+            self.health.record_callbacks(time.perf_counter() - start)
+
     """
     The are access functions
     """
     """ Required in manager """
 
     def is_websocket_open(self):
+        if self.transport == 'asyncio':
+            return self.ws is not None and self.ws.is_running()
         if self.thread is not None:
             return self.thread.is_alive()
         else:
@@ -108,8 +246,15 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
 
     """ Required in manager """
 
-    def append_callback(self, obj):
+    def append_callback(self, obj, fields: tuple = None):
+        """
+        Args:
+            obj: Called with each interface message
+            fields: Keys of the message the callback reads, such as ('price',). None if it reads the whole message
+        """
         self.callbacks.append(obj)
+        self.fields = merge_fields(self.fields, fields)
+        self.__extractors = compile_extractors(self.field_extractors, self.fields)
 
     """ Define a variable each time so there is no array manipulation """
     """ Required in manager """
@@ -125,13 +270,23 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
     """ Required in manager """
 
     def get_time_feed(self):
-        return list(self.time_feed)
+        return self.time_feed.to_list('time')
 
     """ Parallel with time feed """
     """ Required in manager """
 
     def get_feed(self):
-        return list(self.ticker_feed)
+        return self.ticker_feed.to_list()
+
+    """ Required in manager """
+
+    def get_feed_arrays(self, since: int = None):
+        return self.ticker_feed.since(since)
+
+    """ Required in manager """
+
+    def get_health(self):
+        return self.health.get_stats()
 
     """ Required in manager """
 
@@ -141,7 +296,8 @@ class Websocket(ABCExchangeWebsocket, abc.ABC):
     """ Required in manager """
 
     def close_websocket(self):
-        if self.thread is not None and self.thread.is_alive():
+        self.flush_log()
+        if self.is_websocket_open():
             self.ws.close()
         else:
             print("Websocket for " + self.symbol + '@' + self.stream + " is already closed")
@@ -0,0 +1,203 @@
+"""
+    Health metrics and a staleness watchdog for websocket connections.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+import traceback
+
+from synapsis.utils.utils import info_print
+
+# Weight of the newest sample in the moving averages
+_smoothing = 0.1
+
+
+class WebsocketHealth:
+    def __init__(self, name: str):
+        """
+        Count messages, reconnects and callback time for a single connection. Updates come from the reader thread
+        only, so they don't take a lock.
+
+        Args:
+            name: Identifier of the connection such as BTC-USD@ticker
+        """
+        self.name = name
+        self.__created = time.monotonic()
+
+        self.__messages = 0
+        self.__reconnects = 0
+        self.__last_message = None
+
+        # Messages per second is measured over whole windows of at least a second
+        self.__window_start = time.monotonic()
+        self.__window_messages = 0
+        self.__rate = 0.0
+
+        self.__latency = None
+        self.__max_latency = 0.0
+        self.__callback_time = None
+        self.__max_callback_time = 0.0
+
+    def record_message(self, exchange_time: float = None):
+        """
+        Args:
+            exchange_time: Epoch the exchange stamped the message with, in seconds or milliseconds
+        """
+        now = time.monotonic()
+        self.__messages += 1
+        self.__last_message = now
+
+        self.__window_messages += 1
+        elapsed = now - self.__window_start
+        if elapsed >= 1:
+            self.__rate = self.__window_messages / elapsed
+            self.__window_start = now
+            self.__window_messages = 0
+
+        try:
+            exchange_time = float(exchange_time)
+        except (TypeError, ValueError):
+            return
+        # Some exchanges stamp messages in milliseconds
+        if exchange_time > 1e11:
+            exchange_time /= 1000
+        latency = time.time() - exchange_time
+        self.__latency = latency if self.__latency is None else \
+            self.__latency + _smoothing * (latency - self.__latency)
+        self.__max_latency = max(self.__max_latency, latency)
+
+    def record_callbacks(self, seconds: float):
+        """
+        Args:
+            seconds: Time spent running the callbacks for one message
+        """
+        self.__callback_time = seconds if self.__callback_time is None else \
+            self.__callback_time + _smoothing * (seconds - self.__callback_time)
+        self.__max_callback_time = max(self.__max_callback_time, seconds)
+
+    def record_reconnect(self):
+        self.__reconnects += 1
+
+    def seconds_since_message(self) -> float:
+        """
+        Returns None if no message has arrived yet
+        """
+        if self.__last_message is None:
+            return None
+        return time.monotonic() - self.__last_message
+
+    def get_stats(self) -> dict:
+        """
+        Get the message rate, exchange to local latency, time since the last message, reconnects and callback time.
+        Latency and callback time are moving averages in seconds, the max_ values are the largest seen. Age is the
+        number of seconds the connection has been measured for.
+        """
+        now = time.monotonic()
+        # A rate from a window that should have closed long ago is out of date
+        rate = self.__rate if now - self.__window_start < 2 else self.__window_messages / (now - self.__window_start)
+        return {
+            'name': self.name,
+            'messages': self.__messages,
+            'messages_per_second': rate,
+            'seconds_since_message': self.seconds_since_message(),
+            'age': now - self.__created,
+            'latency': self.__latency,
+            'max_latency': self.__max_latency,
+            'reconnects': self.__reconnects,
+            'callback_time': self.__callback_time,
+            'max_callback_time': self.__max_callback_time
+        }
+
+
+class WebsocketWatchdog:
+    def __init__(self, get_health: callable, callback: callable = None, stale_after: float = 30,
+                 interval: float = 5, export: callable = None):
+        """
+        Check connections on a background thread and raise an event when one goes quiet for too long, and again when
+        it recovers.
+
+        Args:
+            get_health: Returns {exchange: {symbol: stats}} for every connection to watch
+            callback: Called with an event dictionary of {exchange, symbol, stale, stats}. Defaults to printing a
+             warning
+            stale_after: Seconds without a message before a connection is stale
+            interval: Seconds between checks
+            export: Called with the result of get_health after every check, such as to send it to the reporter
+        """
+        self.get_health = get_health
+        self.callback = callback if callback is not None else self.__warn
+        self.stale_after = stale_after
+        self.interval = interval
+        self.export = export
+
+        self.__stale = set()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    @staticmethod
+    def __warn(event: dict):
+        if event['stale']:
+            silence = event['stats']['seconds_since_message']
+            if silence is None:
+                silence = event['stats']['age']
+            info_print(f"No message from {event['exchange']} {event['symbol']} for {silence:.1f} seconds")
+        else:
+            info_print(f"Messages from {event['exchange']} {event['symbol']} resumed")
+
+    def start(self):
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='synapsis-websocket-watchdog', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def __run(self):
+        while not self.__stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                traceback.print_exc()
+
+    def check(self) -> list:
+        """
+        Check every connection once and return the events that were raised
+        """
+        health = self.get_health()
+        events = []
+        for exchange, symbols in health.items():
+            for symbol, stats in symbols.items():
+                key = (exchange, symbol)
+                silence = stats['seconds_since_message']
+                # A connection that never received anything is stale once it has existed for long enough
+                if silence is None:
+                    silence = stats['age']
+                stale = silence > self.stale_after
+                if stale == (key in self.__stale):
+                    continue
+                if stale:
+                    self.__stale.add(key)
+                else:
+                    self.__stale.discard(key)
+                events.append({'exchange': exchange, 'symbol': symbol, 'stale': stale, 'stats': stats})
+
+        for event in events:
+            self.callback(event)
+        if self.export is not None:
+            self.export(health)
+        return events
@@ -0,0 +1,5 @@
+# Exchanges the ticker manager can stream prices from
+streamed_exchanges = ('coinbase_pro', 'binance', 'kucoin', 'okx', 'alpaca', 'ftx')
+
+# Exchanges whose ticker is a stream of every trade rather than throttled snapshots, so bars can be built from it
+trade_streamed_exchanges = ('binance', 'alpaca', 'ftx')
@@ -0,0 +1,184 @@
+"""
+    Build live bars from trade streams and close them on a single timer.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from synapsis.utils.utils import info_print, load_user_preferences
+
+
+class BarBuilder:
+    def __init__(self, resolution: int, max_silence: float):
+        """
+        Aggregate trades into OHLCV bars for one symbol and resolution.
+
+        A bar is only trusted if trades were flowing from before it opened until it closed. The first bar after
+        subscribing, and any bar where the stream went quiet for longer than max_silence, such as across a reconnect,
+        could be missing trades and is left for REST instead.
+
+        Args:
+            resolution: Bar length in seconds
+            max_silence: Longest gap between trades, in seconds, before the stream may have dropped
+        """
+        self.resolution = resolution
+        self.max_silence = max_silence
+
+        self.__lock = threading.Lock()
+        # open time -> bar
+        self.__bars = {}
+        # Trades are known to be complete from this time on
+        self.__continuous_since = None
+        self.__last_trade = None
+
+    def add_trade(self, price: float, size: float, trade_time: float):
+        with self.__lock:
+            if self.__last_trade is None or trade_time - self.__last_trade > self.max_silence:
+                self.__continuous_since = trade_time
+            self.__last_trade = max(trade_time, self.__last_trade or trade_time)
+
+            open_time = int(trade_time // self.resolution) * self.resolution
+            bar = self.__bars.get(open_time)
+            if bar is None:
+                self.__bars[open_time] = {'time': open_time, 'open': price, 'high': price, 'low': price,
+                                          'close': price, 'volume': size}
+            else:
+                bar['high'] = max(bar['high'], price)
+                bar['low'] = min(bar['low'], price)
+                bar['close'] = price
+                bar['volume'] += size
+
+    def close(self, close_time: float):
+        """
+        Finish the bar that closes at close_time
+
+        Returns:
+            The bar shaped like a row of history, or None if it may be incomplete
+        """
+        open_time = int(close_time) - self.resolution
+        with self.__lock:
+            bar = self.__bars.pop(open_time, None)
+            # Trades that arrived too late for their bar are dropped with it
+            for stale in [t for t in self.__bars if t < open_time]:
+                del self.__bars[stale]
+
+            if bar is None or self.__continuous_since is None or self.__continuous_since > open_time or \
+                    close_time - self.__last_trade > self.max_silence:
+                return None
+            return dict(bar)
+
+
+class BarManager:
+    def __init__(self, exchange: str, grace: float = None, max_silence: float = None):
+        """
+        Build bars for bar events from the exchange ticker instead of downloading each one when it closes. A single
+        timer closes every bar at its boundary and runs the callbacks. The ticker has to carry every trade, as it does
+        on the trade_streamed_exchanges, because volume and highs and lows would be wrong from throttled snapshots.
+
+        Args:
+            exchange: Exchange to stream trades from
+            grace: Seconds to wait after a boundary for trades still in flight. Defaults to the live_bars setting
+            max_silence: Seconds without trades before a bar is repaired over REST. Defaults to the live_bars setting
+        """
+        if grace is None or max_silence is None:
+            settings = load_user_preferences()['settings']['live_bars']
+            grace = settings['grace'] if grace is None else grace
+            max_silence = settings['max_silence'] if max_silence is None else max_silence
+        self.exchange = exchange
+        self.grace = grace
+        self.max_silence = max_silence
+
+        # (symbol, resolution) -> builder
+        self.__builders = {}
+        # (symbol, resolution, callback)
+        self.__subscriptions = []
+        self.__ticker_manager = None
+        self.__executor = None
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    def add_bar_event(self, symbol: str, resolution: int, callback):
+        """
+        Args:
+            symbol: Symbol to build bars for
+            resolution: Bar length in seconds
+            callback: Called as callback(bar, bar_time) where bar_time is the close time. bar is None when it has to
+             be downloaded instead
+        """
+        resolution = int(resolution)
+        if (symbol, resolution) not in self.__builders:
+            self.__builders[(symbol, resolution)] = BarBuilder(resolution, self.max_silence)
+        self.__subscriptions.append((symbol, resolution, callback))
+
+    def __on_tick(self, symbol: str, tick: dict):
+        price = float(tick['price'])
+        size = float(tick.get('size') or 0)
+        try:
+            trade_time = float(tick['time'])
+        except (KeyError, TypeError, ValueError):
+            trade_time = time.time()
+        # Some exchanges stamp trades in milliseconds
+        if trade_time > 1e11:
+            trade_time /= 1000
+        for (builder_symbol, _), builder in self.__builders.items():
+            if builder_symbol == symbol:
+                builder.add_trade(price, size, trade_time)
+
+    def start(self):
+        from synapsis.exchanges.managers.ticker_manager import TickerManager
+
+        self.__ticker_manager = TickerManager(self.exchange, default_symbol='')
+        for symbol in {symbol for symbol, _ in self.__builders}:
+            self.__ticker_manager.create_ticker(callback=lambda tick, symbol_=symbol: self.__on_tick(symbol_, tick),
+                                                override_symbol=symbol, fields=('price', 'size', 'time'))
+
+        # Each event keeps its own thread like the schedulers did, so a slow callback doesn't hold up the others
+        self.__executor = ThreadPoolExecutor(max_workers=max(1, len(self.__subscriptions)),
+                                             thread_name_prefix='synapsis-bar')
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='synapsis-bar-timer', daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        resolutions = {resolution for _, resolution, _ in self.__subscriptions}
+        info_print(f"Building bars from the {self.exchange} trade stream...")
+        while True:
+            now = time.time()
+            close_time = min((int(now // resolution) + 1) * resolution for resolution in resolutions)
+            if self.__stop.wait(close_time + self.grace - now):
+                return
+
+            closing = [key for key in self.__builders if close_time % key[1] == 0]
+            bars = {key: self.__builders[key].close(close_time) for key in closing}
+            for symbol, resolution, callback in self.__subscriptions:
+                if (symbol, resolution) in bars:
+                    self.__executor.submit(self.__run_callback, callback, bars[(symbol, resolution)], close_time)
+
+    @staticmethod
+    def __run_callback(callback, bar, bar_time):
+        try:
+            callback(bar, bar_time)
+        except Exception:
+            traceback.print_exc()
+
+    def stop(self):
+        self.__stop.set()
+        if self.__ticker_manager is not None:
+            self.__ticker_manager.close_all_websockets()
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
@@ -0,0 +1,153 @@
+"""
+    Bounded queue that moves websocket callbacks off of the socket reader.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+import collections
+import threading
+import traceback
+
+from synapsis.utils import event_loop
+
+overflow_policies = ('block', 'drop_oldest', 'conflate')
+
+
+class CallbackDispatcher:
+    def __init__(self, name: str, callbacks: list = None, queue_size: int = 10000, overflow_policy: str = 'block'):
+        """
+        Queue messages for a single subscription and run its callbacks on a worker thread so that a slow callback
+        never stalls the websocket reader.
+
+        Args:
+            name: Identifier for the subscription, used to name the worker thread
+            callbacks: List of callbacks to run on each message. The list is referenced, not copied, so callbacks
+             appended to it later are also dispatched
+            queue_size: Maximum number of messages waiting to be dispatched
+            overflow_policy: What to do when the queue is full. 'block' makes the reader wait for room,
+             'drop_oldest' discards the oldest waiting message and 'conflate' collapses the whole backlog into
+             the newest message. A reader on the shared asyncio loop never waits, since that would stall every
+             connection on the loop, so 'block' drops the oldest message there instead
+        """
+        if overflow_policy not in overflow_policies:
+            raise ValueError(f"Overflow policy must be one of {overflow_policies}, got: {overflow_policy}")
+        if queue_size < 1:
+            raise ValueError("The dispatch queue size must be at least 1.")
+
+        self.name = name
+        self.callbacks = callbacks if callbacks is not None else []
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+
+        self.__queue = collections.deque()
+        self.__condition = threading.Condition()
+        self.__thread = None
+        self.__stopped = False
+
+        self.__received = 0
+        self.__dispatched = 0
+        self.__dropped = 0
+        self.__max_depth = 0
+
+    def append_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def __call__(self, message, **kwargs):
+        self.put(message, kwargs)
+
+    def put(self, message, kwargs: dict = None):
+        """
+        Queue a message, applying the overflow policy if the queue is full. The worker is started on first use.
+        """
+        with self.__condition:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__work, name=f'synapsis-dispatch-{self.name}',
+                                                 daemon=True)
+                self.__thread.start()
+
+            if len(self.__queue) >= self.queue_size:
+                if self.overflow_policy == 'block' and not event_loop.in_event_loop():
+                    while len(self.__queue) >= self.queue_size and not self.__stopped:
+                        self.__condition.wait()
+                elif self.overflow_policy in ('block', 'drop_oldest'):
+                    self.__queue.popleft()
+                    self.__dropped += 1
+                else:
+                    self.__dropped += len(self.__queue)
+                    self.__queue.clear()
+
+            self.__queue.append((message, kwargs if kwargs is not None else {}))
+            self.__received += 1
+            self.__max_depth = max(self.__max_depth, len(self.__queue))
+            self.__condition.notify_all()
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                while not self.__queue and not self.__stopped:
+                    self.__condition.wait()
+                if self.__stopped:
+                    return
+                message, kwargs = self.__queue.popleft()
+                # Wake a reader blocked on a full queue
+                self.__condition.notify_all()
+
+            for callback in self.callbacks:
+                try:
+                    if asyncio.iscoroutinefunction(callback):
+                        event_loop.submit(callback(message, **kwargs))
+                    else:
+                        callback(message, **kwargs)
+                except Exception:
+                    traceback.print_exc()
+
+            with self.__condition:
+                self.__dispatched += 1
+                self.__condition.notify_all()
+
+    def join(self, timeout: float = None) -> bool:
+        """
+        Wait until every queued message has been dispatched. Returns False if the timeout expired first.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__dispatched + self.__dropped >= self.__received,
+                                             timeout)
+
+    def stop(self):
+        """
+        Stop the worker thread. Messages still in the queue are discarded.
+        """
+        with self.__condition:
+            self.__stopped = True
+            self.__queue.clear()
+            self.__condition.notify_all()
+
+    def get_depth(self) -> int:
+        return len(self.__queue)
+
+    def get_stats(self) -> dict:
+        """
+        Get the queue depth and counters for this subscription
+        """
+        with self.__condition:
+            return {
+                'depth': len(self.__queue),
+                'max_depth': self.__max_depth,
+                'queue_size': self.queue_size,
+                'overflow_policy': self.overflow_policy,
+                'received': self.__received,
+                'dispatched': self.__dispatched,
+                'dropped': self.__dropped
+            }
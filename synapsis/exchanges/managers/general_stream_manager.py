@@ -153,9 +153,10 @@ class GeneralManager(WebsocketManager):
     Create overriden method signatures
     """
 
-    def append_callback(self, callback_object, channel, override_symbol=None, override_exchange=None):
+    def append_callback(self, callback_object, channel, override_symbol=None, override_exchange=None,
+                        fields: tuple = None):
         self.websockets = self.__websockets[channel]
-        super().append_callback(callback_object, override_symbol, override_exchange)
+        super().append_callback(callback_object, override_symbol, override_exchange, fields)
 
     def is_websocket_open(self, channel, override_symbol=None, override_exchange=None):
         self.websockets = self.__websockets[channel]
@@ -173,6 +174,29 @@ class GeneralManager(WebsocketManager):
         self.websockets = self.__websockets[channel]
         return super().get_feed(override_symbol, override_exchange)
 
+    def get_feed_arrays(self, channel, since: int = None, override_symbol=None, override_exchange=None):
+        self.websockets = self.__websockets[channel]
+        return super().get_feed_arrays(since, override_symbol, override_exchange)
+
+    def get_health(self, channel, override_symbol=None, override_exchange=None):
+        self.websockets = self.__websockets[channel]
+        return super().get_health(override_symbol, override_exchange)
+
+    def get_all_health(self, channel=None) -> dict:
+        """
+        Get the health of every websocket on a channel, or on every channel as {exchange: {symbol@channel: stats}}
+        """
+        # The watchdog calls this from its own thread, so the channel selected in self.websockets is left alone
+        if channel is not None:
+            return super().get_all_health(self.__websockets[channel])
+
+        health = {}
+        for channel_, websockets in self.__websockets.items():
+            for exchange, symbols in super().get_all_health(websockets).items():
+                for symbol, stats in symbols.items():
+                    health.setdefault(exchange, {})[f'{symbol}@{channel_}'] = stats
+        return health
+
     def get_response(self, channel, override_symbol=None, override_exchange=None):
         self.websockets = self.__websockets[channel]
         return super().get_response(override_symbol, override_exchange)
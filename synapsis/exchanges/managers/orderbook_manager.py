@@ -15,6 +15,7 @@
     You should have received a copy of the GNU Lesser General Public License
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
+import asyncio
 import traceback
 import warnings
 import random
@@ -24,6 +25,7 @@ import requests
 
 import synapsis.exchanges.auth.utils
 import synapsis.utils.utils
+from synapsis.data.recorder import OrderbookRecorder, BID, ASK
 from synapsis.exchanges.interfaces.alpaca.alpaca_websocket import Tickers as Alpaca_Websocket
 from synapsis.exchanges.interfaces.binance.binance_websocket import Tickers as Binance_Orderbook
 from synapsis.exchanges.interfaces.coinbase_pro.coinbase_pro_websocket import Tickers as Coinbase_Pro_Orderbook
@@ -31,6 +33,7 @@ from synapsis.exchanges.interfaces.kucoin.kucoin_websocket import Tickers as Kuc
 from synapsis.exchanges.interfaces.ftx.ftx_websocket import Tickers as Ftx_Orderbook
 from synapsis.exchanges.interfaces.okx.okx_websocket import Tickers as Okx_Orderbook
 from synapsis.exchanges.managers.websocket_manager import WebsocketManager
+from synapsis.utils import event_loop
 
 
 def sort_list_tuples(list_with_tuples: list) -> List[tuple]:
@@ -75,12 +78,14 @@ def remove_price(book: list, price: float) -> list:
 
 
 class OrderbookManager(WebsocketManager):
-    def __init__(self, default_exchange, default_symbol):
+    def __init__(self, default_exchange, default_symbol, transport=None):
         """
         Create a new orderbook manager
         Args:
             default_exchange: Add an exchange name for the manager to favor
             default_symbol: Add a default currency for the manager to favor
+            transport: Run websockets on a 'thread' each or as tasks on the shared 'asyncio' loop. Defaults to the
+             websocket_transport setting. Alpaca always uses a thread.
         """
         self.__default_exchange = default_exchange
         self.__default_currency = default_symbol
@@ -93,8 +98,11 @@ class OrderbookManager(WebsocketManager):
 
         self.__websockets_kwargs = {default_exchange: {}}
 
+        # Optional binary recorders for each book
+        self.__recorders = {}
+
         # Create the abstraction for adding many managers
-        super().__init__(self.__websockets, default_symbol, default_exchange)
+        super().__init__(self.__websockets, default_symbol, default_exchange, transport)
 
     def create_orderbook(self, callback,
                          override_symbol=None,
@@ -135,12 +143,12 @@ class OrderbookManager(WebsocketManager):
             if use_sandbox:
                 websocket = Coinbase_Pro_Orderbook(override_symbol, "level2",
                                                    pre_event_callback=self.coinbase_snapshot_update,
-                                                   initially_stopped=initially_stopped,
+                                                   initially_stopped=initially_stopped, transport=self.transport,
                                                    WEBSOCKET_URL="wss://ws-feed-public.sandbox.pro.coinbase.com")
             else:
                 websocket = Coinbase_Pro_Orderbook(override_symbol, "level2",
                                                    pre_event_callback=self.coinbase_snapshot_update,
-                                                   initially_stopped=initially_stopped
+                                                   initially_stopped=initially_stopped, transport=self.transport
                                                    )
             # This is where the sorting magic happens
             websocket.append_callback(self.coinbase_update)
@@ -148,6 +156,8 @@ class OrderbookManager(WebsocketManager):
             # Store this object
             self.__websockets['coinbase_pro'][override_symbol] = websocket
             self.__websockets_callbacks['coinbase_pro'][override_symbol] = [callback]
+            self.create_dispatcher('coinbase_pro', override_symbol,
+                                   self.__websockets_callbacks['coinbase_pro'][override_symbol])
             self.__websockets_kwargs['coinbase_pro'][override_symbol] = kwargs
             self.__orderbooks['coinbase_pro'][override_symbol] = {
                 "bids": [],
@@ -165,7 +175,7 @@ class OrderbookManager(WebsocketManager):
             else:
                 websocket = Ftx_Orderbook(override_symbol, "orderbook",
                                           pre_event_callback=self.ftx_snapshot_update,
-                                          initially_stopped=initially_stopped,
+                                          initially_stopped=initially_stopped, transport=self.transport,
                                           )
 
             websocket.append_callback(self.ftx_update)
@@ -173,6 +183,7 @@ class OrderbookManager(WebsocketManager):
             # Store this object
             self.__websockets['ftx'][override_symbol] = websocket
             self.__websockets_callbacks['ftx'][override_symbol] = [callback]
+            self.create_dispatcher('ftx', override_symbol, self.__websockets_callbacks['ftx'][override_symbol])
             self.__websockets_kwargs['ftx'][override_symbol] = kwargs
             self.__orderbooks['ftx'][override_symbol] = {
                 "bids": [],
@@ -190,14 +201,14 @@ class OrderbookManager(WebsocketManager):
                 token = request_data['data']['token']
                 websocket = Kucoin_Orderbook(override_symbol, "level2",
                                              pre_event_callback=self.kucoin_snapshot_update,
-                                             initially_stopped=initially_stopped,
+                                             initially_stopped=initially_stopped, transport=self.transport,
                                              websocket_url=f"{base_endpoint}/socket.io/?token={token}")
             else:
                 base_endpoint = request_data['data']['instanceServers'][0]['endpoint']
                 token = request_data['data']['token']
                 websocket = Kucoin_Orderbook(override_symbol, "level2",
                                              pre_event_callback=self.kucoin_snapshot_update,
-                                             initially_stopped=initially_stopped,
+                                             initially_stopped=initially_stopped, transport=self.transport,
                                              websocket_url=f"{base_endpoint}?token={token}&[connectId="
                                                            f"{random.randint(1, 200000000) * 100000000}]"
                                              )
@@ -207,6 +218,7 @@ class OrderbookManager(WebsocketManager):
             # Store this object
             self.__websockets['kucoin'][override_symbol] = websocket
             self.__websockets_callbacks['kucoin'][override_symbol] = [callback]
+            self.create_dispatcher('kucoin', override_symbol, self.__websockets_callbacks['kucoin'][override_symbol])
             self.__websockets_kwargs['kucoin'][override_symbol] = kwargs
             self.__orderbooks['kucoin'][override_symbol] = {
                 "bids": [],
@@ -220,17 +232,18 @@ class OrderbookManager(WebsocketManager):
             if use_sandbox:
                 websocket = Okx_Orderbook(override_symbol, "books",
                                           pre_event_callback=self.okx_snapshot_update,
-                                          initially_stopped=initially_stopped,
+                                          initially_stopped=initially_stopped, transport=self.transport,
                                           WEBSOCKET_URL="wss://wspap.okx.com:8443/ws/v5/public?brokerId=9999")
             else:
                 websocket = Okx_Orderbook(override_symbol, "books",
                                           pre_event_callback=self.okx_snapshot_update,
-                                          initially_stopped=initially_stopped
+                                          initially_stopped=initially_stopped, transport=self.transport
                                           )
 
             websocket.append_callback(self.okx_update)
             self.__websockets['okx'][override_symbol] = websocket
             self.__websockets_callbacks['okx'][override_symbol] = [callback]
+            self.create_dispatcher('okx', override_symbol, self.__websockets_callbacks['okx'][override_symbol])
             self.__websockets_kwargs['okx'][override_symbol] = kwargs
             self.__orderbooks['okx'][override_symbol] = {
                 "bids": [],
@@ -247,9 +260,11 @@ class OrderbookManager(WebsocketManager):
 
             if use_sandbox:
                 websocket = Binance_Orderbook(specific_currency_id, "depth", initially_stopped=initially_stopped,
+                                              transport=self.transport,
                                               WEBSOCKET_URL="wss://testnet.binance.vision/ws")
             else:
-                websocket = Binance_Orderbook(specific_currency_id, "depth", initially_stopped=initially_stopped)
+                websocket = Binance_Orderbook(specific_currency_id, "depth", initially_stopped=initially_stopped,
+                                              transport=self.transport)
 
             websocket.append_callback(self.binance_update)
 
@@ -257,6 +272,8 @@ class OrderbookManager(WebsocketManager):
             specific_currency_id = specific_currency_id.upper()
             self.__websockets['binance'][specific_currency_id] = websocket
             self.__websockets_callbacks['binance'][specific_currency_id] = [callback]
+            self.create_dispatcher('binance', specific_currency_id,
+                                   self.__websockets_callbacks['binance'][specific_currency_id])
             self.__websockets_kwargs['binance'][specific_currency_id] = kwargs
 
             buys, sells = binance_snapshot(specific_currency_id, 1000)
@@ -286,6 +303,7 @@ class OrderbookManager(WebsocketManager):
 
             self.__websockets['alpaca'][override_symbol] = websocket
             self.__websockets_callbacks['alpaca'][override_symbol] = [callback]
+            self.create_dispatcher('alpaca', override_symbol, self.__websockets_callbacks['alpaca'][override_symbol])
             self.__websockets_kwargs['alpaca'][override_symbol] = kwargs
 
             self.__orderbooks['alpaca'][override_symbol] = {
@@ -296,6 +314,62 @@ class OrderbookManager(WebsocketManager):
         else:
             print(exchange_name + " ticker not supported, skipping creation")
 
+    def __run_callbacks(self, exchange: str, symbol: str):
+        """
+        Pass the sorted book to the user callbacks. Coroutine functions are scheduled on the shared event loop.
+        """
+        book = self.__orderbooks[exchange][symbol]
+        kwargs = self.__websockets_kwargs[exchange][symbol]
+
+        dispatcher = self.dispatchers.get(exchange, {}).get(symbol)
+        if dispatcher is not None:
+            # The sides are edited in place by the next update, so the queue gets its own copy
+            dispatcher.put({'bids': list(book['bids']), 'asks': list(book['asks'])}, kwargs)
+            return
+
+        for callback in self.__websockets_callbacks[exchange][symbol]:
+            if asyncio.iscoroutinefunction(callback):
+                event_loop.submit(callback(book, **kwargs))
+            else:
+                callback(book, **kwargs)
+
+    def record_orderbook(self, file_path: str, override_symbol=None, override_exchange=None,
+                         flush_interval: float = 5) -> OrderbookRecorder:
+        """
+        Record the book and every level change to a compressed binary file. The current book is written as a snapshot
+        and the changes are buffered and flushed from a background thread. Replay the file with an OrderbookReader.
+
+        Args:
+            file_path: Path of the recording to append to
+            override_symbol: Ticker id, such as "BTC-USD" or exchange equivalents.
+            override_exchange: Forces the manager to use a different supported exchange.
+            flush_interval: Seconds between writes to disk
+        """
+        if override_symbol is None:
+            override_symbol = self.__default_currency
+
+        if override_exchange is None:
+            override_exchange = self.__default_exchange
+
+        recorder = OrderbookRecorder(file_path, override_symbol, flush_interval=flush_interval)
+        if override_exchange not in self.__recorders:
+            self.__recorders[override_exchange] = {}
+        self.__recorders[override_exchange][override_symbol] = recorder
+        self.__record_snapshot(override_exchange, override_symbol)
+        return recorder
+
+    def __record_snapshot(self, exchange: str, symbol: str):
+        recorder = self.__recorders.get(exchange, {}).get(symbol)
+        if recorder is not None and symbol in self.__orderbooks[exchange]:
+            book = self.__orderbooks[exchange][symbol]
+            recorder.record_snapshot(book['bids'], book['asks'])
+
+    def __record_levels(self, exchange: str, symbol: str, side: int, levels: list):
+        recorder = self.__recorders.get(exchange, {}).get(symbol)
+        if recorder is not None:
+            for level in levels:
+                recorder.record_delta(side, level[0], level[1])
+
     def ftx_update(self, update):
         symbol = update['symbol']
 
@@ -320,6 +394,9 @@ class OrderbookManager(WebsocketManager):
             else:
                 book_sells.append((i[0], i[1]))
 
+        self.__record_levels('ftx', symbol, BID, new_buys)
+        self.__record_levels('ftx', symbol, ASK, new_sells)
+
         # Now sort them
         book_buys = sort_list_tuples(book_buys)
         book_sells = sort_list_tuples(book_sells)
@@ -328,10 +405,7 @@ class OrderbookManager(WebsocketManager):
         self.__orderbooks['ftx'][symbol]['asks'] = book_sells
 
         # Pass in this new updated orderbook
-        callbacks = self.__websockets_callbacks['ftx'][symbol]
-        for i in callbacks:
-            i(self.__orderbooks['ftx'][symbol],
-              **self.__websockets_kwargs['ftx'][symbol])
+        self.__run_callbacks('ftx', symbol)
 
     def ftx_snapshot_update(self, update):
         market = update['market'].replace('/', '-')
@@ -355,6 +429,7 @@ class OrderbookManager(WebsocketManager):
         book["asks"] = sort_list_tuples(book["asks"])
 
         self.__orderbooks['ftx'][update['market']] = book
+        self.__record_snapshot('ftx', update['market'])
 
     def coinbase_snapshot_update(self, update):
         print("Orderbook snapshot acquired for: " + update['product_id'])
@@ -379,6 +454,7 @@ class OrderbookManager(WebsocketManager):
         book["asks"] = sort_list_tuples(book["asks"])
 
         self.__orderbooks['coinbase_pro'][update['product_id']] = book
+        self.__record_snapshot('coinbase_pro', update['product_id'])
 
     def coinbase_update(self, update):
         # Side is first in list
@@ -404,11 +480,10 @@ class OrderbookManager(WebsocketManager):
         book = sort_list_tuples(book)
         self.__orderbooks['coinbase_pro'][update['product_id']][side] = book
 
+        self.__record_levels('coinbase_pro', update['product_id'], BID if side == 'bids' else ASK, [(price, qty)])
+
         # Iterate through the callback list
-        callbacks = self.__websockets_callbacks['coinbase_pro'][update['product_id']]
-        for i in callbacks:
-            i(self.__orderbooks['coinbase_pro'][update['product_id']],
-              **self.__websockets_kwargs['coinbase_pro'][update['product_id']])
+        self.__run_callbacks('coinbase_pro', update['product_id'])
 
     def okx_update(self, update):
 
@@ -437,6 +512,9 @@ class OrderbookManager(WebsocketManager):
             else:
                 book_sells.append((i[0], i[1]))
 
+        self.__record_levels('okx', symbol, BID, new_buys)
+        self.__record_levels('okx', symbol, ASK, new_sells)
+
         # Now sort them
         book_buys = sort_list_tuples(book_buys)
         book_sells = sort_list_tuples(book_sells)
@@ -445,10 +523,7 @@ class OrderbookManager(WebsocketManager):
         self.__orderbooks['okx'][symbol]['asks'] = book_sells
 
         # Pass in this new updated orderbook
-        callbacks = self.__websockets_callbacks['okx'][symbol]
-        for i in callbacks:
-            i(self.__orderbooks['okx'][symbol],
-              **self.__websockets_kwargs['okx'][symbol])
+        self.__run_callbacks('okx', symbol)
 
     def okx_snapshot_update(self, update):
         print("Orderbook snapshot acquired for: " + update['arg']['instId'])
@@ -475,6 +550,7 @@ class OrderbookManager(WebsocketManager):
         book["asks"] = sort_list_tuples(book["asks"])
 
         self.__orderbooks['okx'][update['arg']['instId']] = book
+        self.__record_snapshot('okx', update['arg']['instId'])
 
     def kucoin_update(self, update):
         symbol = update['data']['symbol']
@@ -512,6 +588,9 @@ class OrderbookManager(WebsocketManager):
             else:
                 book_sells.append((i[0], i[1]))
 
+        self.__record_levels('kucoin', symbol, BID, new_buys)
+        self.__record_levels('kucoin', symbol, ASK, new_sells)
+
         # Now sort them
         book_buys = sort_list_tuples(book_buys)
         book_sells = sort_list_tuples(book_sells)
@@ -520,10 +599,7 @@ class OrderbookManager(WebsocketManager):
         self.__orderbooks['kucoin'][symbol]['asks'] = book_sells
 
         # Pass in this new updated orderbook
-        callbacks = self.__websockets_callbacks['kucoin'][symbol]
-        for i in callbacks:
-            i(self.__orderbooks['kucoin'][symbol],
-              **self.__websockets_kwargs['kucoin'][symbol])
+        self.__run_callbacks('kucoin', symbol)
 
     def kucoin_snapshot_update(self, update):
         print("Orderbook snapshot acquired for: " + update['data']['symbol'])
@@ -550,6 +626,7 @@ class OrderbookManager(WebsocketManager):
         book["asks"] = sort_list_tuples(book["asks"])
 
         self.__orderbooks['kucoin'][update['data']['symbol']] = book
+        self.__record_snapshot('kucoin', update['data']['symbol'])
 
     def binance_update(self, update):
         try:
@@ -581,6 +658,9 @@ class OrderbookManager(WebsocketManager):
                 else:
                     book_sells.append((i[0], i[1]))
 
+            self.__record_levels('binance', symbol, BID, new_buys)
+            self.__record_levels('binance', symbol, ASK, new_sells)
+
             # Now sort them
             book_buys = sort_list_tuples(book_buys)
             book_sells = sort_list_tuples(book_sells)
@@ -589,10 +669,7 @@ class OrderbookManager(WebsocketManager):
             self.__orderbooks['binance'][symbol]['asks'] = book_sells
 
             # Pass in this new updated orderbook
-            callbacks = self.__websockets_callbacks['binance'][symbol]
-            for i in callbacks:
-                i(self.__orderbooks['binance'][symbol],
-                  **self.__websockets_kwargs['binance'][symbol])
+            self.__run_callbacks('binance', symbol)
         except Exception:
             traceback.print_exc()
 
@@ -602,10 +679,7 @@ class OrderbookManager(WebsocketManager):
         self.__orderbooks['alpaca'][symbol]['bids'] = [(update['bp'], update['bs'])]
         self.__orderbooks['alpaca'][symbol]['asks'] = [(update['ap'], update['as'])]
 
-        callbacks = self.__websockets_callbacks['alpaca'][symbol]
-        for i in callbacks:
-            i(self.__orderbooks['alpaca'][symbol],
-              **self.__websockets_kwargs['alpaca'][symbol])
+        self.__run_callbacks('alpaca', symbol)
 
     def append_orderbook_callback(self, callback_object, override_symbol=None, override_exchange=None):
         """
@@ -19,6 +19,7 @@ import random
 import requests
 
 import synapsis.utils.utils
+from synapsis.data.recorder import TickRecorder
 from synapsis.exchanges.interfaces.alpaca.alpaca_websocket import Tickers as Alpaca_Ticker
 from synapsis.exchanges.interfaces.binance.binance_websocket import Tickers as Binance_Ticker
 from synapsis.exchanges.interfaces.coinbase_pro.coinbase_pro_websocket import Tickers as Coinbase_Pro_Ticker
@@ -27,15 +28,18 @@ from synapsis.exchanges.interfaces.ftx.ftx_websocket import Tickers as FTX_Ticke
 from synapsis.exchanges.interfaces.okx.okx_websocket import Tickers as Okx_Ticker
 
 from synapsis.exchanges.managers.websocket_manager import WebsocketManager
+from synapsis.utils.market_data import get_market_data_hub
 
 
 class TickerManager(WebsocketManager):
-    def __init__(self, default_exchange: str, default_symbol: str):
+    def __init__(self, default_exchange: str, default_symbol: str, transport: str = None):
         """
         Create a new manager.
         Args:
             default_exchange: Add an exchange name for the manager to favor
             default_symbol: Add a default currency for the manager to favor
+            transport: Run websockets on a 'thread' each or as tasks on the shared 'asyncio' loop. Defaults to the
+             websocket_transport setting. Alpaca always uses a thread.
         """
         self.__default_exchange = default_exchange
         if default_exchange == "binance":
@@ -52,14 +56,31 @@ class TickerManager(WebsocketManager):
         self.__tickers = {default_exchange: {}}
 
         # Create abstraction for writing many managers
-        super().__init__(self.__tickers, default_symbol, default_exchange)
+        super().__init__(self.__tickers, default_symbol, default_exchange, transport)
 
     """ 
     Manager Functions 
     """
 
+    def __dispatch(self, exchange: str, symbol: str, callback):
+        """
+        Route the user callback through a queue for this subscription when threaded dispatch is enabled
+        """
+        dispatcher = self.create_dispatcher(exchange, symbol, [callback])
+        if dispatcher is None:
+            return callback
+        return dispatcher
+
+    def __subscribe(self, ticker, exchange: str, symbol: str, callback, fields: tuple = None):
+        """
+        Feed the shared market data hub from the reader, then pass the tick on to the user callback
+        """
+        hub = get_market_data_hub()
+        ticker.append_callback(lambda tick, **kwargs: hub.record_tick(exchange, symbol, tick), fields=('price',))
+        ticker.append_callback(self.__dispatch(exchange, symbol, callback), fields=fields)
+
     def create_ticker(self, callback, log: str = None, override_symbol: str = None, override_exchange: str = None,
-                      **kwargs):
+                      fields: tuple = None, **kwargs):
         """
         Create a ticker on a given exchange.
         Args:
@@ -67,6 +88,9 @@ class TickerManager(WebsocketManager):
             log: Fill this with a path to log the price updates.
             override_symbol: The currency to create a ticker for.
             override_exchange: Override the default exchange.
+            fields: Keys of the tick the callback reads, such as ('price',). Only these and the symbol, time, price and
+                size are parsed from each message if the exchange supports it, the callback gets the whole tick when
+                this is None.
             kwargs: Any keyword arguments to be passed into the callback besides the first positional message argument
         Returns:
             Direct ticker object
@@ -94,11 +118,12 @@ class TickerManager(WebsocketManager):
 
             if sandbox_mode:
                 ticker = Coinbase_Pro_Ticker(override_symbol, "ticker", log=log,
-                                             websocket_url="wss://ws-feed-public.sandbox.pro.coinbase.com", **kwargs)
+                                             websocket_url="wss://ws-feed-public.sandbox.pro.coinbase.com",
+                                             transport=self.transport, **kwargs)
             else:
-                ticker = Coinbase_Pro_Ticker(override_symbol, "ticker", log=log, **kwargs)
+                ticker = Coinbase_Pro_Ticker(override_symbol, "ticker", log=log, transport=self.transport, **kwargs)
 
-            ticker.append_callback(callback)
+            self.__subscribe(ticker, 'coinbase_pro', override_symbol, callback, fields)
             # Store this object
             self.__tickers['coinbase_pro'][override_symbol] = ticker
             return ticker
@@ -111,12 +136,13 @@ class TickerManager(WebsocketManager):
                 ticker = Binance_Ticker(override_symbol,
                                         "aggTrade",
                                         log=log,
-                                        websocket_url="wss://testnet.binance.vision/ws", **kwargs)
+                                        websocket_url="wss://testnet.binance.vision/ws",
+                                        transport=self.transport, **kwargs)
             else:
                 ticker = Binance_Ticker(override_symbol,
                                         "aggTrade",
-                                        log=log, **kwargs)
-            ticker.append_callback(callback)
+                                        log=log, transport=self.transport, **kwargs)
+            self.__subscribe(ticker, 'binance', override_symbol.upper(), callback, fields)
             override_symbol = override_symbol.upper()
             self.__tickers['binance'][override_symbol] = ticker
             return ticker
@@ -134,15 +160,17 @@ class TickerManager(WebsocketManager):
                 ticker = Kucoin_Ticker(override_symbol,
                                        "ticker",
                                        log=log,
-                                       websocket_url=f"{base_endpoint}/socket.io/?token={token}", **kwargs)
+                                       websocket_url=f"{base_endpoint}/socket.io/?token={token}",
+                                       transport=self.transport, **kwargs)
             else:
                 base_endpoint = request_data['data']['instanceServers'][0]['endpoint']
                 token = request_data['data']['token']
                 ticker = Kucoin_Ticker(override_symbol, "ticker",
                                        log=log,
                                        websocket_url=f"{base_endpoint}?token={token}&[connectId="
-                                                     f"{random.randint(1, 100000000) * 100000000}]", **kwargs)
-            ticker.append_callback(callback)
+                                                     f"{random.randint(1, 100000000) * 100000000}]",
+                                       transport=self.transport, **kwargs)
+            self.__subscribe(ticker, 'kucoin', override_symbol, callback, fields)
             self.__tickers['kucoin'][override_symbol] = ticker
         elif exchange_name == 'okx':
             if override_symbol is None:
@@ -150,11 +178,12 @@ class TickerManager(WebsocketManager):
 
             if sandbox_mode:
                 ticker = Okx_Ticker(override_symbol, "tickers", log=log,
-                                    WEBSOCKET_URL="wss://wspap.okx.com:8443/ws/v5/public?brokerId=9999", **kwargs)
+                                    WEBSOCKET_URL="wss://wspap.okx.com:8443/ws/v5/public?brokerId=9999",
+                                    transport=self.transport, **kwargs)
             else:
-                ticker = Okx_Ticker(override_symbol, "tickers", log=log, **kwargs)
+                ticker = Okx_Ticker(override_symbol, "tickers", log=log, transport=self.transport, **kwargs)
 
-            ticker.append_callback(callback)
+            self.__subscribe(ticker, 'okx', override_symbol, callback, fields)
             # Store this object
             self.__tickers['okx'][override_symbol] = ticker
             return ticker
@@ -177,7 +206,7 @@ class TickerManager(WebsocketManager):
                                        log=log,
                                        websocket_url="wss://stream.data.alpaca.markets/v2/{}/".format(stream),
                                        **kwargs)
-            ticker.append_callback(callback)
+            self.__subscribe(ticker, 'alpaca', override_symbol, callback, fields)
             self.__tickers['alpaca'][override_symbol] = ticker
             return ticker
 
@@ -190,12 +219,28 @@ class TickerManager(WebsocketManager):
             if sandbox_mode:
                 raise ValueError("Error: FTX does not have a sandbox mode")
             else:
-                ticker = FTX_Ticker(override_symbol, "trades", log=log, **kwargs)
+                ticker = FTX_Ticker(override_symbol, "trades", log=log, transport=self.transport, **kwargs)
 
-            ticker.append_callback(callback)
+            self.__subscribe(ticker, 'ftx', override_symbol, callback, fields)
             # Store this object
             self.__tickers['ftx'][override_symbol] = ticker
             return ticker
 
         else:
             print(exchange_name + " ticker not supported, skipping creation")
+
+    def record_ticker(self, file_path: str, override_symbol: str = None, override_exchange: str = None,
+                      flush_interval: float = 5) -> TickRecorder:
+        """
+        Record the normalized ticks of an existing ticker to a compressed binary file. Ticks are buffered and flushed
+        from a background thread, and the file can be read back with a TickReader for backtesting.
+        Args:
+            file_path: Path of the recording to append to
+            override_symbol: The currency of the ticker to record.
+            override_exchange: Override the default exchange.
+            flush_interval: Seconds between writes to disk
+        """
+        recorder = TickRecorder(file_path, override_symbol, flush_interval=flush_interval)
+        # Recording is cheap so it runs on the reader instead of going through the dispatch queue
+        self.append_callback(recorder, override_symbol, override_exchange)
+        return recorder
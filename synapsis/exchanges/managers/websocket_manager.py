@@ -17,21 +17,60 @@
 """
 import synapsis.utils.utils
 from synapsis.exchanges.abc_exchange_websocket import ABCExchangeWebsocket
+from synapsis.exchanges.interfaces.websocket_health import WebsocketWatchdog
+from synapsis.exchanges.managers.callback_dispatcher import CallbackDispatcher
 
 
 class WebsocketManager(ABCExchangeWebsocket):
-    def __init__(self, websockets, default_symbol, default_exchange):
+    def __init__(self, websockets, default_symbol, default_exchange, transport=None):
         self.websockets = websockets
+        self.transport = transport
         self.__default_symbol = default_symbol
         self.__default_exchange = default_exchange
 
+        # Callback queues for each subscription, keyed the same way as the websockets
+        self.dispatchers = {}
+
+        self.watchdog = None
+
         self.preferences = synapsis.utils.load_user_preferences()
 
+    def create_dispatcher(self, exchange: str, symbol: str, callbacks: list):
+        """
+        Create the queue that runs the user callbacks for a subscription off of the websocket reader. Returns None if
+        threaded dispatch is disabled in the settings.
+        """
+        dispatch_settings = self.preferences['settings']['websocket_dispatch']
+        if not dispatch_settings['enabled']:
+            return None
+
+        dispatcher = CallbackDispatcher(f'{exchange}-{symbol}', callbacks,
+                                        queue_size=dispatch_settings['queue_size'],
+                                        overflow_policy=dispatch_settings['overflow_policy'])
+        if exchange not in self.dispatchers:
+            self.dispatchers[exchange] = {}
+        # Stop any queue left over from a previous subscription on this symbol
+        if symbol in self.dispatchers[exchange]:
+            self.dispatchers[exchange][symbol].stop()
+        self.dispatchers[exchange][symbol] = dispatcher
+        return dispatcher
+
     def close_all_websockets(self):
         """
         Iterate through orderbooks and make sure they're closed
         """
+        self.stop_watchdog()
         self.__recursive_close(self.websockets)
+        # Each dispatcher has a worker thread that would otherwise wait for messages forever
+        for dispatchers in self.dispatchers.values():
+            for dispatcher in dispatchers.values():
+                dispatcher.stop()
+        self.dispatchers = {}
+
+    def __stop_dispatcher(self, exchange: str, symbol: str):
+        dispatcher = self.dispatchers.get(exchange, {}).pop(symbol, None)
+        if dispatcher is not None:
+            dispatcher.stop()
 
     def __recursive_close(self, d):
         for k, v in d.items():
@@ -40,9 +79,9 @@ class WebsocketManager(ABCExchangeWebsocket):
             else:
                 d[k].close_websocket()
 
-    def __evaluate_overrides(self, override_symbol, override_exchange):
+    def __evaluate_keys(self, override_symbol, override_exchange):
         """
-        Switches to inputted exchanges, used in the public methods
+        Find the exchange and symbol keys that the websockets are stored under
         """
         # Issues could arise if the user specifies a different exchange but not a different currency. It would run
         # that default on the new exchange. Not great behavior unless they're clever
@@ -59,6 +98,13 @@ class WebsocketManager(ABCExchangeWebsocket):
             currency_id = synapsis.utils.to_exchange_symbol(currency_id, "binance")
         if exchange == "ftx":
             currency_id = synapsis.utils.to_exchange_symbol(currency_id, "ftx")
+        return exchange, currency_id
+
+    def __evaluate_overrides(self, override_symbol, override_exchange):
+        """
+        Switches to inputted exchanges, used in the public methods
+        """
+        exchange, currency_id = self.__evaluate_keys(override_symbol, override_exchange)
         return self.websockets[exchange][currency_id]
 
     def get_ticker(self, symbol, override_exchange=None):
@@ -85,7 +131,7 @@ class WebsocketManager(ABCExchangeWebsocket):
     Ticker functions/overridden
     """
 
-    def append_callback(self, callback_object, override_symbol=None, override_exchange=None):
+    def append_callback(self, callback_object, override_symbol=None, override_exchange=None, fields: tuple = None):
         """
         This bypasses all processing that a manager class may do before returning to the user's main.
         For example with an orderbook feed, this will return the ticks instead of a sorted orderbook
@@ -96,10 +142,24 @@ class WebsocketManager(ABCExchangeWebsocket):
                 function would be passed in as just self.price_event  -- no parenthesis or arguments, just the object
             override_symbol: Ticker id, such as "BTC-USD" or exchange equivalents.
             override_exchange: Forces the manager to use a different supported exchange.
+            fields: Keys of the tick the callback reads, such as ('price', 'size'). When every callback of a
+                websocket declares its fields only those and the symbol, time, price and size are parsed from each
+                message.
         """
         websocket = self.__evaluate_overrides(override_symbol, override_exchange)
 
-        websocket.append_callback(callback_object)
+        websocket.append_callback(callback_object, fields)
+
+    def get_dispatch_stats(self, override_symbol=None, override_exchange=None) -> dict:
+        """
+        Get the callback queue depth and the received, dispatched and dropped message counts for a subscription. This
+        is empty if the callbacks run directly on the websocket reader.
+        """
+        exchange, currency_id = self.__evaluate_keys(override_symbol, override_exchange)
+        try:
+            return self.dispatchers[exchange][currency_id].get_stats()
+        except KeyError:
+            return {}
 
     def is_websocket_open(self, override_symbol=None, override_exchange=None) -> bool:
         """
@@ -133,6 +193,83 @@ class WebsocketManager(ABCExchangeWebsocket):
 
         return websocket.get_feed()
 
+    def get_feed_arrays(self, since: int = None, override_symbol=None, override_exchange=None):
+        """
+        Get read only arrays of the time, price, size and side of each tick without copying the feed, along with a
+        cursor. Pass the cursor back as since to only get the ticks received after this call.
+
+        Example:
+            ticks, cursor = manager.get_feed_arrays()
+            ...
+            new_ticks, cursor = manager.get_feed_arrays(since=cursor)
+            vwap = (new_ticks.price * new_ticks.size).sum() / new_ticks.size.sum()
+        """
+        websocket = self.__evaluate_overrides(override_symbol, override_exchange)
+
+        return websocket.get_feed_arrays(since)
+
+    def __health(self, exchange: str, symbol: str, websocket) -> dict:
+        stats = websocket.get_health()
+        dispatcher = self.dispatchers.get(exchange, {}).get(symbol)
+        if dispatcher is not None:
+            stats['queue'] = dispatcher.get_stats()
+        return stats
+
+    def get_health(self, override_symbol=None, override_exchange=None):
+        """
+        Get the message rate, exchange to local latency, seconds since the last message, reconnect count and callback
+        time of a websocket. When callbacks run on a dispatch queue its depth and counters are included under queue.
+        """
+        exchange, currency_id = self.__evaluate_keys(override_symbol, override_exchange)
+
+        return self.__health(exchange, currency_id, self.websockets[exchange][currency_id])
+
+    def get_all_health(self, websockets: dict = None) -> dict:
+        """
+        Get the health of every websocket in the manager as {exchange: {symbol: stats}}
+
+        Args:
+            websockets: Websockets to read instead of the ones in the manager, as {exchange: {symbol: websocket}}
+        """
+        if websockets is None:
+            websockets = self.websockets
+        return {exchange: {symbol: self.__health(exchange, symbol, websocket)
+                           for symbol, websocket in symbols.items()}
+                for exchange, symbols in websockets.items()}
+
+    def start_watchdog(self, callback=None, stale_after: float = None, interval: float = None) -> WebsocketWatchdog:
+        """
+        Check the websockets in the background and raise an event when one stops receiving messages. The health of
+        every websocket is also exported to the reporter after each check.
+
+        Args:
+            callback: Called with {exchange, symbol, stale, stats} when a websocket goes stale and again when it
+                recovers, such as to restart it. Defaults to printing a warning
+            stale_after: Seconds without a message before a websocket is stale, defaults to the websocket_health
+                setting
+            interval: Seconds between checks, defaults to the websocket_health setting
+        """
+        settings = self.preferences['settings']['websocket_health']
+        self.stop_watchdog()
+        self.watchdog = WebsocketWatchdog(self.get_all_health, callback,
+                                          stale_after=settings['stale_after'] if stale_after is None else stale_after,
+                                          interval=settings['check_interval'] if interval is None else interval,
+                                          export=self.__export_health)
+        self.watchdog.start()
+        return self.watchdog
+
+    def stop_watchdog(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            self.watchdog = None
+
+    @staticmethod
+    def __export_health(health: dict):
+        try:
+            synapsis.reporter.export_websocket_health(health)
+        except Exception:
+            pass
+
     def get_response(self, override_symbol=None, override_exchange=None):
         """
         Get the exchange's response to the request to subscribe to a feed
@@ -143,11 +280,12 @@ class WebsocketManager(ABCExchangeWebsocket):
 
     def close_websocket(self, override_symbol=None, override_exchange=None):
         """
-        Close a websocket thread
+        Close a websocket thread and the queue that runs its callbacks
         """
-        websocket = self.__evaluate_overrides(override_symbol, override_exchange)
+        exchange, currency_id = self.__evaluate_keys(override_symbol, override_exchange)
 
-        websocket.close_websocket()
+        self.websockets[exchange][currency_id].close_websocket()
+        self.__stop_dispatcher(exchange, currency_id)
 
     def restart_ticker(self, override_symbol=None, override_exchange=None):
         """
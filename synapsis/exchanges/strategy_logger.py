@@ -22,8 +22,10 @@ from datetime import datetime as dt
 
 import synapsis
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
+from synapsis.exchanges.interfaces.paper_trade.backtesting_wrapper import BacktestingWrapper
 from synapsis.exchanges.orders.market_order import MarketOrder
 from synapsis.exchanges.orders.limit_order import LimitOrder
+from synapsis.utils.market_data import get_market_data_hub
 from synapsis.utils.utils import AttributeDict
 
 
@@ -59,6 +61,8 @@ class StrategyLogger(ABCExchangeInterface):
         """
         No logging implemented
         """
+        if self.__shares_market_data():
+            return get_market_data_hub().products(self.__type, self.interface.get_products)
         return self.interface.get_products()
 
     def get_product_history(self, symbol: str, epoch_start: float,
@@ -163,12 +167,24 @@ class StrategyLogger(ABCExchangeInterface):
         """
         return self.interface.get_order_filter(symbol)
 
+    def get_compiled_order_filter(self, symbol: str):
+        """
+        No logging implemented
+        """
+        return self.interface.get_compiled_order_filter(symbol)
+
     def get_price(self, symbol: str) -> float:
         """
         No logging implemented
         """
+        if self.__shares_market_data():
+            return get_market_data_hub().price(self.__type, symbol, lambda: self.interface.get_price(symbol))
         return self.interface.get_price(symbol)
 
+    def __shares_market_data(self) -> bool:
+        # Paper trading goes through the hub itself and has to see backtest prices while backtesting
+        return not isinstance(self.interface, BacktestingWrapper)
+
     """
     No logging implemented for these properties
     """
@@ -98,6 +98,19 @@ class Model(abc.ABC):
     def websocket_update(self, data):
         pass
 
+    def listens_to_ticks(self, symbol: str) -> bool:
+        """
+        Check if websocket_update needs each replayed tick for this symbol during a backtest. Returning False lets
+        the backtest skip over batches of ticks and only keep their last price.
+        """
+        return type(self).websocket_update is not Model.websocket_update
+
+    def orderbook_update(self, symbol: str, book: dict):
+        """
+        Override this to receive the replayed orderbook during a backtest
+        """
+        pass
+
     @property
     def time(self):
         if not self.is_backtesting:
@@ -40,6 +40,8 @@ class FuturesStrategyState:
         self.symbol = symbol
         self.base_asset = get_base_asset(symbol)
         self.quote_asset = get_quote_asset(symbol)
+        # Filled with a RollingWindow when the bar event is added with a window size
+        self.window = None
 
     @property
     def interface(self) -> FuturesExchangeInterface:
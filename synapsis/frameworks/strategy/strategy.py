@@ -20,17 +20,23 @@ import time
 import traceback
 import typing
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import synapsis
+from synapsis.data.data_reader import OrderbookReader, TickReader
 from synapsis.exchanges.abc_base_exchange import ABCBaseExchange
 from synapsis.exchanges.exchange import Exchange
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface
+from synapsis.exchanges.interfaces.async_interface import AsyncInterface, run_concurrently
 from synapsis.exchanges.interfaces.paper_trade.backtest_result import BacktestResult
+from synapsis.exchanges.managers import trade_streamed_exchanges
+from synapsis.exchanges.managers.bar_manager import BarManager
 from synapsis.exchanges.strategy_logger import StrategyLogger
 from synapsis.frameworks.model.model import Model
 from synapsis.frameworks.strategy.strategy_base import StrategyBase, EventType
 from synapsis.frameworks.strategy import StrategyState
-from synapsis.utils.utils import info_print
+from synapsis.utils.rolling_window import RollingWindow
+from synapsis.utils.utils import info_print, load_user_preferences
 
 
 class StrategyStructure(Model):
@@ -44,6 +50,8 @@ class StrategyStructure(Model):
         self.orderbook_manager = None
         self.schedulers = None
         self.remote_backtesting = None
+        self.async_interface = None
+        self.bar_manager = None
 
     def construct_strategy(self, schedulers, orderbook_websockets,
                            ticker_websockets, orderbook_manager, ticker_manager):
@@ -67,21 +75,26 @@ class StrategyStructure(Model):
         if type_ == EventType.bar_event:
             if not self.is_backtesting:
                 bar_time = event['bar_time']
-                while True:
-                    # Sometimes coinbase doesn't download recent data correctly
-                    try:
-                        # A few seconds should pass before querying alpaca because any solution is acceptable
-                        if self.interface.get_exchange_type() == "alpaca":
-                            time.sleep(2)
-                            data = self.interface.history(symbol=symbol, to=1, resolution=resolution).iloc[-1].to_dict()
-                            break
-                        else:
-                            data = self.interface.history(symbol=symbol, to=1, resolution=resolution).iloc[-1].to_dict()
-                            if data['time'] + resolution == bar_time:
+                # Bars built from the trade stream are used as they are, REST repairs any that may be missing trades
+                data = event.get('bar')
+                if data is None:
+                    while True:
+                        # Sometimes coinbase doesn't download recent data correctly
+                        try:
+                            # A few seconds should pass before querying alpaca because any solution is acceptable
+                            if self.interface.get_exchange_type() == "alpaca":
+                                time.sleep(2)
+                                data = self.interface.history(symbol=symbol, to=1,
+                                                              resolution=resolution).iloc[-1].to_dict()
                                 break
-                    except IndexError:
-                        pass
-                    time.sleep(.5)
+                            else:
+                                data = self.interface.history(symbol=symbol, to=1,
+                                                              resolution=resolution).iloc[-1].to_dict()
+                                if data['time'] + resolution == bar_time:
+                                    break
+                        except IndexError:
+                            pass
+                        time.sleep(.5)
             else:
                 # If we are backtesting always just grab the last point and hope for the best of course
                 try:
@@ -90,6 +103,14 @@ class StrategyStructure(Model):
                     warnings.warn("No bar found for this time range")
                     return
 
+            window = event.get('window')
+            if window is not None:
+                if state.window is None:
+                    state.window = RollingWindow.from_history(
+                        self.interface.history(symbol, to=window, resolution=resolution, return_as='array'), window)
+                # Bars already included in the seeded history are skipped by their time
+                state.window.append(data)
+
             args = [data, symbol, state]
         elif type_ == EventType.price_event:
             data = self.interface.get_price(symbol)
@@ -103,22 +124,12 @@ class StrategyStructure(Model):
                 for sym in symbol:
                     prices[sym] = self.interface.get_price(sym)
 
-            # We have to be a bit more strategy if we're live
+            # Live prices are requested together so the event only waits on the slowest one
             else:
-                def grab_price(threaded_symbol):
-                    prices[threaded_symbol] = self.interface.get_price(threaded_symbol)
-
-                threadpool = []
-                for sym in symbol:
-                    threadpool.append(threading.Thread(target=grab_price, args=(sym,)))
-
-                # Start the threads
-                for thread in threadpool:
-                    thread.start()
-
-                # Join each of the threads because they've writen to the symbol
-                for thread in threadpool:
-                    thread.join()
+                if self.async_interface is None:
+                    self.async_interface = AsyncInterface(self.interface)
+                results = run_concurrently(*(self.async_interface.get_price(sym) for sym in symbol))
+                prices = dict(zip(symbol, results))
             args = [prices, symbol, state]
         else:
             return
@@ -128,11 +139,40 @@ class StrategyStructure(Model):
         except Exception:
             traceback.print_exc()
 
+    def websocket_update(self, data):
+        symbol = data['symbol']
+        for i in self.ticker_websockets:
+            if i[0] == symbol:
+                try:
+                    # Index 5 holds the user callback
+                    i[5](data, symbol, i[3])
+                except Exception:
+                    traceback.print_exc()
+
+    def listens_to_ticks(self, symbol: str) -> bool:
+        return any(i[0] == symbol for i in self.ticker_websockets)
+
+    def orderbook_update(self, symbol: str, book: dict):
+        for i in self.orderbook_websockets:
+            if i[0] == symbol:
+                try:
+                    # Index 5 holds the user callback
+                    i[5](book, symbol, i[3])
+                except Exception:
+                    traceback.print_exc()
+
     def run_price_events(self, events: list):
         # run all events once at start
         for event in events:
             event['next_run'] = self.backtester.initial_time
 
+        # With only websocket events the backtest just steps through the replayed data
+        if len(events) == 0:
+            while self.has_data:
+                self.sleep(self.backtester.min_resolution)
+                self.backtester.value_account()
+            return
+
         while self.has_data:
             events.sort(key=lambda d: d['next_run'])
             event = events[0]
@@ -164,34 +204,69 @@ class StrategyStructure(Model):
             kwargs = scheduler.get_kwargs()
             # Overwrite the internal interface in the created strategy
             kwargs['state'].strategy.interface = self.interface
+        for i in self.orderbook_websockets + self.ticker_websockets:
+            i[3].strategy.interface = self.interface
         self.__run_init()
 
+        for i in self.orderbook_websockets + self.ticker_websockets:
+            if i[2] is not None:
+                i[2](i[0], i[3])
+
         events = []
         for scheduler in self.schedulers:
             events.append(scheduler.get_kwargs())
 
         self.run_price_events(events)
 
+    @staticmethod
+    def __call_init(kwargs: dict):
+        if kwargs['type'] != EventType.scheduled_event:
+            kwargs['init'](kwargs['symbol'], kwargs['state'])
+        else:
+            kwargs['init'](kwargs['state'])
+
     def __run_init(self):
-        # Switch to live mode for the inits
+        # Switch to live mode for the inits. When backtesting their history comes from the downloaded prices
         if self.is_backtesting:
             self.interface.backtesting = False
-        for i in self.schedulers:
-            kwargs = i.get_kwargs()
-            if kwargs['init'] is not None:
-                if kwargs['type'] != EventType.scheduled_event:
-                    kwargs['init'](kwargs['symbol'], kwargs['state'])
-                else:
-                    kwargs['init'](kwargs['state'])
+        inits = [i.get_kwargs() for i in self.schedulers if i.get_kwargs()['init'] is not None]
+
+        # Inits share the interface, the paper account and any globals they touch, so they only run together when
+        #  the user says they are independent. Their history requests then overlap.
+        settings = load_user_preferences()['settings']
+        if len(inits) > 1 and settings['concurrent_inits']:
+            max_workers = min(len(inits), settings['http']['pool_size'])
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='synapsis-init') as executor:
+                # Raises the first exception from the inits, in the order they were added
+                list(executor.map(self.__call_init, inits))
+        else:
+            for kwargs in inits:
+                self.__call_init(kwargs)
 
         # Switch back to the backtesting status
         self.interface.backtesting = self.is_backtesting
 
+    def __create_bar_manager(self):
+        exchange = self.interface.get_exchange_type()
+        if not load_user_preferences()['settings']['live_bars']['enabled'] or exchange not in trade_streamed_exchanges:
+            return None
+        return BarManager(exchange)
+
     def run_live(self):
         self.__run_init()
 
+        self.bar_manager = self.__create_bar_manager()
         for scheduler in self.schedulers:
-            scheduler.start()
+            kwargs = scheduler.get_kwargs()
+            if self.bar_manager is not None and kwargs['type'] == EventType.bar_event:
+                # Bar events close on the bar manager's timer instead of their own scheduler
+                self.bar_manager.add_bar_event(kwargs['symbol'], kwargs['resolution'],
+                                               lambda bar, bar_time, kwargs_=kwargs:
+                                               self.rest_event(**kwargs_, bar=bar, bar_time=bar_time))
+            else:
+                scheduler.start()
+        if self.bar_manager is not None:
+            self.bar_manager.start()
 
         for i in self.orderbook_websockets:
             # Index 2 contains the initialization function for the assigned websockets array
@@ -200,12 +275,14 @@ class StrategyStructure(Model):
             self.orderbook_manager.restart_ticker(i[0], i[1])
 
         for i in self.ticker_websockets:
-            # The initialization function should have already been called for ticker websockets
-            # Notice this is different from orderbook websockets because these are put into the scheduler
+            if i[2] is not None:
+                i[2](i[0], i[3])
             self.ticker_manager.restart_ticker(i[0], i[1])
 
     def teardown(self):
         self.lock.acquire()
+        if self.bar_manager is not None:
+            self.bar_manager.stop()
         for i in self.schedulers:
             i.stop_scheduler()
             kwargs = i.get_kwargs()
@@ -236,6 +313,8 @@ class Strategy(StrategyBase):
         super().__init__(exchange, StrategyLogger(exchange.get_interface(), strategy=self), model=self.model)
         self._paper_trade_exchange = synapsis.PaperTrade(exchange)
         self.__prices_added = False
+        self.__orderbooks_added = set()
+        self.__ticks_added = set()
 
     def teardown(self):
         pass
@@ -312,7 +391,8 @@ class Strategy(StrategyBase):
                     Set this to be the theoretical rate of return with no risk
         """
         self.setup_model()
-        if len(self.orderbook_websockets) != 0 or len(self.ticker_websockets) != 0:
+        if any(i[0] not in self.__ticks_added for i in self.ticker_websockets) or \
+                any(i[0] not in self.__orderbooks_added for i in self.orderbook_websockets):
             info_print("Found websocket events added to this strategy. These are not yet backtestable without "
                        "event based data")
 
@@ -346,7 +426,7 @@ class Strategy(StrategyBase):
 
             self.__prices_added = True
 
-        if not self.__prices_added:
+        if not self.__prices_added and not self.__orderbooks_added and not self.__ticks_added:
             raise LookupError("No prices added. If using scheduled events, create an empty price event or add prices"
                               " manually using strategy.add_prices()")
 
@@ -359,6 +439,28 @@ class Strategy(StrategyBase):
         self.model.backtester.add_prices(symbol, resolution, to, start_date, stop_date)
         self.__prices_added = True
 
+    def add_tick_data(self, tick_reader: TickReader):
+        """
+        Replay recorded trades into the tick events of a backtest. The paper trade price of each symbol follows its
+        ticks.
+
+        Args:
+            tick_reader: A TickReader holding trades for one or more symbols
+        """
+        self.model.backtester.add_tick_events(tick_reader)
+        self.__ticks_added.update(tick_reader.data.keys())
+
+    def add_orderbook_data(self, orderbook_reader: OrderbookReader):
+        """
+        Replay recorded orderbooks into the orderbook events of a backtest. Market orders on these symbols fill
+        against the replayed book.
+
+        Args:
+            orderbook_reader: An OrderbookReader holding recordings for one or more symbols
+        """
+        self.model.backtester.add_orderbook_events(orderbook_reader)
+        self.__orderbooks_added.update(orderbook_reader.data.keys())
+
     def setup_model(self):
         self.model.construct_strategy(self.schedulers, self.orderbook_websockets,
                                       self.ticker_websockets, self.orderbook_manager,
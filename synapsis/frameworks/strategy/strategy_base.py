@@ -138,7 +138,8 @@ class StrategyBase:
                                   teardown=teardown, variables=variables, type_=EventType.arbitrage_event)
 
     def add_bar_event(self, callback: typing.Callable, symbol: str, resolution: typing.Union[str, float],
-                      init: typing.Callable = None, teardown: typing.Callable = None, variables: dict = None):
+                      init: typing.Callable = None, teardown: typing.Callable = None, variables: dict = None,
+                      window: int = None):
         """
         The bar event sends a dictionary of {open, high, low, close, volume} which has occurred in the interval.
         Args:
@@ -150,9 +151,12 @@ class StrategyBase:
             teardown: A function to run when the strategy is stopped or interrupted. Example usages include liquidating
                 positions, writing or cleaning up data or anything else useful
             variables: A dictionary to initialize the state's internal values
+            window: Keep this many of the most recent bars in state.window, a RollingWindow that is filled from
+                history on the first bar and appended to before each callback
         """
         self.__custom_price_event(type_=EventType.bar_event, synced=True, callback=callback, symbol=symbol,
-                                  resolution=resolution, init=init, teardown=teardown, variables=variables)
+                                  resolution=resolution, init=init, teardown=teardown, variables=variables,
+                                  window=window)
 
     def __custom_price_event(self,
                              type_: EventType,
@@ -161,7 +165,7 @@ class StrategyBase:
                              resolution: typing.Union[str, float] = None,
                              init: typing.Callable = None,
                              synced: bool = False,
-                             teardown: typing.Callable = None, variables: dict = None):
+                             teardown: typing.Callable = None, variables: dict = None, window: int = None):
         """
         Add Price Event
         Args:
@@ -175,6 +179,7 @@ class StrategyBase:
                 positions, writing or cleaning up data or anything else useful
             synced: Sync the function to
             variables: Initial dictionary to write into the state variable
+            window: Number of bars kept in state.window for bar events
         """
         # Make sure variables is always an empty dictionary if None
         if variables is None:
@@ -196,7 +201,8 @@ class StrategyBase:
                               type=type_,
                               init=init,
                               teardown=teardown,
-                              symbol=symbol)
+                              symbol=symbol,
+                              window=window)
         )
 
         # Export a new symbol to the backend
@@ -243,7 +249,8 @@ class StrategyBase:
                                           variables=variables,
                                           state=state)
 
-        self.ticker_websockets.append([symbol, self.__exchange.get_type(), init, state, teardown])
+        # The callback is stored last so that backtests can run it directly
+        self.ticker_websockets.append([symbol, self.__exchange.get_type(), init, state, teardown, callback])
 
     def add_orderbook_event(self, callback: callable, symbol: str, init: typing.Callable = None,
                             teardown: typing.Callable = None, variables: dict = None):
@@ -275,7 +282,7 @@ class StrategyBase:
                                                 variables=variables,
                                                 state=state)
 
-        self.orderbook_websockets.append([symbol, self.__exchange.get_type(), init, state, teardown])
+        self.orderbook_websockets.append([symbol, self.__exchange.get_type(), init, state, teardown, callback])
 
     def start(self):
         """
@@ -17,6 +17,7 @@
 """
 
 from synapsis.exchanges.interfaces.abc_exchange_interface import ABCExchangeInterface as Interface
+from synapsis.utils.rolling_window import RollingWindow
 from synapsis.utils.utils import AttributeDict, get_base_asset, get_quote_asset, format_with_new_line, pretty_print_json
 
 
@@ -31,6 +32,8 @@ class StrategyState:
         self.variables = variables
         self.resolution = resolution
         self.symbol = symbol
+        # Filled with a RollingWindow when the bar event is added with a window size
+        self.window = None
 
         # Base & quotes are conditionally defined
         self.base_asset = None
@@ -41,6 +44,9 @@ class StrategyState:
 
     @staticmethod
     def append_bar(history_reference, new_bar: dict):
+        if isinstance(history_reference, RollingWindow):
+            history_reference.append(new_bar)
+            return
         history_reference['open'].append(new_bar['open'])
         history_reference['high'].append(new_bar['high'])
         history_reference['low'].append(new_bar['low'])
@@ -37,7 +37,7 @@ def vwma(data: Any, volume_data: Any, period: int = 50, use_series=False) -> Any
         use_series = True
 
     data = convert_to_numpy(data)
-    volume_data = convert_to_numpy(volume_data).astype(float)
+    volume_data = convert_to_numpy(volume_data).astype(float, copy=False)
 
     vwma = ti.vwma(data, volume_data, period=period)
     return pd.Series(vwma) if use_series else vwma
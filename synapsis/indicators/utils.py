@@ -32,6 +32,9 @@ def convert_to_numpy(data: Any):
         return np.fromiter(data, float)
     elif isinstance(data, pd.Series):
         return data.to_numpy()
+    elif isinstance(data, np.ndarray):
+        # Tulipy needs contiguous float64, arrays from history(return_as='array') already are and aren't copied
+        return np.ascontiguousarray(data, dtype=np.float64)
     return data
 
 
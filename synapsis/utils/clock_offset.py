@@ -0,0 +1,146 @@
+"""
+    Estimate the offset between the local clock and an exchange clock for timestamp signed requests.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import collections
+import threading
+import time
+import traceback
+
+
+class ClockOffset:
+    def __init__(self, fetch_server_time, refresh_interval: float = 300, samples: int = 5, history: int = 12,
+                 clock=time.time):
+        """
+        Track the offset and drift of a server clock so that signed requests can be timestamped locally instead of
+        asking the server for its time before every call.
+
+        Each refresh takes several samples and keeps the one with the shortest round trip. The server time is assumed
+        to be read at the midpoint of that round trip, as NTP does. Drift is the slope of the offsets kept from
+        recent refreshes.
+
+        Args:
+            fetch_server_time: Called with no arguments and returns the server time as epoch seconds
+            refresh_interval: Seconds between background refreshes
+            samples: Number of round trips taken per refresh
+            history: Number of refreshes used to estimate drift
+            clock: The local clock, returns epoch seconds
+        """
+        self.fetch_server_time = fetch_server_time
+        self.refresh_interval = refresh_interval
+        self.samples = samples
+        self.clock = clock
+
+        # (local time, offset, round trip) for each refresh
+        self.__history = collections.deque(maxlen=history)
+        self.__drift = 0
+        self.__lock = threading.Lock()
+        self.__start_lock = threading.Lock()
+        self.__wake = threading.Event()
+        self.__thread = None
+
+    def __sample(self) -> (float, float, float):
+        sent = self.clock()
+        server_time = self.fetch_server_time()
+        received = self.clock()
+        midpoint = (sent + received) / 2
+        return midpoint, server_time - midpoint, received - sent
+
+    def refresh(self):
+        """
+        Measure the offset now. This is also what should be called when the server rejects a timestamp.
+        """
+        best = None
+        for _ in range(self.samples):
+            try:
+                sample = self.__sample()
+            except Exception:
+                traceback.print_exc()
+                continue
+            if best is None or sample[2] < best[2]:
+                best = sample
+        if best is None:
+            raise ConnectionError("Unable to read the server time.")
+
+        with self.__lock:
+            self.__history.append(best)
+            first_time, first_offset, _ = self.__history[0]
+            # Readings close together are dominated by round trip noise rather than drift
+            if best[0] - first_time >= 60:
+                self.__drift = (best[1] - first_offset) / (best[0] - first_time)
+
+    def __refresh_loop(self):
+        while True:
+            self.__wake.wait(self.refresh_interval)
+            self.__wake.clear()
+            try:
+                self.refresh()
+            except Exception:
+                traceback.print_exc()
+
+    def __ensure_started(self):
+        if self.__thread is not None:
+            return
+        with self.__start_lock:
+            if self.__thread is not None:
+                return
+            # The first reading happens on the calling thread so the first timestamp is already corrected
+            self.refresh()
+            self.__thread = threading.Thread(target=self.__refresh_loop, name='synapsis-clock-offset', daemon=True)
+            self.__thread.start()
+
+    def request_refresh(self):
+        """
+        Ask the background thread to refresh as soon as possible
+        """
+        self.__wake.set()
+
+    def get_offset(self) -> float:
+        """
+        Get the number of seconds to add to the local clock to get the server time right now
+        """
+        self.__ensure_started()
+        now = self.clock()
+        with self.__lock:
+            last_time, last_offset, _ = self.__history[-1]
+            return last_offset + self.__drift * (now - last_time)
+
+    def get_drift(self) -> float:
+        """
+        Get the estimated drift in seconds of offset per second
+        """
+        return self.__drift
+
+    def time(self) -> float:
+        """
+        Get the estimated server time as epoch seconds
+        """
+        offset = self.get_offset()
+        return self.clock() + offset
+
+
+_clocks = {}
+_clocks_lock = threading.Lock()
+
+
+def get_clock(name: str, fetch_server_time) -> ClockOffset:
+    """
+    Get the clock shared by every client of this exchange. The fetch function is only used when the clock is created.
+    """
+    with _clocks_lock:
+        if name not in _clocks:
+            _clocks[name] = ClockOffset(fetch_server_time)
+        return _clocks[name]
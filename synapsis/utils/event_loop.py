@@ -0,0 +1,79 @@
+"""
+    Shared asyncio event loop that runs on a single background thread.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import traceback
+
+__loop = None
+__thread = None
+__lock = threading.Lock()
+
+
+def __run_loop(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the process-wide event loop, starting its daemon thread on first use. Every asyncio websocket and async
+    interface in the package is scheduled on this single loop.
+    """
+    global __loop, __thread
+    with __lock:
+        if __loop is None or __loop.is_closed():
+            __loop = asyncio.new_event_loop()
+            __thread = threading.Thread(target=__run_loop, args=(__loop,), name='synapsis-event-loop', daemon=True)
+            __thread.start()
+        return __loop
+
+
+def in_event_loop() -> bool:
+    """
+    Check if the caller is already running on the shared loop thread
+    """
+    return __thread is not None and threading.current_thread() is __thread
+
+
+def __report_exception(future: concurrent.futures.Future):
+    if not future.cancelled() and future.exception() is not None:
+        exception = future.exception()
+        traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+
+def submit(coroutine) -> concurrent.futures.Future:
+    """
+    Schedule a coroutine on the shared loop without waiting for it. Exceptions are printed instead of being lost.
+    """
+    future = asyncio.run_coroutine_threadsafe(coroutine, get_event_loop())
+    future.add_done_callback(__report_exception)
+    return future
+
+
+def run_coroutine(coroutine, timeout: float = None):
+    """
+    Block the calling thread until a coroutine finishes on the shared loop and return its result.
+
+    Args:
+        coroutine: The coroutine object to run
+        timeout: Optional number of seconds to wait before raising concurrent.futures.TimeoutError
+    """
+    if in_event_loop():
+        raise RuntimeError("run_coroutine cannot block the shared event loop thread, await the coroutine instead.")
+    return asyncio.run_coroutine_threadsafe(coroutine, get_event_loop()).result(timeout)
@@ -31,3 +31,24 @@ class AuthError(Exception):
 
 class BacktestingException(Exception):
     pass
+
+
+class BatchOrderException(InvalidOrder, APIException):
+    def __init__(self, message: str, results: list):
+        """
+        Raised by batch_order once every order was attempted and at least one of them failed. It is also an
+        InvalidOrder and an APIException so callers that catch either keep working.
+
+        Args:
+            message: The reasons the orders failed
+            results: The placed order, or the exception it failed with, for each order in the same order
+        """
+        super().__init__(message)
+        self.results = results
+
+    @property
+    def placed(self) -> list:
+        """
+        The orders that were placed and are live on the exchange
+        """
+        return [result for result in self.results if not isinstance(result, Exception)]
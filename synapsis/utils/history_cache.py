@@ -0,0 +1,151 @@
+"""
+    Append only cache of closed candles for live history requests.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import os
+import threading
+
+import pandas as pd
+
+from synapsis.utils.utils import load_user_preferences
+
+
+class HistoryCache:
+    def __init__(self, max_bars: int = None, persist: bool = None, location: str = None):
+        """
+        Keep the closed candles of each (exchange, symbol, resolution) in memory so repeated history calls only
+        download the candles that closed since the last call. Any argument left as None is read from the
+        history_cache setting.
+
+        Args:
+            max_bars: Number of candles kept per symbol and resolution, the oldest are dropped first
+            persist: Save each series to a csv in location so it survives restarts
+            location: Folder the csv files are written to
+        """
+        if None in (max_bars, persist, location):
+            settings = load_user_preferences()['settings']['history_cache']
+            max_bars = settings['max_bars'] if max_bars is None else max_bars
+            persist = settings['persist'] if persist is None else persist
+            location = settings['location'] if location is None else location
+
+        self.max_bars = max_bars
+        self.persist = persist
+        self.location = location
+
+        # key -> [candles, earliest time requested]
+        self.__series = {}
+        self.__locks = {}
+        self.__locks_lock = threading.Lock()
+
+    def __lock(self, key: tuple) -> threading.Lock:
+        with self.__locks_lock:
+            if key not in self.__locks:
+                self.__locks[key] = threading.Lock()
+            return self.__locks[key]
+
+    def __path(self, key: tuple) -> str:
+        return os.path.join(self.location, '{},{},{}.csv'.format(*key))
+
+    def __load(self, key: tuple):
+        if key in self.__series or not self.persist or not os.path.exists(self.__path(key)):
+            return
+        candles = pd.read_csv(self.__path(key))
+        if len(candles):
+            self.__series[key] = [candles, candles['time'].iloc[0]]
+
+    def __save(self, key: tuple):
+        if not self.persist:
+            return
+        os.makedirs(self.location, exist_ok=True)
+        self.__series[key][0].to_csv(self.__path(key), index=False)
+
+    def history(self, key: tuple, epoch_start: float, epoch_stop: float, point_count: int, fetch) -> pd.DataFrame:
+        """
+        Get the last point_count candles up to and including epoch_stop, downloading only what isn't cached
+
+        Args:
+            key: (exchange, symbol, resolution in seconds)
+            epoch_start: Open time of the first candle wanted
+            epoch_stop: Open time of the most recent closed candle
+            point_count: Number of candles to return
+            fetch: Called as fetch(epoch_start, epoch_stop) and returns a candle dataframe for that range
+        """
+        if point_count > self.max_bars:
+            # The series can't hold this many candles, caching it would only trim the start and download it again
+            candles = fetch(epoch_start, epoch_stop)
+            if len(candles) == 0:
+                return candles
+            return self.__window(self.__closed(candles, epoch_stop), epoch_start, epoch_stop, point_count)
+
+        with self.__lock(key):
+            self.__load(key)
+            series = self.__series.get(key)
+
+            if series is None or epoch_start < series[1]:
+                # Nothing usable is cached, download the whole window once
+                candles = fetch(epoch_start, epoch_stop)
+                if len(candles) == 0:
+                    return candles
+                series = [candles, epoch_start]
+            elif series[0]['time'].iloc[-1] < epoch_stop:
+                # Overlap by one candle because some exchanges treat the start as exclusive
+                newest = series[0]['time'].iloc[-1]
+                candles = pd.concat([series[0], fetch(newest, epoch_stop)])
+            else:
+                candles = None
+
+            if candles is not None:
+                candles = self.__closed(candles, epoch_stop)
+                if len(candles) > self.max_bars:
+                    candles = candles.iloc[-self.max_bars:].reset_index(drop=True)
+                    series[1] = candles['time'].iloc[0]
+                if len(candles) == 0:
+                    return candles
+                series[0] = candles
+                self.__series[key] = series
+                self.__save(key)
+
+            return self.__window(series[0], epoch_start, epoch_stop, point_count)
+
+    @staticmethod
+    def __closed(candles: pd.DataFrame, epoch_stop: float) -> pd.DataFrame:
+        # The newest download wins where candles overlap, candles that haven't closed are never kept
+        candles = candles[candles['time'] <= epoch_stop]
+        return candles.drop_duplicates('time', keep='last').sort_values(by=['time'], ignore_index=True)
+
+    @staticmethod
+    def __window(candles: pd.DataFrame, epoch_start: float, epoch_stop: float, point_count: int) -> pd.DataFrame:
+        window = candles[(candles['time'] >= epoch_start) & (candles['time'] <= epoch_stop)]
+        return window.iloc[-point_count:].reset_index(drop=True)
+
+    def clear(self):
+        with self.__locks_lock:
+            self.__series = {}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_history_cache() -> HistoryCache:
+    """
+    Get the cache shared by every interface in this process
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HistoryCache()
+        return _cache
@@ -0,0 +1,163 @@
+"""
+    Concurrent, rate limited download of windowed candle history.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from synapsis.utils.utils import load_user_preferences, update_progress
+
+# Public market data limits as (tokens per second, burst). A window costs its request weight in tokens.
+#  coinbase_pro: 10 public requests per second, bursts up to 15
+#  binance: 1200 request weight per minute
+#  kucoin: public weight of 2000 per 30 seconds, a kline request weighs 3
+#  okx: 20 history candle requests per 2 seconds
+rate_limits = {
+    'coinbase_pro': (10, 15),
+    'binance': (20, 40),
+    'kucoin': (66, 200),
+    'okx': (10, 20)
+}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Thread safe token bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens that can be saved up for a burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.__tokens = capacity
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block until the requested number of tokens is available and take them
+        """
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.capacity, self.__tokens + (now - self.__last) * self.rate)
+                self.__last = now
+                if self.__tokens >= tokens:
+                    self.__tokens -= tokens
+                    return
+                wait = (tokens - self.__tokens) / self.rate
+            time.sleep(wait)
+
+
+__buckets = {}
+__buckets_lock = threading.Lock()
+
+
+def get_bucket(exchange: str) -> TokenBucket:
+    """
+    Get the token bucket shared by every download from this exchange
+    """
+    with __buckets_lock:
+        if exchange not in __buckets:
+            rate, capacity = rate_limits.get(exchange, (5, 5))
+            __buckets[exchange] = TokenBucket(rate, capacity)
+        return __buckets[exchange]
+
+
+def split_windows(epoch_start: int, epoch_stop: int, resolution: int, limit: int) -> list:
+    """
+    Split a time range into (open, close) windows that each hold at most limit candles
+    """
+    step = limit * resolution
+    windows = []
+    window_open = epoch_start
+    while epoch_stop - window_open > step:
+        windows.append((window_open, window_open + step))
+        window_open += step
+    windows.append((window_open, epoch_stop))
+    return windows
+
+
+def download_windows(fetch, windows: list, exchange: str, weight: float = 1, key=lambda row: row[0],
+                     max_workers: int = None, max_retries: int = None, show_progress: bool = True,
+                     settings: dict = None) -> list:
+    """
+    Fetch every window concurrently under the exchange rate limit, then merge the rows in window order with
+    duplicates removed
+
+    Args:
+        fetch: Called as fetch(window_open, window_close) and returns a list of rows. Raising retries the window
+        windows: List of (open, close) tuples
+        exchange: Exchange name used to look up the shared rate limit
+        weight: Number of tokens one request costs
+        key: Identifies duplicate rows, where windows overlap the first row seen is kept
+        max_workers: Number of concurrent requests. Defaults to the history_download setting
+        max_retries: Number of times a single window is retried. Defaults to the history_download setting
+        show_progress: Print a progress bar as windows complete
+        settings: The history_download settings of the caller. Read from the preferences if not given
+
+    Returns:
+        The merged list of rows
+    """
+    if max_workers is None or max_retries is None:
+        if settings is None:
+            settings = load_user_preferences()['settings']['history_download']
+        if max_workers is None:
+            max_workers = settings['max_workers']
+        if max_retries is None:
+            max_retries = settings['max_retries']
+    bucket = get_bucket(exchange)
+
+    def fetch_window(window):
+        attempt = 0
+        while True:
+            bucket.acquire(weight)
+            try:
+                return fetch(*window)
+            except Exception:
+                if attempt >= max_retries:
+                    raise
+                # Jittered exponential backoff so retried windows don't all land at once
+                time.sleep(random.uniform(.5, 1) * 2 ** attempt)
+                attempt += 1
+
+    # A single window, such as the latest bar, doesn't need a pool
+    if len(windows) == 1:
+        results = [fetch_window(windows[0])]
+    else:
+        results = [None] * len(windows)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+            futures = {executor.submit(fetch_window, window): index for index, window in enumerate(windows)}
+            completed = 0
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                completed += 1
+                if show_progress:
+                    update_progress(completed / len(windows))
+
+    seen = set()
+    merged = []
+    for rows in results:
+        for row in rows:
+            row_key = key(row)
+            if row_key not in seen:
+                seen.add(row_key)
+                merged.append(row)
+    return merged
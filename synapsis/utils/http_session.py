@@ -0,0 +1,179 @@
+"""
+    Pooled keep-alive HTTP sessions with retry and backoff for the exchange clients.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import random
+import threading
+import time
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from synapsis.utils.utils import load_user_preferences
+
+retry_statuses = (429, 500, 502, 503, 504)
+
+# Only these can be sent twice without risking a duplicate order
+idempotent_methods = ('GET', 'HEAD', 'OPTIONS', 'DELETE')
+
+
+class HTTPSession(requests.Session):
+    def __init__(self, name: str, pool_size: int = None, connect_timeout: float = None, read_timeout: float = None,
+                 max_retries: int = None, backoff_factor: float = None):
+        """
+        A requests session that keeps connections alive in a pool and retries throttled or failed requests with
+        jittered exponential backoff. Any argument left as None is read from the http setting.
+
+        A 429 is retried for every method because the exchange rejected the request before acting on it. 5xx
+        responses and dropped connections are only retried for idempotent methods so an order is never placed twice.
+
+        Args:
+            name: Name of the exchange the session talks to, used to group metrics
+            pool_size: Number of connections kept alive per host
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for a response
+            max_retries: Number of times a single request is retried
+            backoff_factor: Base delay in seconds, doubled on every retry
+        """
+        super().__init__()
+        if None in (pool_size, connect_timeout, read_timeout, max_retries, backoff_factor):
+            settings = load_user_preferences()['settings']['http']
+            pool_size = settings['pool_size'] if pool_size is None else pool_size
+            connect_timeout = settings['connect_timeout'] if connect_timeout is None else connect_timeout
+            read_timeout = settings['read_timeout'] if read_timeout is None else read_timeout
+            max_retries = settings['max_retries'] if max_retries is None else max_retries
+            backoff_factor = settings['backoff_factor'] if backoff_factor is None else backoff_factor
+
+        self.name = name
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__retries = 0
+        self.__latency = 0
+
+        _sessions.add(self)
+
+    def __backoff(self, attempt: int, response: requests.Response = None) -> float:
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            return float(response.headers['Retry-After'])
+        return self.backoff_factor * 2 ** attempt * random.uniform(.5, 1.5)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        idempotent = request.method in idempotent_methods
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A failed connect never reached the exchange so it is always safe to resend
+                if attempt >= self.max_retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                self.__record(start, retry=True)
+                time.sleep(self.__backoff(attempt))
+                attempt += 1
+                continue
+
+            retry = attempt < self.max_retries and response.status_code in retry_statuses and \
+                (idempotent or response.status_code == 429)
+            self.__record(start, retry=retry)
+            if not retry:
+                return response
+
+            delay = self.__backoff(attempt, response)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def __record(self, start: float, retry: bool):
+        with self.__lock:
+            self.__requests += 1
+            self.__latency += time.perf_counter() - start
+            if retry:
+                self.__retries += 1
+
+    def __connections_opened(self) -> int:
+        opened = 0
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+        return opened
+
+    def get_metrics(self) -> dict:
+        """
+        Get request counts, connection reuse and average latency for this session
+        """
+        with self.__lock:
+            sent = self.__requests
+            retries = self.__retries
+            latency = self.__latency
+        opened = self.__connections_opened()
+        return {
+            'requests': sent,
+            'retries': retries,
+            'connections_opened': opened,
+            'connections_reused': max(0, sent - opened),
+            'average_latency': latency / sent if sent else 0
+        }
+
+
+_sessions = weakref.WeakSet()
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def get_session(name: str) -> HTTPSession:
+    """
+    Get the session shared by every client of this exchange that doesn't need its own headers
+    """
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = HTTPSession(name)
+        return _shared[name]
+
+
+def get_http_metrics() -> dict:
+    """
+    Get the combined metrics of every live session, grouped by exchange name
+    """
+    metrics = {}
+    for session in list(_sessions):
+        session_metrics = session.get_metrics()
+        if session.name not in metrics:
+            metrics[session.name] = session_metrics
+            continue
+        combined = metrics[session.name]
+        total = combined['requests'] + session_metrics['requests']
+        if total:
+            combined['average_latency'] = (combined['average_latency'] * combined['requests'] +
+                                           session_metrics['average_latency'] * session_metrics['requests']) / total
+        for key in ('requests', 'retries', 'connections_opened', 'connections_reused'):
+            combined[key] += session_metrics[key]
+    return metrics
@@ -0,0 +1,213 @@
+"""
+    Process wide cache for quotes and exchange metadata shared by every strategy.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+from synapsis.utils.utils import load_user_preferences, to_exchange_symbol
+
+
+class MarketDataHub:
+    def __init__(self, enabled: bool = None, price_ttl: float = None, metadata_ttl: float = None,
+                 feed_max_age: float = None):
+        """
+        Serve prices and products to every interface in the process. Values are kept for a short time, identical
+        requests made while one is already in flight wait for that request instead of sending their own, and prices
+        come from a running ticker when there is one. Any argument left as None is read from the market_data setting.
+
+        Args:
+            enabled: Pass every request straight to the exchange when False
+            price_ttl: Seconds a downloaded price is reused
+            metadata_ttl: Seconds a products response is reused
+            feed_max_age: Seconds a ticker price is trusted after it arrived
+        """
+        if None in (enabled, price_ttl, metadata_ttl, feed_max_age):
+            settings = load_user_preferences()['settings']['market_data']
+            enabled = settings['enabled'] if enabled is None else enabled
+            price_ttl = settings['price_ttl'] if price_ttl is None else price_ttl
+            metadata_ttl = settings['metadata_ttl'] if metadata_ttl is None else metadata_ttl
+            feed_max_age = settings['feed_max_age'] if feed_max_age is None else feed_max_age
+
+        self.enabled = enabled
+        self.price_ttl = price_ttl
+        self.metadata_ttl = metadata_ttl
+        self.feed_max_age = feed_max_age
+
+        self.__lock = threading.Lock()
+        # key -> (value, monotonic time it was stored)
+        self.__cache = {}
+        # key -> future of the request being made
+        self.__in_flight = {}
+        # (exchange, exchange symbol) -> (price, monotonic time it arrived)
+        self.__feeds = {}
+        self.__counters = {'hits': 0, 'misses': 0, 'coalesced': 0, 'feed_hits': 0}
+
+    @staticmethod
+    def __feed_key(exchange: str, symbol: str) -> tuple:
+        # Tickers are stored under the exchange's own symbol format
+        return exchange, to_exchange_symbol(symbol, exchange).upper()
+
+    def record_tick(self, exchange: str, symbol: str, tick: dict):
+        """
+        Remember the latest price of a ticker. Used as a ticker callback so symbol may be in either format.
+        """
+        try:
+            price = float(tick['price'])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.__feeds[self.__feed_key(exchange, symbol)] = (price, time.monotonic())
+
+    def __from_feed(self, exchange: str, symbol: str):
+        feed = self.__feeds.get(self.__feed_key(exchange, symbol))
+        if feed is None or time.monotonic() - feed[1] > self.feed_max_age:
+            return None
+        with self.__lock:
+            self.__counters['feed_hits'] += 1
+        return feed[0]
+
+    def get(self, key: tuple, ttl: float, fetch):
+        """
+        Get a cached value or download it, joining a download of the same key that is already running.
+
+        Args:
+            key: Anything identifying the request, such as ('price', exchange, symbol)
+            ttl: Seconds a stored value is reused
+            fetch: Called with no arguments to download the value
+        """
+        if not self.enabled:
+            return fetch()
+
+        with self.__lock:
+            cached = self.__cache.get(key)
+            if cached is not None and time.monotonic() - cached[1] <= ttl:
+                self.__counters['hits'] += 1
+                return cached[0]
+
+            future = self.__in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self.__in_flight[key] = future
+                self.__counters['misses'] += 1
+            else:
+                self.__counters['coalesced'] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self.__lock:
+                del self.__in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.__lock:
+            self.__cache[key] = (value, time.monotonic())
+            del self.__in_flight[key]
+        future.set_result(value)
+        return value
+
+    def price(self, exchange: str, symbol: str, fetch) -> float:
+        """
+        Args:
+            exchange: Exchange type the price is for
+            symbol: Symbol to price
+            fetch: Called with no arguments to download the price over REST
+        """
+        if self.enabled:
+            price = self.__from_feed(exchange, symbol)
+            if price is not None:
+                return price
+        return self.get(('price', exchange, symbol), self.price_ttl, fetch)
+
+    def prices(self, exchange: str, symbols: list, fetch) -> dict:
+        """
+        Price many symbols, downloading only the ones without a ticker or cached price in a single request
+
+        Args:
+            exchange: Exchange type the prices are for
+            symbols: Symbols to price
+            fetch: Called with the list of missing symbols and returns a symbol -> price dictionary
+        """
+        if not self.enabled:
+            return fetch(symbols)
+
+        prices = {}
+        missing = []
+        now = time.monotonic()
+        for symbol in symbols:
+            price = self.__from_feed(exchange, symbol)
+            if price is None:
+                with self.__lock:
+                    cached = self.__cache.get(('price', exchange, symbol))
+                    if cached is not None and now - cached[1] <= self.price_ttl:
+                        self.__counters['hits'] += 1
+                        price = cached[0]
+            if price is None:
+                missing.append(symbol)
+            else:
+                prices[symbol] = price
+
+        if missing:
+            downloaded = fetch(missing)
+            now = time.monotonic()
+            with self.__lock:
+                self.__counters['misses'] += len(missing)
+                for symbol, price in downloaded.items():
+                    self.__cache[('price', exchange, symbol)] = (price, now)
+            prices.update(downloaded)
+        return {symbol: prices[symbol] for symbol in symbols if symbol in prices}
+
+    def products(self, exchange: str, fetch):
+        """
+        The response is shared between callers so it shouldn't be modified.
+
+        Args:
+            exchange: Exchange type the products are for
+            fetch: Called with no arguments to download the products
+        """
+        return self.get(('products', exchange), self.metadata_ttl, fetch)
+
+    def stats(self) -> dict:
+        """
+        Counts of requests served from the cache (hits), from a ticker (feed_hits), downloaded (misses) and joined
+        to a download already in flight (coalesced)
+        """
+        with self.__lock:
+            return dict(self.__counters)
+
+    def clear(self):
+        with self.__lock:
+            self.__cache = {}
+            self.__feeds = {}
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_market_data_hub() -> MarketDataHub:
+    """
+    Get the hub shared by every interface in this process
+    """
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = MarketDataHub()
+        return _hub
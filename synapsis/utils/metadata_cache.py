@@ -0,0 +1,179 @@
+"""
+    Disk backed cache of exchange metadata so backtests can start without the network.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import copy
+import json
+import os
+import threading
+import time
+
+from synapsis.utils.utils import info_print, load_user_preferences
+
+# Exchanges that charge fees per symbol, the rest are saved once for the whole exchange
+per_symbol_fees = ('okx', 'binance')
+
+
+class MetadataCache:
+    def __init__(self, enabled: bool = None, location: str = None, ttl: dict = None):
+        """
+        Keep products, fees and order filters in a json file per exchange. Entries are downloaded again once they
+        are older than their ttl, and a stale entry is still used if the exchange can't be reached. Any argument left
+        as None is read from the metadata_cache setting.
+
+        Args:
+            enabled: Pass every request straight to the exchange when False
+            location: Folder the json files are written to
+            ttl: Seconds each kind of metadata is reused, such as {'products': 86400, 'fees': 86400, ...}
+        """
+        if None in (enabled, location, ttl):
+            settings = load_user_preferences()['settings']['metadata_cache']
+            enabled = settings['enabled'] if enabled is None else enabled
+            location = settings['location'] if location is None else location
+            ttl = settings['ttl'] if ttl is None else ttl
+
+        self.enabled = enabled
+        self.location = location
+        self.ttl = ttl
+
+        self.__lock = threading.RLock()
+        # exchange -> kind -> item -> [value, epoch it was downloaded]
+        self.__exchanges = {}
+        # exchange -> symbol -> product
+        self.__product_index = {}
+
+    def __path(self, exchange: str) -> str:
+        return os.path.join(self.location, f'{exchange}.json')
+
+    def __load(self, exchange: str) -> dict:
+        if exchange not in self.__exchanges:
+            entries = {}
+            try:
+                with open(self.__path(exchange)) as file:
+                    entries = json.load(file)
+            except (OSError, ValueError):
+                pass
+            self.__exchanges[exchange] = entries
+        return self.__exchanges[exchange]
+
+    def __save(self, exchange: str):
+        os.makedirs(self.location, exist_ok=True)
+        # Write beside the file and swap it in so an interrupted write can't corrupt the cache
+        temporary = self.__path(exchange) + '.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(self.__exchanges[exchange], file, default=str)
+        os.replace(temporary, self.__path(exchange))
+
+    def get(self, exchange: str, kind: str, item: str, fetch, refresh: bool = False):
+        """
+        Get a copy of a piece of metadata, downloading it if it isn't saved or has expired
+
+        Args:
+            exchange: Exchange type the metadata is for
+            kind: One of products, fees or order_filter
+            item: Symbol the metadata is for, or '' if it covers the whole exchange
+            fetch: Called with no arguments to download the value
+            refresh: Download even if the saved value hasn't expired
+        """
+        if not self.enabled:
+            return fetch()
+
+        with self.__lock:
+            entry = self.__load(exchange).get(kind, {}).get(item)
+            if entry is not None and not refresh and time.time() - entry[1] <= self.ttl[kind]:
+                return copy.deepcopy(entry[0])
+
+            try:
+                value = fetch()
+            except Exception:
+                if entry is None:
+                    raise
+                info_print(f"Could not reach {exchange}, using {kind} saved at {time.ctime(entry[1])}")
+                return copy.deepcopy(entry[0])
+
+            self.__exchanges[exchange].setdefault(kind, {})[item] = [value, time.time()]
+            if kind == 'products':
+                self.__product_index.pop(exchange, None)
+            self.__save(exchange)
+            return copy.deepcopy(value)
+
+    def product(self, exchange: str, symbol: str, fetch):
+        """
+        Look up a single product by symbol without scanning the product list. Returns None if it doesn't exist.
+
+        Args:
+            exchange: Exchange type the product is on
+            symbol: Symbol of the product
+            fetch: Called with no arguments to download every product
+        """
+        with self.__lock:
+            if exchange not in self.__product_index:
+                products = self.get(exchange, 'products', '', fetch)
+                self.__product_index[exchange] = {product['symbol']: product for product in products
+                                                  if isinstance(product, dict) and 'symbol' in product}
+            return self.__product_index[exchange].get(symbol)
+
+    def warm(self, exchange: str, interface, symbols: list):
+        """
+        Download products and the fees and order filter of each symbol so later backtests don't need the network
+
+        Args:
+            exchange: Exchange type the metadata is saved under
+            interface: Interface to download from
+            symbols: Symbols to save fees and order filters for
+        """
+        self.get(exchange, 'products', '', interface.get_products, refresh=True)
+        if exchange not in per_symbol_fees and symbols:
+            self.get(exchange, 'fees', '', lambda: interface.get_fees(symbols[0]), refresh=True)
+        for symbol in symbols:
+            if exchange in per_symbol_fees:
+                self.get(exchange, 'fees', symbol, lambda: interface.get_fees(symbol), refresh=True)
+            self.get(exchange, 'order_filter', symbol, lambda: interface.get_order_filter(symbol), refresh=True)
+
+    def clear(self, exchange: str = None):
+        """
+        Forget saved metadata, deleting the files too
+
+        Args:
+            exchange: Only clear this exchange
+        """
+        with self.__lock:
+            if exchange is not None:
+                exchanges = [exchange]
+            elif os.path.isdir(self.location):
+                exchanges = [name[:-len('.json')] for name in os.listdir(self.location) if name.endswith('.json')]
+            else:
+                exchanges = []
+            for name in exchanges:
+                self.__exchanges.pop(name, None)
+                self.__product_index.pop(name, None)
+                if os.path.exists(self.__path(name)):
+                    os.remove(self.__path(name))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """
+    Get the cache shared by every interface in this process
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
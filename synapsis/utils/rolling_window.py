@@ -0,0 +1,120 @@
+"""
+    Fixed size ring buffer of bars that indicators can read without copying.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+ohlcv = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+
+class RollingWindow:
+    def __init__(self, capacity: int, columns: tuple = ohlcv):
+        """
+        Keep the last capacity values of each column. Every value is written twice, capacity apart, so the most
+        recent values are always one contiguous slice of the buffer and reading a column doesn't copy anything.
+
+        Example:
+            state.variables['history'] = RollingWindow(150, columns=('close',))
+            state.variables['history'].append(price)
+            rsi = synapsis.indicators.rsi(state.variables['history'].close)
+
+        Args:
+            capacity: Number of values kept per column
+            columns: Names of the columns, time is stored as int64 and every other column as float64
+        """
+        if capacity < 1:
+            raise ValueError("The capacity of a rolling window must be at least 1.")
+        self.capacity = capacity
+        self.columns = tuple(columns)
+        self.__buffers = {column: np.zeros(2 * capacity, dtype=np.int64 if column == 'time' else np.float64)
+                          for column in self.columns}
+        # Index the next value is written to, always below capacity
+        self.__head = 0
+        self.__length = 0
+
+    @classmethod
+    def from_history(cls, history: Union[pd.DataFrame, dict], capacity: int = None) -> 'RollingWindow':
+        """
+        Create a window filled with a history response, such as history(symbol, to=150, return_as='array')
+
+        Args:
+            history: DataFrame or dictionary of columns
+            capacity: Number of values kept per column. Defaults to the length of the history
+        """
+        columns = tuple(column for column in ohlcv if column in history) or tuple(history.keys())
+        length = len(history[columns[0]])
+        window = cls(capacity or max(length, 1), columns)
+        window.extend(history)
+        return window
+
+    def append(self, bar: Union[dict, float]):
+        """
+        Add the newest bar. A bar at or before the newest time is ignored, so history can overlap with live bars.
+
+        Args:
+            bar: Dictionary with a value for each column, or a single value if there is only one column
+        """
+        if not isinstance(bar, dict):
+            if len(self.columns) != 1:
+                raise ValueError("Bars must be dictionaries when the window has more than one column.")
+            bar = {self.columns[0]: bar}
+        elif 'time' in self.__buffers and self.__length and bar['time'] <= self.__newest_time():
+            return
+
+        head = self.__head
+        for column, buffer in self.__buffers.items():
+            buffer[head] = buffer[head + self.capacity] = bar[column]
+        self.__head = (head + 1) % self.capacity
+        self.__length = min(self.__length + 1, self.capacity)
+
+    def __newest_time(self) -> int:
+        return self.__buffers['time'][self.__head - 1 + self.capacity]
+
+    def extend(self, history: Union[pd.DataFrame, dict]):
+        """
+        Add many bars from columns of equal length, oldest first
+        """
+        arrays = {column: np.asarray(history[column])[-self.capacity:] for column in self.columns}
+        for i in range(len(arrays[self.columns[0]])):
+            self.append({column: values[i] for column, values in arrays.items()})
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """
+        Read only view of a column, oldest first. The view changes as bars are appended, copy it to keep the values.
+        """
+        start = self.__head + self.capacity - self.__length
+        view = self.__buffers[column][start:start + self.__length]
+        view.flags.writeable = False
+        return view
+
+    def __getattr__(self, column: str) -> np.ndarray:
+        # Attributes that aren't set yet, such as while unpickling, must not be looked up as columns
+        if column.startswith('_') or column not in self.__dict__.get('columns', ()):
+            raise AttributeError(column)
+        return self[column]
+
+    def __len__(self) -> int:
+        return self.__length
+
+    @property
+    def full(self) -> bool:
+        return self.__length == self.capacity
+
+    def __repr__(self):
+        return f"RollingWindow(capacity={self.capacity}, length={self.__length}, columns={self.columns})"
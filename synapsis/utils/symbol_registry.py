@@ -0,0 +1,71 @@
+"""
+    Dictionary backed translation between synapsis and exchange symbols.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+class SymbolRegistry:
+    def __init__(self):
+        """
+        Translate symbols in both directions with a dictionary lookup per exchange. Pairs registered from product
+        metadata are exact, anything else is remembered the first time it's parsed so it's only parsed once.
+        """
+        # exchange -> exchange symbol -> synapsis symbol
+        self.__to_synapsis = {}
+        # exchange -> synapsis symbol -> exchange symbol
+        self.__to_exchange = {}
+
+    def register(self, exchange: str, pairs: dict):
+        """
+        Add exact translations, usually from the products of an exchange
+
+        Args:
+            exchange: Exchange the symbols are on
+            pairs: Synapsis symbol -> exchange symbol, such as {'BTC-USDT': 'BTCUSDT'}
+        """
+        to_synapsis = self.__to_synapsis.setdefault(exchange, {})
+        to_exchange = self.__to_exchange.setdefault(exchange, {})
+        for synapsis_symbol, exchange_symbol in pairs.items():
+            to_synapsis[exchange_symbol] = synapsis_symbol
+            to_exchange[synapsis_symbol] = exchange_symbol
+
+    def remember_synapsis(self, exchange: str, exchange_symbol: str, synapsis_symbol: str):
+        """
+        Remember a parsed translation one way, some exchanges like alpaca can't be translated back
+        """
+        self.__to_synapsis.setdefault(exchange, {})[exchange_symbol] = synapsis_symbol
+
+    def remember_exchange(self, exchange: str, synapsis_symbol: str, exchange_symbol: str):
+        self.__to_exchange.setdefault(exchange, {})[synapsis_symbol] = exchange_symbol
+
+    def to_synapsis(self, exchange: str, exchange_symbol: str):
+        """
+        Returns None if the symbol hasn't been seen
+        """
+        return self.__to_synapsis.get(exchange, {}).get(exchange_symbol)
+
+    def to_exchange(self, exchange: str, synapsis_symbol: str):
+        """
+        Returns None if the symbol hasn't been seen
+        """
+        return self.__to_exchange.get(exchange, {}).get(synapsis_symbol)
+
+    def clear(self):
+        self.__to_synapsis = {}
+        self.__to_exchange = {}
+
+
+symbol_registry = SymbolRegistry()
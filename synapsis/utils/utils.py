@@ -28,12 +28,68 @@ from typing import Union
 import numpy as np
 import pandas as pd
 
+from synapsis.utils.symbol_registry import symbol_registry
+
 # Copy of settings to compare defaults vs overrides
 default_general_settings = {
     "settings": {
         "use_sandbox_websockets": False,
         "websocket_buffer_size": 10000,
+        "websocket_transport": "thread",
+        "websocket_json": "auto",
+        "websocket_health": {
+            "stale_after": 30,
+            "check_interval": 5
+        },
+        "websocket_dispatch": {
+            "enabled": True,
+            "queue_size": 10000,
+            "overflow_policy": "block"
+        },
+        "history_download": {
+            "max_workers": 8,
+            "max_retries": 3
+        },
+        "http": {
+            "pool_size": 10,
+            "connect_timeout": 3.05,
+            "read_timeout": 30,
+            "max_retries": 3,
+            "backoff_factor": 0.5
+        },
+        "user_stream": {
+            "enabled": False,
+            "reconnect_delay": 5,
+            "closed_order_history": 1000
+        },
+        "history_cache": {
+            "enabled": True,
+            "max_bars": 5000,
+            "persist": False,
+            "location": "./history_cache"
+        },
+        "live_bars": {
+            "enabled": True,
+            "grace": 0.5,
+            "max_silence": 60
+        },
+        "market_data": {
+            "enabled": True,
+            "price_ttl": 1,
+            "metadata_ttl": 300,
+            "feed_max_age": 30
+        },
+        "metadata_cache": {
+            "enabled": True,
+            "location": "./metadata_cache",
+            "ttl": {
+                "products": 86400,
+                "fees": 86400,
+                "order_filter": 86400
+            }
+        },
         "test_connectivity_on_auth": True,
+        "concurrent_inits": False,
         "auto_truncate": False,
         "global_shorting": False,
         "simulate_margin": True,
@@ -76,7 +132,9 @@ default_general_settings = {
             "ftx_tld": "com"
         },
         "paper": {
-              "price_source": "api"
+              "price_source": "api",
+              "fill_source": "websocket",
+              "poll_interval": 10
         }
     }
 }
@@ -325,19 +383,37 @@ def iso8601_from_epoch(epoch) -> str:
 #     return np.polyfit(times, prices, 2, full=True)
 
 
+# Quotes tried when a binance symbol isn't in the registry, longest first so BUSD isn't read as USD
+__binance_quotes = sorted(['BNB', 'BTC', 'TRX', 'XRP', 'ETH', 'USDT', 'USD', 'BUSD', 'AUD', 'BRL', 'EUR', 'GBP', 'RUB',
+                           'TRY', 'TUSD', 'USDC', 'PAX', 'BIDR', 'DAI', 'IDRT', 'UAH', 'NGN', 'VAI', 'BVND'],
+                          key=len, reverse=True)
+
+
 def to_synapsis_symbol(symbol, exchange, quote_guess=None) -> str:
+    if quote_guess is None:
+        known = symbol_registry.to_synapsis(exchange, symbol)
+        if known is not None:
+            return known
+
+    synapsis_symbol = __parse_synapsis_symbol(symbol, exchange, quote_guess)
+    if quote_guess is None:
+        symbol_registry.remember_synapsis(exchange, symbol, synapsis_symbol)
+    return synapsis_symbol
+
+
+def __parse_synapsis_symbol(symbol, exchange, quote_guess=None) -> str:
     if exchange == "binance":
         if quote_guess is not None:
+            if __check_ending(symbol, quote_guess):
+                return symbol[:-len(quote_guess)] + "-" + quote_guess
             index = int(symbol.find(quote_guess))
             symbol = symbol[0:index]
             return symbol + "-" + quote_guess
         else:
             # Try your best to try to parse anyway
-            quotes = ['BNB', 'BTC', 'TRX', 'XRP', 'ETH', 'USDT', 'USD', 'BUSD', 'AUD', 'BRL', 'EUR', 'GBP', 'RUB',
-                      'TRY', 'TUSD', 'USDC', 'PAX', 'BIDR', 'DAI', 'IDRT', 'UAH', 'NGN', 'VAI', 'BVND']
-            for i in quotes:
+            for i in __binance_quotes:
                 if __check_ending(symbol, i):
-                    return to_synapsis_symbol(symbol, 'binance', quote_guess=i)
+                    return __parse_synapsis_symbol(symbol, 'binance', quote_guess=i)
             raise LookupError("Unable to parse binance coin id of: " + str(symbol))
 
     if exchange == "coinbase_pro":
@@ -355,6 +431,14 @@ def __check_ending(full_string, checked_ending) -> bool:
 
 
 def to_exchange_symbol(synapsis_symbol, exchange):
+    known = symbol_registry.to_exchange(exchange, synapsis_symbol)
+    if known is None:
+        known = __format_exchange_symbol(synapsis_symbol, exchange)
+        symbol_registry.remember_exchange(exchange, synapsis_symbol, known)
+    return known
+
+
+def __format_exchange_symbol(synapsis_symbol, exchange):
     if exchange == "binance":
         return synapsis_symbol.replace('-', '')
     if exchange == "alpaca":
@@ -366,6 +450,20 @@ def to_exchange_symbol(synapsis_symbol, exchange):
     return synapsis_symbol
 
 
+def to_synapsis_symbols(symbols, exchange) -> list:
+    """
+    Translate many exchange symbols at once, such as a column of a response
+    """
+    return [to_synapsis_symbol(symbol, exchange) for symbol in symbols]
+
+
+def to_exchange_symbols(synapsis_symbols, exchange) -> list:
+    """
+    Translate many synapsis symbols at once
+    """
+    return [to_exchange_symbol(symbol, exchange) for symbol in synapsis_symbols]
+
+
 def get_base_asset(symbol):
     # Gets the BTC of the BTC-USD
     return symbol.split('-')[0]
@@ -747,6 +845,19 @@ class Email:
                                receiver_email=receiver_email, password=self.__password, port=self.__port)
 
 
+def to_history_arrays(response: pd.DataFrame) -> AttributeDict:
+    """
+    Convert a history response to one contiguous numpy array per column, with time as int64 and every other column
+    as float64. The columns are read straight out of the frame's blocks, so no rows are converted and the arrays can
+    be passed to the indicators without another copy.
+    """
+    arrays = AttributeDict()
+    for column in response.columns:
+        dtype = np.int64 if column == 'time' else np.float64
+        arrays[column] = np.ascontiguousarray(response[column].to_numpy(dtype=dtype))
+    return arrays
+
+
 def count_decimals(number: float) -> int:
     """
     Count the number of decimals in a given float: 1.4335 -> 4 or 3 -> 0
@@ -0,0 +1,55 @@
+"""
+    Tests for replaying recorded orderbooks in backtests
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from synapsis.data import OrderbookReader, OrderbookRecorder
+from synapsis.data.recorder import BID, ASK
+from synapsis.exchanges.interfaces.paper_trade.orderbook_replay import OrderbookReplay, fill_price
+
+
+def test_replay_recording(tmp_path):
+    file_path = str(tmp_path / 'BTC-USD.book')
+    recorder = OrderbookRecorder(file_path, 'BTC-USD')
+    recorder.record_snapshot([(99.0, 1.0), (100.0, 2.0)], [(101.0, 1.5), (102.0, 4.0)], 10)
+    recorder.record_delta(ASK, 101.0, 0, 11)
+    recorder.record_delta(BID, 100.5, 3.0, 12)
+    recorder.record_delta(BID, 99.0, 0, 12)
+    recorder.record_snapshot([(90.0, 1.0)], [(91.0, 1.0)], 13)
+    recorder.close()
+
+    replay = OrderbookReplay('BTC-USD', OrderbookReader(file_path).data['BTC-USD'])
+    assert replay.seed_price() == 100.5
+
+    replay.step()
+    assert replay.get_mid_price() == 100.5
+    replay.step()
+    assert replay.get_book()['asks'] == [(102.0, 4.0)]
+    assert replay.next_time == 12
+    replay.step()
+    assert replay.get_book() == {'bids': [(100.0, 2.0), (100.5, 3.0)], 'asks': [(102.0, 4.0)]}
+    replay.step()
+    assert replay.get_book() == {'bids': [(90.0, 1.0)], 'asks': [(91.0, 1.0)]}
+    assert replay.next_time is None
+
+
+def test_fill_price():
+    book = {'bids': [(98.0, 1.0), (99.0, 1.0)], 'asks': [(101.0, 1.0), (103.0, 1.0)]}
+    assert fill_price(book, 'buy', .5) == 101.0
+    assert fill_price(book, 'buy', 2) == 102.0
+    assert fill_price(book, 'sell', 2) == 98.5
+    # Anything past the last level fills at that level
+    assert fill_price(book, 'buy', 4) == (101 + 103 * 3) / 4
+    assert fill_price({'bids': [], 'asks': []}, 'sell', 1) is None
@@ -0,0 +1,59 @@
+"""
+    Tests for the binary tick and orderbook recorders
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+from synapsis.data import TickReader, TickRecorder, OrderbookRecorder
+from synapsis.data.recorder import read_recording, BID, ASK
+
+
+def test_tick_recording_round_trip(tmp_path):
+    file_path = str(tmp_path / 'BTC-USD.ticks')
+    recorder = TickRecorder(file_path)
+    for i in range(1000):
+        recorder({'symbol': 'BTC-USD', 'price': 100 + i, 'time': 1600000000 + i, 'trade_id': i, 'size': .5})
+        # Write several chunks into the same file
+        if i % 300 == 0:
+            recorder.flush()
+    recorder.record_tick({'symbol': 'BTC-USD', 'price': 2000, 'time': 1600001000, 'trade_id': None})
+    recorder.close()
+
+    assert recorder.rows_written == 1001
+    assert recorder.chunks_written > 1
+
+    reader = TickReader(file_path)
+    ticks = reader.data['BTC-USD']
+    assert len(ticks) == 1001
+    assert ticks['price'].iloc[0] == 100
+    assert ticks['trade_id'].iloc[-1] == -1
+    assert np.isnan(ticks['size'].iloc[-1])
+    assert ticks['time'].is_monotonic_increasing
+
+
+def test_book_recording(tmp_path):
+    file_path = str(tmp_path / 'BTC-USD.book')
+    recorder = OrderbookRecorder(file_path, 'BTC-USD')
+    recorder.record_snapshot([(99.0, 1.0), (100.0, 2.0)], [(101.0, 1.5)], 10)
+    recorder.record_delta(ASK, 101.0, 0, 11)
+    recorder.record_delta(BID, 100.5, 3.0, 12)
+    recorder.close()
+
+    info, book = read_recording(file_path)
+    assert info == {'kind': 'book', 'symbol': 'BTC-USD'}
+    assert book['snapshot'].tolist() == [1, 1, 1, 0, 0]
+    assert book['side'].tolist() == [BID, BID, ASK, ASK, BID]
+    assert book['size'].tolist() == [1.0, 2.0, 1.5, 0.0, 3.0]
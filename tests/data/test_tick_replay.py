@@ -0,0 +1,40 @@
+"""
+    Tests for replaying recorded ticks in backtests
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pandas as pd
+
+from synapsis.exchanges.interfaces.paper_trade.tick_replay import TickReplay
+
+
+def test_step_until():
+    frame = pd.DataFrame({'time': [1.0, 2.0, 2.0, 5.0], 'price': [10.0, 11.0, 12.0, 13.0], 'size': [1, 2, 3, 4]})
+    replay = TickReplay('BTC-USD', frame)
+    assert replay.seed_price() == 10.0
+
+    ticks = []
+    assert replay.step_until(3, lambda tick_time, tick: ticks.append(tick)) == (2.0, 12.0)
+    assert ticks[1] == {'time': 2.0, 'price': 11.0, 'size': 2, 'symbol': 'BTC-USD'}
+    assert len(ticks) == 3
+
+    # Nothing left before this time
+    assert replay.step_until(4) is None
+    assert replay.next_time == 5.0
+
+    # Skipping without a callback still moves the replay forward
+    assert replay.step_until(10) == (5.0, 13.0)
+    assert replay.next_time is None
+    assert replay.seed_price() == 13.0
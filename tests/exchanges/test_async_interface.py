@@ -0,0 +1,45 @@
+"""
+    Tests for the async interface wrapper and its sync facade
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+import pytest
+
+from synapsis.exchanges.interfaces.async_interface import AsyncInterface, run_concurrently
+from synapsis.utils.exceptions import InvalidOrder
+from tests.helpers.slow_interface import SlowInterface
+
+
+def test_calls_overlap():
+    first = AsyncInterface(SlowInterface(name='first'), max_workers=4)
+    second = AsyncInterface(SlowInterface(name='second'), max_workers=4)
+
+    start = time.monotonic()
+    results = run_concurrently(first.get_price('BTC-USD'), first.get_price('ETH-USD'),
+                               second.get_price('BTC-USD'), second.market_order('ETH-USD', 'buy', 1))
+    elapsed = time.monotonic() - start
+
+    assert results[:3] == [7.0, 7.0, 7.0]
+    assert results[3]['symbol'] == 'ETH-USD' and results[3]['side'] == 'buy' and results[3]['size'] == 1
+    # Four calls of .2 seconds each finish in about the time of one
+    assert elapsed < .6
+
+
+def test_exceptions_are_raised():
+    interface = AsyncInterface(SlowInterface(delay=0), max_workers=1)
+    with pytest.raises(InvalidOrder):
+        run_concurrently(interface.market_order('BTC-USD', 'buy', 0))
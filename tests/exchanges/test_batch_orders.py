@@ -0,0 +1,108 @@
+"""
+    Tests for the concurrent batch order and cancel fallbacks
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+import pytest
+
+import synapsis
+from synapsis.enums import TimeInForce
+from synapsis.exchanges.interfaces.binance_futures.binance_futures_interface import BinanceFuturesInterface
+from synapsis.utils.exceptions import APIException, BatchOrderException, InvalidOrder
+from tests.helpers.slow_interface import SlowInterface
+
+
+def test_orders_are_placed_concurrently():
+    interface = SlowInterface()
+
+    start = time.monotonic()
+    orders = interface.batch_order([
+        {'type': 'limit', 'symbol': 'BTC-USD', 'side': 'buy', 'price': 100, 'size': 1},
+        {'symbol': 'ETH-USD', 'side': 'sell', 'price': 10, 'size': 2},
+        {'symbol': 'SOL-USD', 'side': 'buy', 'size': 3}
+    ])
+    elapsed = time.monotonic() - start
+
+    assert [order['type'] for order in orders] == ['limit', 'limit', 'market']
+    assert [order['symbol'] for order in orders] == ['BTC-USD', 'ETH-USD', 'SOL-USD']
+    assert elapsed < .5
+
+
+def test_every_order_is_attempted():
+    interface = SlowInterface(delay=0)
+    with pytest.raises(BatchOrderException) as raised:
+        interface.batch_order([
+            {'symbol': 'BTC-USD', 'side': 'buy', 'size': 0},
+            {'symbol': 'ETH-USD', 'side': 'buy', 'size': 1}
+        ])
+    assert [order['symbol'] for order in interface.get_open_orders()] == ['ETH-USD']
+    # The caller can see which orders were placed
+    failed, placed = raised.value.results
+    assert isinstance(failed, InvalidOrder)
+    assert raised.value.placed == [placed] == interface.get_open_orders()
+
+    with pytest.raises(InvalidOrder):
+        interface.batch_order([{'type': 'trailing_stop', 'symbol': 'BTC-USD', 'side': 'sell', 'size': 1}])
+
+
+def test_cancel_all():
+    interface = SlowInterface(delay=0)
+    interface.batch_order([{'symbol': symbol, 'side': 'buy', 'price': 1, 'size': 1}
+                           for symbol in ['BTC-USD', 'ETH-USD', 'BTC-USD']])
+
+    assert interface.cancel_all('BTC-USD') == [{'order_id': '0'}, {'order_id': '2'}]
+    assert interface.cancel_orders('ETH-USD', ['1']) == [{'order_id': '1'}]
+    assert interface.get_open_orders() == []
+
+
+def test_binance_futures_time_in_force():
+    # Building the parameters doesn't touch the client
+    interface = BinanceFuturesInterface.__new__(BinanceFuturesInterface)
+    order = {'symbol': 'BTC-USDT', 'side': 'buy', 'price': 100, 'size': 1}
+
+    assert interface._batch_order_params(order)['timeInForce'] == 'GTC'
+    assert interface._batch_order_params({**order, 'time_in_force': 'IOC'})['timeInForce'] == 'IOC'
+    assert interface._batch_order_params({**order, 'time_in_force': TimeInForce.FOK})['timeInForce'] == 'FOK'
+
+
+class BatchCalls:
+    """
+    Binance futures client that fails requests of fewer than five orders and rejects the second order of the others
+    """
+    def futures_place_batch_order(self, batchOrders):
+        if len(batchOrders) < 5:
+            raise APIException("Service unavailable")
+        return [{'code': -2019, 'msg': 'Margin is insufficient.'} if i == 1 else dict(order)
+                for i, order in enumerate(batchOrders)]
+
+
+def test_binance_futures_batch_failures_keep_placed_orders():
+    # The batch requests are sent on a pool sized from the http settings
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+    interface = BinanceFuturesInterface.__new__(BinanceFuturesInterface)
+    interface.calls = BatchCalls()
+    interface.parse_order_response = lambda response: response
+    orders = [{'symbol': 'BTC-USDT', 'side': 'buy', 'price': 100 + i, 'size': 1} for i in range(7)]
+
+    with pytest.raises(BatchOrderException) as raised:
+        interface.batch_order(orders)
+
+    results = raised.value.results
+    assert [result['price'] for result in raised.value.placed] == ['100', '102', '103', '104']
+    assert isinstance(results[1], InvalidOrder)
+    # Both orders of the failed request carry its exception
+    assert isinstance(results[5], APIException) and results[5] is results[6]
@@ -0,0 +1,111 @@
+"""
+    Tests for the multi symbol price and history fallbacks
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+import alpaca_trade_api
+import pandas as pd
+
+import synapsis
+from synapsis.exchanges.interfaces.alpaca.alpaca_interface import AlpacaInterface
+from tests.helpers.slow_interface import SlowInterface
+
+
+def test_prices_are_requested_concurrently():
+    interface = SlowInterface()
+    symbols = ['BTC-USD', 'ETH-USD', 'SOL-USD', 'DOGE-USD']
+
+    start = time.monotonic()
+    prices = interface.get_prices(symbols)
+    elapsed = time.monotonic() - start
+
+    assert prices == {'BTC-USD': 7.0, 'ETH-USD': 7.0, 'SOL-USD': 7.0, 'DOGE-USD': 8.0}
+    assert elapsed < .6
+
+
+def test_concurrency_is_bounded():
+    interface = SlowInterface(delay=.05)
+    symbols = [f'COIN{i}-USD' for i in range(12)]
+
+    prices = interface._map_symbols(interface.get_price, symbols, max_workers=3)
+
+    assert list(prices.keys()) == symbols
+    assert interface.most_in_flight == 3
+
+
+def test_history_many():
+    interface = SlowInterface(delay=0)
+    history = interface.history_many(['BTC-USD', 'DOGE-USD'], to=10, resolution='1h', return_as='list')
+
+    assert history['BTC-USD']['close'] == [7.0]
+    assert history['DOGE-USD']['close'] == [8.0]
+
+
+class BarsREST(alpaca_trade_api.REST):
+    """
+    Serves hourly bars for every symbol requested, with fewer bars for symbols that trade less
+    """
+    def __init__(self, bars_per_day: dict):
+        self.bars_per_day = bars_per_day
+        self.requests = []
+
+    def get_bars(self, symbol, timeframe, start=None, end=None, adjustment='raw', **kwargs):
+        self.requests.append((list(symbol), start))
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end)
+        rows = []
+        for name in symbol:
+            for stamp in pd.date_range(start, end, freq='1h'):
+                if stamp.hour < self.bars_per_day[name]:
+                    rows.append({'timestamp': stamp, 'open': 1.0, 'high': 2.0, 'low': .5, 'close': 1.5,
+                                 'volume': 10.0, 'symbol': name})
+        df = pd.DataFrame(rows).set_index('timestamp')
+
+        class Bars:
+            pass
+        bars = Bars()
+        bars.df = df
+        return bars
+
+
+def alpaca_interface(calls: BarsREST) -> AlpacaInterface:
+    # The interface reads the alpaca settings
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+    return AlpacaInterface('alpaca', calls)
+
+
+def test_alpaca_history_many_requests_symbols_together():
+    calls = BarsREST({'AAPL': 24, 'MSFT': 24})
+    interface = alpaca_interface(calls)
+    history = interface.history_many(['AAPL', 'MSFT'], resolution='1h', start_date=1600041600.0,
+                                     end_date=1600041600.0 + 5 * 3600)
+
+    assert calls.requests == [(['AAPL', 'MSFT'], '2020-09-14T00:00:00Z')]
+    assert history['AAPL']['time'].tolist() == list(range(1600041600, 1600041600 + 5 * 3600, 3600))
+    assert history['MSFT']['close'].tolist() == [1.5] * 5
+
+
+def test_alpaca_history_many_looks_back_for_short_symbols():
+    # MSFT only trades for part of each day so it needs a longer range to fill the count
+    calls = BarsREST({'AAPL': 24, 'MSFT': 6})
+    interface = alpaca_interface(calls)
+    history = interface.history_many(['AAPL', 'MSFT'], to=20, resolution='1h')
+
+    assert calls.requests[0][0] == ['AAPL', 'MSFT']
+    assert all(symbols == ['MSFT'] for symbols, _ in calls.requests[1:])
+    assert len(history['AAPL']) == 20
+    assert len(history['MSFT']) == 20
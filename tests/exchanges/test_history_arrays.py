@@ -0,0 +1,38 @@
+"""
+    Tests for returning history as numpy arrays
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+import pandas as pd
+
+from synapsis.exchanges.interfaces.abc_base_exchange_interface import ABCBaseExchangeInterface
+from synapsis.indicators import sma
+from synapsis.indicators.utils import convert_to_numpy
+
+
+def test_history_as_arrays():
+    response = pd.DataFrame({'time': [60.0, 120.0, 180.0], 'open': [1, 2, 3], 'high': [2, 3, 4], 'low': [0, 1, 2],
+                             'close': [1.5, 2.5, 3.5], 'volume': [10, 20, 30]})
+    arrays = ABCBaseExchangeInterface.cast_type(response, 'array', 3)
+
+    assert arrays.time.dtype == np.int64 and list(arrays.time) == [60, 120, 180]
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        assert arrays[column].dtype == np.float64
+        assert arrays[column].flags['C_CONTIGUOUS']
+
+    # The indicators use the arrays as they are
+    assert convert_to_numpy(arrays.close) is arrays.close
+    assert sma(arrays.close, 2).tolist() == [2.0, 3.0]
@@ -0,0 +1,65 @@
+"""
+    Tests for compiled order filters
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from synapsis.exchanges.interfaces.order_filter import OrderFilter, truncate
+from synapsis.utils.exceptions import InvalidOrder
+
+
+def order_filter(exchange_specific=None):
+    return OrderFilter({
+        'symbol': 'BTC-USD',
+        'limit_order': {'base_min_size': 0.001, 'base_max_size': 100, 'base_increment': 0.001,
+                        'price_increment': 0.01, 'min_price': 1, 'max_price': 1000000},
+        'market_order': {'base_min_size': 0.001, 'base_max_size': 100, 'base_increment': 0.001,
+                         'quote_increment': 0.01, 'buy': {'min_funds': 10, 'max_funds': 1000000},
+                         'sell': {'min_funds': 10, 'max_funds': 1000000}},
+        'exchange_specific': exchange_specific or {}
+    })
+
+
+def test_truncation_ignores_float_noise():
+    assert truncate(0.29, 2) == 0.29
+    assert truncate(1.23456, 3) == 1.234
+    assert truncate(-1.23456, 3) == -1.234
+
+
+def test_market_orders():
+    compiled = order_filter()
+    assert compiled.check_market_order(0.1 + 0.2, False) == 0.1 + 0.2
+    assert compiled.check_market_order(0.12345, True) == 0.123
+    with pytest.raises(InvalidOrder):
+        compiled.check_market_order(0.12345, False)
+    with pytest.raises(InvalidOrder):
+        compiled.check_market_order(0.0001, True)
+
+
+def test_limit_orders():
+    compiled = order_filter()
+    assert compiled.check_limit_order(0.5, 100.129, True) == (0.5, 100.12)
+    with pytest.raises(InvalidOrder):
+        compiled.check_limit_order(0.5, 100.129, False)
+    with pytest.raises(InvalidOrder):
+        compiled.check_limit_order(0.5, 0.5, False)
+
+    # Prices are bounded around the current price instead
+    banded = order_filter({'limit_multiplier_up': 5, 'limit_multiplier_down': 0.2})
+    assert banded.needs_reference_price
+    assert banded.price_bounds(100) == (20, 500)
+    with pytest.raises(InvalidOrder):
+        banded.check_limit_order(0.5, 600, False, reference_price=100)
@@ -0,0 +1,162 @@
+"""
+    Tests for filling and canceling paper trade orders through the interface
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+import synapsis
+from synapsis.exchanges.interfaces.paper_trade.paper_trade_interface import PaperTradeInterface
+from synapsis.exchanges.managers import ticker_manager
+from synapsis.utils.exceptions import APIException
+from synapsis.utils.utils import AttributeDict
+
+
+class OrderExchange:
+    """
+    Derived interface that serves the account and order filters of a coinbase pro account
+    """
+    def get_exchange_type(self):
+        return 'coinbase_pro'
+
+    def get_account(self, symbol=None):
+        return AttributeDict({asset: AttributeDict({'available': 0.0, 'hold': 0.0})
+                              for asset in ('BTC', 'ETH', 'USD')})
+
+    def get_fees(self, symbol):
+        return {'maker_fee_rate': 0.0, 'taker_fee_rate': 0.0}
+
+    def get_price(self, symbol):
+        return 105.0
+
+    def get_order_filter(self, symbol):
+        return {'symbol': symbol,
+                'base_asset': symbol.split('-')[0],
+                'quote_asset': 'USD',
+                'max_orders': 1000,
+                'limit_order': {'base_min_size': .001, 'base_max_size': 1000, 'base_increment': .001,
+                                'price_increment': .01, 'min_price': .01, 'max_price': 1e6},
+                'market_order': {'base_min_size': .001, 'base_max_size': 1000, 'base_increment': .001,
+                                 'quote_increment': .01,
+                                 'buy': {'min_funds': 1, 'max_funds': 1e6},
+                                 'sell': {'min_funds': 1, 'max_funds': 1e6}}}
+
+
+# Every fake ticker manager created during a test
+managers = []
+
+
+class FakeTickerManager:
+    """
+    Records the fill tickers the paper interface opens and closes
+    """
+    def __init__(self, default_exchange, default_symbol):
+        self.open = set()
+        self.closed_all = False
+        managers.append(self)
+
+    def create_ticker(self, callback, override_symbol=None):
+        self.open.add(override_symbol)
+
+    def close_websocket(self, override_symbol=None):
+        self.open.discard(override_symbol)
+
+    def close_all_websockets(self):
+        self.open.clear()
+        self.closed_all = True
+
+
+@pytest.fixture
+def interface():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+    interface = PaperTradeInterface(OrderExchange(), {'USD': 1000, 'BTC': 2})
+    yield interface
+    interface.stop_paper_trade_watchdog()
+
+
+def available(interface, asset):
+    return interface.get_account(asset)['available']
+
+
+def test_prices_fill_resting_orders(interface):
+    buy = interface.limit_order('BTC-USD', 'buy', 100, 2)
+    sell = interface.limit_order('BTC-USD', 'sell', 120, 1)
+    assert available(interface, 'USD') == 800
+    assert [order['id'] for order in interface.get_open_orders('BTC-USD')] == [buy.get_id(), sell.get_id()]
+    assert interface.get_open_orders('ETH-USD') == []
+
+    # Neither order is crossed
+    interface.evaluate_price('BTC-USD', 110)
+    assert len(interface.get_open_orders()) == 2
+
+    interface.evaluate_price('BTC-USD', 99)
+    assert [order['id'] for order in interface.get_open_orders()] == [sell.get_id()]
+    assert available(interface, 'BTC') == 3
+    assert interface.get_account('USD')['hold'] == 0
+
+    interface.evaluate_price('BTC-USD', 121)
+    assert interface.get_open_orders() == []
+    assert available(interface, 'USD') == 920
+
+
+def test_cancel_returns_the_held_funds(interface):
+    buy = interface.limit_order('BTC-USD', 'buy', 100, 2)
+    interface.cancel_order('BTC-USD', buy.get_id())
+
+    assert available(interface, 'USD') == 1000
+    assert interface.get_account('USD')['hold'] == 0
+    assert interface.get_open_orders() == []
+    # A canceled order can't fill or be canceled again
+    interface.evaluate_price('BTC-USD', 50)
+    assert available(interface, 'BTC') == 2
+    with pytest.raises(APIException):
+        interface.cancel_order('BTC-USD', buy.get_id())
+
+
+def test_backtest_prices_fill_orders(interface):
+    interface.set_backtesting(True)
+    interface.receive_time(0)
+    interface.receive_price('BTC-USD', 105)
+    interface.limit_order('BTC-USD', 'buy', 100, 2)
+
+    interface.receive_price('BTC-USD', 99)
+    interface.evaluate_limits()
+    assert interface.get_open_orders() == []
+    assert available(interface, 'BTC') == 4
+
+
+def test_fill_tickers_close_with_their_orders(interface, monkeypatch):
+    monkeypatch.setattr(ticker_manager, 'TickerManager', FakeTickerManager)
+    managers.clear()
+    interface.start_paper_trade_watchdog()
+
+    buy = interface.limit_order('BTC-USD', 'buy', 100, 1)
+    interface.limit_order('ETH-USD', 'buy', 100, 1)
+    manager = managers[0]
+    assert manager.open == {'BTC-USD', 'ETH-USD'}
+
+    # Once a symbol has nothing resting its ticker is closed
+    interface.evaluate_price('BTC-USD', 99)
+    interface.limit_order('ETH-USD', 'buy', 90, 1)
+    interface._PaperTradeInterface__close_idle_streams()
+    assert manager.open == {'ETH-USD'}
+    assert buy.get_id() not in [order['id'] for order in interface.get_open_orders()]
+
+    # A new order streams the symbol again
+    interface.limit_order('BTC-USD', 'buy', 100, 1)
+    assert manager.open == {'BTC-USD', 'ETH-USD'}
+
+    interface.stop_paper_trade_watchdog()
+    assert manager.closed_all and manager.open == set()
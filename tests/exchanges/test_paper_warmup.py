@@ -0,0 +1,76 @@
+"""
+    Tests for serving init history from the backtest prices
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pandas as pd
+import pytest
+
+import synapsis
+from synapsis.exchanges.interfaces.paper_trade.paper_trade_interface import PaperTradeInterface
+
+resolution = 60
+
+
+def candles(epoch_start, epoch_stop):
+    times = list(range(int(epoch_start), int(epoch_stop) + 1, resolution))
+    return pd.DataFrame({'time': times, 'low': 1.0, 'high': 1.0, 'open': 1.0, 'close': 1.0, 'volume': 1.0})
+
+
+class HistoryExchange:
+    """
+    Derived interface that only serves candles and records what was requested
+    """
+    def __init__(self):
+        self.requests = []
+
+    def get_exchange_type(self):
+        return 'coinbase_pro'
+
+    def get_product_history(self, symbol, epoch_start, epoch_stop, resolution_):
+        self.requests.append((epoch_start, epoch_stop))
+        return candles(epoch_start, epoch_stop)
+
+
+@pytest.fixture
+def interface():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+    interface = PaperTradeInterface(HistoryExchange())
+    interface.receive_price_cache({'BTC-USD': {resolution: candles(6000, 12000)}})
+    interface.initial_time = 6000
+    return interface
+
+
+def test_covered_warmup_stays_local(interface):
+    history = interface.get_product_history('BTC-USD', 7200, 9000, resolution)
+    assert interface.calls.requests == []
+    assert history['time'].iloc[0] == 7200 - resolution
+    assert history['time'].iloc[-1] == 9000
+
+
+def test_only_the_uncovered_head_is_downloaded(interface):
+    history = interface.get_product_history('BTC-USD', 3000, 9000, resolution)
+    assert interface.calls.requests == [(3000 - resolution, 6000 - resolution)]
+    assert history['time'].is_unique and history['time'].is_monotonic_increasing
+    assert history['time'].iloc[0] == 3000 - resolution
+
+    # The downloaded head is merged in so the same warmup doesn't download again
+    interface.get_product_history('BTC-USD', 3000, 9000, resolution)
+    assert len(interface.calls.requests) == 1
+
+
+def test_other_resolutions_use_the_exchange(interface):
+    interface.get_product_history('BTC-USD', 3000, 9000, 300)
+    assert interface.calls.requests == [(3000, 9000)]
@@ -0,0 +1,52 @@
+"""
+    Tests for the price indexed paper trade orders
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from synapsis.exchanges.interfaces.paper_trade.resting_orders import RestingOrders
+
+
+def order(order_id, side, price, order_type='limit', symbol='BTC-USD'):
+    return {'id': order_id, 'side': side, 'price': price, 'type': order_type, 'symbol': symbol}
+
+
+def test_triggers_match_the_fill_rules():
+    orders = RestingOrders()
+    orders.add(order('buy-100', 'buy', 100))
+    orders.add(order('buy-90', 'buy', 90))
+    orders.add(order('sell-110', 'sell', 110))
+    orders.add(order('stop-95', 'sell', 95, 'stop_loss'))
+    orders.add(order('other', 'buy', 1000, symbol='ETH-USD'))
+
+    # Limits need the price to cross them, stops fill when the price touches them
+    assert orders.pop_triggered('BTC-USD', 100) == []
+    assert orders.pop_triggered('BTC-USD', 110) == []
+    assert orders.pop_triggered('BTC-USD', 95) == ['buy-100', 'stop-95']
+    assert orders.pop_triggered('BTC-USD', 111) == ['sell-110']
+    assert orders.pop_triggered('BTC-USD', 89.5) == ['buy-90']
+    assert orders.symbols() == ['ETH-USD']
+    assert len(orders) == 1
+
+
+def test_removed_orders_never_trigger():
+    orders = RestingOrders()
+    for i in range(5):
+        orders.add(order(str(i), 'buy', 100))
+
+    assert orders.remove('2')
+    assert not orders.remove('2')
+    assert '2' not in orders
+    # Equal prices come back in the order they were placed
+    assert orders.pop_triggered('BTC-USD', 50) == ['0', '1', '3', '4']
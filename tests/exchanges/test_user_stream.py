@@ -0,0 +1,70 @@
+"""
+    Tests for the user stream cache
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import time
+
+from synapsis.exchanges.interfaces.user_stream import UserDataCache
+
+
+def open_order(order_id, symbol='BTC-USD', status='open'):
+    return {'id': order_id, 'symbol': symbol, 'side': 'buy', 'type': 'limit', 'status': status,
+            'price': 100, 'size': 1}
+
+
+def test_unsynced_cache_defers_to_rest():
+    cache = UserDataCache()
+    assert cache.get_account() is None
+    assert cache.get_open_orders() is None
+    assert cache.get_order('1') is None
+
+    cache.reconcile({'BTC': {'available': 1, 'hold': 0}}, [open_order('1')], time.time())
+    assert cache.get_account('BTC')['available'] == 1
+    assert cache.get_order('1')['status'] == 'open'
+
+    cache.invalidate()
+    assert cache.get_account() is None
+    assert cache.get_open_orders() is None
+
+
+def test_updates_during_snapshot_are_replayed():
+    cache = UserDataCache()
+    cache.begin_sync()
+    # Received before the snapshot was requested, so already part of it
+    cache.update_order(open_order('stale', status='done'))
+    snapshot_time = time.time() + 1e-6
+    time.sleep(.01)
+    cache.update_order(open_order('2'))
+    cache.update_balance('USD', 50, 100)
+
+    cache.reconcile({'USD': {'available': 150, 'hold': 0}}, [open_order('stale')], snapshot_time)
+    assert sorted(order['id'] for order in cache.get_open_orders()) == ['2', 'stale']
+    assert cache.get_account('USD') == {'available': 50, 'hold': 100}
+
+
+def test_closed_orders_leave_open_orders_and_are_bounded():
+    cache = UserDataCache(closed_order_history=2)
+    cache.reconcile({}, [open_order(str(i), symbol='ETH-USD' if i % 2 else 'BTC-USD') for i in range(4)], 0)
+    assert len(cache.get_open_orders('BTC-USD')) == 2
+
+    for i in range(3):
+        cache.update_order({'id': str(i), 'status': 'done'})
+
+    assert [order['id'] for order in cache.get_open_orders()] == ['3']
+    # The oldest closed order has been dropped, the others keep the fields from when they were open
+    assert cache.get_order('0') is None
+    assert cache.get_order('2')['symbol'] == 'BTC-USD'
+    assert cache.get_order('2')['status'] == 'done'
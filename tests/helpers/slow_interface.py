@@ -0,0 +1,80 @@
+"""
+    Exchange interface stub for testing the concurrent fallbacks
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+
+import pandas as pd
+
+import synapsis
+from synapsis.exchanges.interfaces.abc_base_exchange_interface import ABCBaseExchangeInterface
+from synapsis.utils.exceptions import InvalidOrder
+
+
+class SlowInterface(ABCBaseExchangeInterface):
+    """
+    Only implements single symbol and single order calls, each taking a fixed amount of time. The price of a symbol is
+    the length of its name.
+    """
+    def __init__(self, delay: float = .2, name: str = 'test'):
+        # The fallbacks size their pools from the http settings
+        synapsis.utils.load_user_preferences('./tests/config/settings.json')
+        self.delay = delay
+        self.name = name
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.open_orders = {}
+        self.__lock = threading.Lock()
+
+    def get_exchange_type(self):
+        return self.name
+
+    def get_price(self, symbol):
+        with self.__lock:
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.__lock:
+            self.in_flight -= 1
+        return float(len(symbol))
+
+    def get_product_history(self, symbol, epoch_start, epoch_stop, resolution):
+        return pd.DataFrame({'time': [epoch_start], 'close': [float(len(symbol))]})
+
+    def __place(self, **order):
+        time.sleep(self.delay)
+        if order['size'] <= 0:
+            raise InvalidOrder("Size must be positive")
+        with self.__lock:
+            order['id'] = str(len(self.open_orders))
+            self.open_orders[order['id']] = order
+        return order
+
+    def market_order(self, symbol, side, size):
+        return self.__place(symbol=symbol, side=side, size=size, type='market')
+
+    def limit_order(self, symbol, side, price, size):
+        return self.__place(symbol=symbol, side=side, price=price, size=size, type='limit')
+
+    def cancel_order(self, symbol, order_id):
+        time.sleep(self.delay)
+        with self.__lock:
+            del self.open_orders[order_id]
+        return {'order_id': order_id}
+
+    def get_open_orders(self, symbol=None):
+        return [order for order in self.open_orders.values() if symbol is None or order['symbol'] == symbol]
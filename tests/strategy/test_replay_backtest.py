@@ -0,0 +1,115 @@
+"""
+    Run a strategy backtest over recorded ticks and orderbooks
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import synapsis
+from synapsis.data import TickRecorder, TickReader, OrderbookRecorder, OrderbookReader
+from synapsis.exchanges.exchange import Exchange
+from synapsis.utils.utils import AttributeDict
+
+start = 1600000000
+
+
+class ReplayCalls:
+    """
+    Derived interface that serves the account and metadata for an offline backtest
+    """
+    def get_exchange_type(self):
+        return 'coinbase_pro'
+
+    def get_account(self, symbol=None):
+        return AttributeDict({asset: AttributeDict({'available': 0.0, 'hold': 0.0})
+                              for asset in ('BTC', 'ETH', 'USD')})
+
+    def get_products(self):
+        return [{'symbol': 'BTC-USD', 'base_asset': 'BTC', 'quote_asset': 'USD'},
+                {'symbol': 'ETH-USD', 'base_asset': 'ETH', 'quote_asset': 'USD'}]
+
+    def get_fees(self, symbol):
+        return {'maker_fee_rate': 0.0, 'taker_fee_rate': 0.0}
+
+    def get_order_filter(self, symbol):
+        return {'symbol': symbol,
+                'base_asset': symbol.split('-')[0],
+                'quote_asset': 'USD',
+                'max_orders': 1000,
+                'limit_order': {'base_min_size': .001, 'base_max_size': 1000, 'base_increment': .001,
+                                'price_increment': .01, 'min_price': .01, 'max_price': 1e6},
+                'market_order': {'base_min_size': .001, 'base_max_size': 1000, 'base_increment': .001,
+                                 'quote_increment': .01,
+                                 'buy': {'min_funds': 1, 'max_funds': 1e6},
+                                 'sell': {'min_funds': 1, 'max_funds': 1e6}}}
+
+
+class ReplayExchange(Exchange):
+    def __init__(self):
+        super().__init__('coinbase_pro', 'replay', './tests/config/settings.json')
+        self.calls = ReplayCalls()
+        self.interface = self.calls
+
+    def get_asset_state(self, symbol):
+        pass
+
+    def get_direct_calls(self):
+        return self.calls
+
+
+def test_backtest_replays_ticks_and_books(tmp_path):
+    tick_path = str(tmp_path / 'BTC-USD.ticks')
+    recorder = TickRecorder(tick_path)
+    for i in range(100):
+        recorder({'symbol': 'BTC-USD', 'price': 100 + i, 'time': start + i * 10, 'trade_id': i, 'size': 1})
+    recorder.close()
+
+    book_path = str(tmp_path / 'ETH-USD.book')
+    book_recorder = OrderbookRecorder(book_path, 'ETH-USD')
+    book_recorder.record_snapshot([(99.0, 1.0)], [(101.0, 5.0)], start + 5)
+    book_recorder.record_snapshot([(199.0, 1.0)], [(201.0, 5.0)], start + 500)
+    book_recorder.close()
+
+    ticks = []
+    books = []
+    orders = []
+
+    def tick_event(tick, symbol, state):
+        # The paper trade price follows the replayed ticks
+        assert state.interface.get_price(symbol) == tick['price']
+        ticks.append((strategy.time(), tick))
+
+    def orderbook_event(book, symbol, state):
+        if not books:
+            orders.append(state.interface.market_order(symbol, 'buy', 1))
+        books.append((strategy.time(), book))
+
+    strategy = synapsis.Strategy(ReplayExchange())
+    strategy.add_tick_event(tick_event, 'BTC-USD')
+    strategy.add_orderbook_event(orderbook_event, 'ETH-USD')
+    strategy.add_tick_data(TickReader(tick_path))
+    strategy.add_orderbook_data(OrderbookReader(book_path))
+
+    strategy.backtest(start_date=start, end_date=start + 1000, initial_values={'USD': 1000},
+                      settings_path='./tests/config/backtest.json', quote_account_value_in='USD',
+                      GUI_output=False, show_progress_during_backtest=False, cache_location=str(tmp_path))
+
+    assert [tick['trade_id'] for _, tick in ticks] == list(range(100))
+    assert all(event_time == tick['time'] for event_time, tick in ticks)
+
+    assert books == [(start + 5, {'bids': [(99.0, 1.0)], 'asks': [(101.0, 5.0)]}),
+                     (start + 500, {'bids': [(199.0, 1.0)], 'asks': [(201.0, 5.0)]})]
+    # The market order filled against the replayed asks
+    response = orders[0].get_response()
+    assert response['status'] == 'done'
+    assert response['price'] == 101.0
@@ -0,0 +1,67 @@
+"""
+    Tests for the server clock offset estimator
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from synapsis.utils.clock_offset import ClockOffset
+
+
+class FakeClocks:
+    """
+    A local clock that only moves when a request is made and a server clock that runs ahead and drifts
+    """
+    def __init__(self, offset: float, drift: float, delays: list):
+        self.local = 1000.0
+        self.offset = offset
+        self.drift = drift
+        self.delays = delays
+        self.calls = 0
+
+    def clock(self):
+        return self.local
+
+    def fetch_server_time(self):
+        # The request takes a while to arrive and the response takes as long to come back
+        delay = self.delays[self.calls % len(self.delays)]
+        self.calls += 1
+        self.local += delay
+        server_time = self.local + self.offset + self.drift * (self.local - 1000)
+        self.local += delay
+        return server_time
+
+
+def test_offset_uses_fastest_sample():
+    clocks = FakeClocks(offset=2.5, drift=0, delays=[.3, .01, .2])
+    estimator = ClockOffset(clocks.fetch_server_time, samples=3, clock=clocks.clock)
+    assert estimator.get_offset() == pytest.approx(2.5)
+    assert clocks.calls == 3
+
+    # Later reads come from the local clock without another request
+    estimator.time()
+    assert clocks.calls == 3
+
+
+def test_drift():
+    clocks = FakeClocks(offset=1, drift=.001, delays=[.05])
+    estimator = ClockOffset(clocks.fetch_server_time, samples=1, clock=clocks.clock)
+    estimator.refresh()
+    clocks.local += 600
+    estimator.refresh()
+    assert estimator.get_drift() == pytest.approx(.001)
+
+    clocks.local += 100
+    assert estimator.time() == pytest.approx(clocks.local + 1 + .001 * (clocks.local - 1000))
@@ -0,0 +1,87 @@
+"""
+    Tests for the live history cache
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pandas as pd
+
+from synapsis.utils.history_cache import HistoryCache
+
+resolution = 60
+key = ('coinbase_pro', 'BTC-USD', resolution)
+
+
+class Exchange:
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, epoch_start, epoch_stop):
+        self.requests.append((epoch_start, epoch_stop))
+        # Like a live exchange this also returns the candle that is still open
+        times = list(range(int(epoch_start), int(epoch_stop) + 2 * resolution, resolution))
+        return pd.DataFrame({'time': times, 'close': [float(t) for t in times]})
+
+
+def window(stop, count=10):
+    return stop - (count - 1) * resolution, stop
+
+
+def test_only_new_candles_are_downloaded():
+    cache = HistoryCache(max_bars=100, persist=False, location='')
+    exchange = Exchange()
+
+    first = cache.history(key, *window(6000), 10, exchange.fetch)
+    assert list(first['time']) == list(range(5460, 6060, 60))
+
+    # Nothing closed since the last call
+    cache.history(key, *window(6000), 10, exchange.fetch)
+    assert exchange.requests == [(5460, 6000)]
+
+    second = cache.history(key, *window(6120), 10, exchange.fetch)
+    assert exchange.requests[-1] == (6000, 6120)
+    assert list(second['time']) == list(range(5580, 6180, 60))
+
+
+def test_longer_windows_and_trimming():
+    cache = HistoryCache(max_bars=15, persist=False, location='')
+    exchange = Exchange()
+
+    cache.history(key, *window(6000), 10, exchange.fetch)
+    longer = cache.history(key, *window(6000, 12), 12, exchange.fetch)
+    assert len(exchange.requests) == 2
+    assert len(longer) == 12
+
+    # Stepping forward past the size limit drops the oldest candles
+    cache.history(key, *window(6600), 10, exchange.fetch)
+    assert len(exchange.requests) == 3
+
+    # Windows longer than the cache are downloaded whole and returned in full, without trimming the cached series
+    for _ in range(2):
+        longest = cache.history(key, *window(6600, 20), 20, exchange.fetch)
+        assert len(longest) == 20
+        assert longest['time'].iloc[-1] == 6600
+    assert len(exchange.requests) == 5
+    cache.history(key, *window(6660), 10, exchange.fetch)
+    assert exchange.requests[-1] == (6600, 6660)
+
+
+def test_persisted_series_are_reloaded(tmp_path):
+    exchange = Exchange()
+    HistoryCache(max_bars=100, persist=True, location=str(tmp_path)).history(key, *window(6000), 10, exchange.fetch)
+
+    reloaded = HistoryCache(max_bars=100, persist=True, location=str(tmp_path))
+    candles = reloaded.history(key, *window(6000), 10, exchange.fetch)
+    assert len(exchange.requests) == 1
+    assert candles['close'].iloc[-1] == 6000
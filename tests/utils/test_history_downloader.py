@@ -0,0 +1,114 @@
+"""
+    Tests for the concurrent history downloader against a local stub server
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+import requests
+
+from synapsis.utils.history_downloader import TokenBucket, download_windows, split_windows
+
+
+class CandleHandler(BaseHTTPRequestHandler):
+    # Windows that fail once before succeeding
+    flaky = {600}
+    failed = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        start, end = int(query['start'][0]), int(query['end'][0])
+        with self.lock:
+            fail = start in self.flaky and start not in self.failed
+            self.failed.add(start)
+        if fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        # Both ends are inclusive so neighbouring windows share a candle
+        body = json.dumps([[t, t / 60] for t in range(start, end + 1, 60)]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), CandleHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def test_split_windows():
+    assert split_windows(0, 1000, 60, 10) == [(0, 600), (600, 1000)]
+    assert split_windows(0, 600, 60, 10) == [(0, 600)]
+
+
+def test_download_merges_in_order(server):
+    def fetch(window_open, window_close):
+        response = requests.get(server, params={'start': window_open, 'end': window_close})
+        response.raise_for_status()
+        return response.json()
+
+    windows = split_windows(0, 6000, 60, 10)
+    rows = download_windows(fetch, windows, 'stub', max_workers=4, max_retries=2, show_progress=False)
+
+    # The failed window was retried and the shared boundary candles only appear once
+    assert [row[0] for row in rows] == list(range(0, 6001, 60))
+    assert 600 in CandleHandler.failed
+
+
+def test_download_raises_after_retries():
+    def fetch(window_open, window_close):
+        raise ValueError("Always fails")
+
+    with pytest.raises(ValueError):
+        download_windows(fetch, [(0, 1)], 'stub', max_workers=1, max_retries=0, show_progress=False)
+
+
+def test_single_window_runs_inline():
+    threads = []
+
+    def fetch(window_open, window_close):
+        threads.append(threading.current_thread())
+        return [(window_open,), (window_close,)]
+
+    settings = {'max_workers': 4, 'max_retries': 0}
+    rows = download_windows(fetch, [(0, 60)], 'stub', show_progress=False, settings=settings)
+    assert rows == [(0,), (60,)]
+    assert threads == [threading.current_thread()]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # The first token is free, the other ten take a fiftieth of a second each
+    assert time.monotonic() - start >= .18
@@ -0,0 +1,92 @@
+"""
+    Tests for the pooled retrying HTTP session against a local stub server
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from synapsis.utils.http_session import HTTPSession, get_http_metrics
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive needs HTTP/1.1
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+
+    def __respond(self):
+        count = self.hits.get(self.path, 0)
+        self.hits[self.path] = count + 1
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        # /throttled answers 429 once and /error always fails
+        if (self.path == '/throttled' and count == 0) or self.path == '/error':
+            status, body = (429 if self.path == '/throttled' else 503), b'{}'
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = __respond
+    do_POST = __respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StubHandler.hits = {}
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def create_session():
+    return HTTPSession('stub', pool_size=2, connect_timeout=1, read_timeout=5, max_retries=2, backoff_factor=.01)
+
+
+def test_connections_are_reused(server):
+    session = create_session()
+    for _ in range(10):
+        assert session.get(server + '/ok').json() == {'ok': True}
+
+    metrics = session.get_metrics()
+    assert metrics['requests'] == 10
+    assert metrics['connections_opened'] == 1
+    assert metrics['connections_reused'] == 9
+    assert get_http_metrics()['stub']['requests'] >= 10
+
+
+def test_retries(server):
+    session = create_session()
+    assert session.post(server + '/throttled').status_code == 200
+    assert session.get(server + '/error').status_code == 503
+    assert StubHandler.hits['/error'] == 3
+    assert session.get_metrics()['retries'] == 3
+
+
+def test_failed_orders_are_not_resent(server):
+    session = create_session()
+    assert session.post(server + '/error').status_code == 503
+    assert StubHandler.hits['/error'] == 1
@@ -0,0 +1,74 @@
+"""
+    Tests for the shared market data hub
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from synapsis.utils.market_data import MarketDataHub
+
+
+def hub(price_ttl=60):
+    return MarketDataHub(enabled=True, price_ttl=price_ttl, metadata_ttl=60, feed_max_age=60)
+
+
+def test_concurrent_requests_share_one_download():
+    market_data = hub()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return 100.0
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(market_data.price, 'coinbase_pro', 'BTC-USD', fetch) for _ in range(5)]
+        # Let every request reach the hub before the download finishes
+        time.sleep(.2)
+        release.set()
+        assert [future.result() for future in futures] == [100.0] * 5
+
+    assert len(calls) == 1
+    assert market_data.price('coinbase_pro', 'BTC-USD', fetch) == 100.0
+    assert market_data.stats() == {'hits': 1, 'misses': 1, 'coalesced': 4, 'feed_hits': 0}
+
+
+def test_expired_and_failed_requests_download_again():
+    market_data = hub(price_ttl=0)
+    market_data.price('binance', 'BTC-USDT', lambda: 1.0)
+    assert market_data.price('binance', 'BTC-USDT', lambda: 2.0) == 2.0
+
+    def fail():
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        market_data.products('binance', fail)
+    assert market_data.products('binance', lambda: ['BTC-USDT']) == ['BTC-USDT']
+
+
+def test_tickers_are_preferred_over_rest():
+    market_data = hub()
+    # Binance tickers report the exchange's symbol
+    market_data.record_tick('binance', 'BTCUSDT', {'price': 50.0})
+    assert market_data.price('binance', 'BTC-USDT', lambda: pytest.fail('downloaded')) == 50.0
+
+    prices = market_data.prices('binance', ['BTC-USDT', 'ETH-USDT'], lambda symbols: {s: 1.0 for s in symbols})
+    assert prices == {'BTC-USDT': 50.0, 'ETH-USDT': 1.0}
+    assert market_data.stats()['feed_hits'] == 2
@@ -0,0 +1,71 @@
+"""
+    Tests for the disk backed exchange metadata cache
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from synapsis.utils.metadata_cache import MetadataCache
+
+ttl = {'products': 60, 'fees': 60, 'order_filter': 0}
+
+
+class Offline:
+    def get_products(self):
+        raise ConnectionError
+
+    def get_fees(self, symbol):
+        raise ConnectionError
+
+    def get_order_filter(self, symbol):
+        raise ConnectionError
+
+
+class Online:
+    def get_products(self):
+        return [{'symbol': 'BTC-USD', 'base_increment': 0.001}, {'symbol': 'ETH-USD', 'base_increment': 0.01}]
+
+    def get_fees(self, symbol):
+        return {'maker_fee_rate': 0.001, 'taker_fee_rate': 0.002}
+
+    def get_order_filter(self, symbol):
+        return {'symbol': symbol, 'market_order': {'base_min_size': 0.001}}
+
+
+def test_warmed_metadata_is_served_offline(tmp_path):
+    MetadataCache(enabled=True, location=str(tmp_path), ttl=ttl).warm('binance', Online(), ['BTC-USD'])
+
+    # A new process reads everything from disk
+    cache = MetadataCache(enabled=True, location=str(tmp_path), ttl=ttl)
+    offline = Offline()
+    assert cache.get('binance', 'products', '', offline.get_products) == Online().get_products()
+    assert cache.get('binance', 'fees', 'BTC-USD', lambda: offline.get_fees('BTC-USD'))['taker_fee_rate'] == 0.002
+    assert cache.product('binance', 'ETH-USD', offline.get_products)['base_increment'] == 0.01
+    assert cache.product('binance', 'DOGE-USD', offline.get_products) is None
+
+    # Expired entries are still used when the exchange can't be reached
+    assert cache.get('binance', 'order_filter', 'BTC-USD', lambda: offline.get_order_filter('BTC-USD'))['symbol'] \
+        == 'BTC-USD'
+    with pytest.raises(ConnectionError):
+        cache.get('binance', 'order_filter', 'ETH-USD', lambda: offline.get_order_filter('ETH-USD'))
+
+
+def test_values_are_copies(tmp_path):
+    cache = MetadataCache(enabled=True, location=str(tmp_path), ttl=ttl)
+    cache.get('coinbase_pro', 'fees', '', lambda: Online().get_fees('BTC-USD'))['maker_fee_rate'] = 1
+    assert cache.get('coinbase_pro', 'fees', '', Offline().get_products)['maker_fee_rate'] == 0.001
+
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,69 @@
+"""
+    Tests for the rolling window ring buffer.
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from synapsis.frameworks.strategy import StrategyState
+from synapsis.utils.rolling_window import RollingWindow
+
+
+def bar(time_, close):
+    return {'time': time_, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0}
+
+
+def test_keeps_the_newest_values_in_order():
+    window = RollingWindow(5, columns=('close',))
+    for i in range(12):
+        window.append(float(i))
+
+    assert window.full
+    assert window.close.tolist() == [7, 8, 9, 10, 11]
+    assert window.close.flags['C_CONTIGUOUS']
+
+
+def test_views_are_read_only_and_not_copies():
+    window = RollingWindow(3, columns=('close',))
+    window.append(1.0)
+    view = window.close
+    assert not view.flags.writeable
+    with pytest.raises(ValueError):
+        view[0] = 2
+    # Appending writes into the same buffer the view reads from
+    assert np.shares_memory(view, window.close)
+
+
+def test_overlapping_bars_are_skipped():
+    window = RollingWindow(4)
+    window.append(bar(60, 1.0))
+    window.append(bar(120, 2.0))
+    window.append(bar(120, 5.0))
+    window.append(bar(60, 5.0))
+
+    assert len(window) == 2
+    assert window.close.tolist() == [1.0, 2.0]
+    assert window.time.dtype == np.int64
+
+
+def test_from_history():
+    history = pd.DataFrame([bar(60 * i, float(i)) for i in range(10)])
+    window = RollingWindow.from_history(history, capacity=4)
+    assert window.close.tolist() == [6.0, 7.0, 8.0, 9.0]
+
+    StrategyState.append_bar(window, bar(600, 10.0))
+    assert window.close.tolist() == [7.0, 8.0, 9.0, 10.0]
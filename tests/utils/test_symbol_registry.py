@@ -0,0 +1,50 @@
+"""
+    Tests for translating symbols through the registry
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from synapsis.utils import utils
+from synapsis.utils.symbol_registry import symbol_registry
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    symbol_registry.clear()
+    yield
+    symbol_registry.clear()
+
+
+def test_parsing_prefers_the_longest_quote():
+    assert utils.to_synapsis_symbol('ETHBUSD', 'binance') == 'ETH-BUSD'
+    assert utils.to_synapsis_symbol('BTCTUSD', 'binance') == 'BTC-TUSD'
+    assert utils.to_synapsis_symbol('BTCUSDT', 'binance') == 'BTC-USDT'
+    assert utils.to_synapsis_symbol('WBTCBTC', 'binance', quote_guess='BTC') == 'WBTC-BTC'
+
+
+def test_registered_products_are_exact():
+    # Without products this could be either USDT-USD or USD-TUSD
+    symbol_registry.register('binance', {'USD-TUSD': 'USDTUSD'})
+    assert utils.to_synapsis_symbol('USDTUSD', 'binance') == 'USD-TUSD'
+    assert utils.to_exchange_symbol('USD-TUSD', 'binance') == 'USDTUSD'
+
+
+def test_bulk_translation():
+    assert utils.to_synapsis_symbols(['BTC/USD', 'ETH/USD'], 'ftx') == ['BTC-USD', 'ETH-USD']
+    assert utils.to_exchange_symbols(['BTC-USDT', 'ETH-USDT'], 'binance') == ['BTCUSDT', 'ETHUSDT']
+    # Alpaca symbols can't be translated back so each direction is kept apart
+    assert utils.to_exchange_symbol('AAPL-USD', 'alpaca') == 'AAPL'
+    assert utils.to_synapsis_symbol('AAPL', 'alpaca') == 'AAPL'
@@ -0,0 +1,109 @@
+"""
+    Tests for the asyncio websocket transport against a local server
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import threading
+import time
+
+import pytest
+import websockets
+
+import synapsis
+from synapsis.exchanges.interfaces.websocket import Websocket
+from synapsis.utils import event_loop
+
+
+class EchoTicker(Websocket):
+    def __init__(self, url, transport='asyncio', **kwargs):
+        super().__init__('BTC-USD', 'trades', None, '', url, None, kwargs, transport)
+
+    def restart_ticker(self):
+        self.start_websocket(self.on_open, self.on_message, self.on_error, self.on_close, None)
+
+    def on_open(self, ws):
+        ws.send(json.dumps({'op': 'subscribe'}))
+
+    def on_message(self, ws, message):
+        message = json.loads(message)
+        self.most_recent_tick = message
+        self.ticker_feed.append(message)
+        self.run_callbacks(message)
+
+    def on_error(self, ws, error):
+        pass
+
+    def on_close(self, ws):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+
+    async def handler(connection, path):
+        await connection.recv()
+        for i in range(5):
+            await connection.send(json.dumps({'price': float(i)}))
+        await connection.wait_closed()
+
+    async def serve():
+        return await websockets.serve(handler, 'localhost', 0)
+
+    server = event_loop.run_coroutine(serve())
+    port = server.sockets[0].getsockname()[1]
+    yield f'ws://localhost:{port}'
+    server.close()
+
+
+def wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition() and time.time() - start < timeout:
+        time.sleep(.01)
+    return condition()
+
+
+def test_asyncio_transport_callbacks(server_url):
+    received = []
+    received_async = []
+    done = threading.Event()
+
+    def callback(tick, **kwargs):
+        received.append(tick['price'])
+
+    async def async_callback(tick, tag=None):
+        received_async.append((tick['price'], tag))
+        if len(received_async) == 5:
+            done.set()
+
+    ticker = EchoTicker(server_url, tag='test')
+    ticker.append_callback(callback)
+    ticker.append_callback(async_callback)
+    ticker.restart_ticker()
+
+    assert done.wait(5)
+    assert received == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert received_async[-1] == (4.0, 'test')
+    assert ticker.thread is None
+    assert ticker.is_websocket_open()
+
+    ticker.close_websocket()
+    assert wait_for(lambda: not ticker.is_websocket_open())
+
+
+def test_invalid_transport(server_url):
+    with pytest.raises(ValueError):
+        EchoTicker(server_url, transport='carrier_pigeon')
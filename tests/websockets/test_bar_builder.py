@@ -0,0 +1,45 @@
+"""
+    Tests for building live bars from trade streams
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+from synapsis.exchanges.managers.bar_manager import BarBuilder
+
+resolution = 60
+
+
+def test_trades_aggregate_into_bars():
+    builder = BarBuilder(resolution, max_silence=30)
+    # The first bar could be missing trades from before the subscription
+    builder.add_trade(10, 1, 5990)
+    assert builder.close(6000) is None
+
+    for price, size, trade_time in [(11, 1, 6000), (14, 2, 6020), (9, 1, 6040), (12, 0.5, 6059)]:
+        builder.add_trade(price, size, trade_time)
+    assert builder.close(6060) == {'time': 6000, 'open': 11, 'high': 14, 'low': 9, 'close': 12, 'volume': 4.5}
+
+
+def test_quiet_streams_are_left_for_rest():
+    builder = BarBuilder(resolution, max_silence=30)
+    builder.add_trade(10, 1, 5990)
+    builder.add_trade(10, 1, 6005)
+    # A gap longer than max_silence may hide a reconnect
+    builder.add_trade(11, 1, 6050)
+    assert builder.close(6060) is None
+
+    builder.add_trade(12, 1, 6070)
+    builder.add_trade(12, 1, 6100)
+    builder.add_trade(13, 1, 6110)
+    assert builder.close(6120)['close'] == 13
@@ -0,0 +1,137 @@
+"""
+    Tests for the off-thread websocket callback dispatcher
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import threading
+
+import pytest
+
+import synapsis
+from synapsis.exchanges.managers.callback_dispatcher import CallbackDispatcher
+from synapsis.exchanges.managers.websocket_manager import WebsocketManager
+from synapsis.utils import event_loop
+
+
+def held_dispatcher(policy, queue_size=3):
+    """
+    Create a dispatcher whose first callback waits on an event so the queue can fill up
+    """
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def callback(message, **kwargs):
+        started.set()
+        release.wait(5)
+        received.append((message, kwargs))
+
+    dispatcher = CallbackDispatcher('test', [callback], queue_size=queue_size, overflow_policy=policy)
+    dispatcher.put(0)
+    assert started.wait(5)
+    return dispatcher, release, received
+
+
+def test_block_keeps_every_message():
+    received = []
+    dispatcher = CallbackDispatcher('test', queue_size=2)
+    dispatcher.append_callback(lambda message, **kwargs: received.append(message))
+    for i in range(100):
+        dispatcher(i, symbol='BTC-USD')
+
+    assert dispatcher.join(5)
+    assert received == list(range(100))
+    stats = dispatcher.get_stats()
+    assert stats['dispatched'] == 100
+    assert stats['dropped'] == 0
+    assert stats['max_depth'] <= 2
+
+
+def test_drop_oldest():
+    dispatcher, release, received = held_dispatcher('drop_oldest')
+    for i in range(1, 6):
+        dispatcher.put(i)
+    assert dispatcher.get_depth() == 3
+    release.set()
+
+    assert dispatcher.join(5)
+    assert [message for message, _ in received] == [0, 3, 4, 5]
+    assert dispatcher.get_stats()['dropped'] == 2
+
+
+def test_conflate():
+    dispatcher, release, received = held_dispatcher('conflate')
+    for i in range(1, 6):
+        dispatcher.put(i, {'symbol': 'BTC-USD'})
+    release.set()
+
+    assert dispatcher.join(5)
+    assert received[-1] == (5, {'symbol': 'BTC-USD'})
+    assert dispatcher.get_stats()['dropped'] == 3
+
+
+def test_block_never_stalls_the_event_loop():
+    dispatcher, release, received = held_dispatcher('block')
+
+    async def read():
+        # An asyncio websocket calls put from the shared loop, which has to keep running with a full queue
+        for i in range(1, 6):
+            dispatcher.put(i)
+        return dispatcher.get_depth()
+
+    assert event_loop.run_coroutine(read(), timeout=5) == 3
+    release.set()
+
+    assert dispatcher.join(5)
+    assert [message for message, _ in received] == [0, 3, 4, 5]
+    assert dispatcher.get_stats()['dropped'] == 2
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        CallbackDispatcher('test', overflow_policy='latest')
+
+
+class Websocket:
+    def __init__(self):
+        self.open = True
+
+    def close_websocket(self):
+        self.open = False
+
+
+def dispatch_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('synapsis-dispatch-closing')]
+
+
+def test_closing_a_websocket_stops_its_dispatcher():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+    websockets = {'closing': {'BTC-USD': Websocket(), 'ETH-USD': Websocket()}}
+    manager = WebsocketManager(websockets, 'BTC-USD', 'closing')
+    for symbol in websockets['closing']:
+        dispatcher = manager.create_dispatcher('closing', symbol, [lambda message: None])
+        dispatcher.put({'price': 1})
+        assert dispatcher.join(5)
+    assert len(dispatch_threads()) == 2
+
+    manager.close_websocket('BTC-USD')
+    assert not websockets['closing']['BTC-USD'].open
+    assert list(manager.dispatchers['closing']) == ['ETH-USD']
+
+    manager.close_all_websockets()
+    assert manager.dispatchers == {}
+    for thread in dispatch_threads():
+        thread.join(5)
+    assert dispatch_threads() == []
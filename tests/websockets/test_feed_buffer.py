@@ -0,0 +1,67 @@
+"""
+    Tests for the websocket feed ring buffers
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import numpy as np
+
+from synapsis.exchanges.interfaces.feed_buffer import TickerFeed, TimeFeed
+
+
+def tick(i, side='buy'):
+    return {'symbol': 'BTC-USD', 'price': str(100 + i), 'size': 1.0, 'side': side, 'time': 1000.0 + i}
+
+
+def test_feed_keeps_the_newest_ticks():
+    feed = TickerFeed(3)
+    for i in range(5):
+        feed.append(tick(i, side='buy' if i % 2 else 'sell'))
+
+    ticks, cursor = feed.since()
+    assert cursor == 5
+    assert ticks.price.tolist() == [102.0, 103.0, 104.0]
+    assert ticks.side.tolist() == [-1, 1, -1]
+    assert ticks.price.flags['C_CONTIGUOUS'] and not ticks.price.flags.writeable
+    assert [message['time'] for message in feed.to_list()] == [1002.0, 1003.0, 1004.0]
+
+
+def test_cursor_only_returns_new_ticks():
+    feed = TickerFeed(4)
+    feed.append(tick(0))
+    _, cursor = feed.since()
+
+    feed.append(tick(1))
+    feed.append({'bids': [], 'asks': []})
+    ticks, cursor = feed.since(cursor)
+    assert cursor == 3
+    assert ticks.price[0] == 101.0
+    assert np.isnan(ticks.price[1])
+
+    ticks, cursor = feed.since(cursor)
+    assert len(ticks.price) == 0 and cursor == 3
+
+    # A reader that fell behind gets what is still in the buffer
+    for i in range(10):
+        feed.append(tick(i))
+    ticks, _ = feed.since(cursor)
+    assert ticks.price.tolist() == [106.0, 107.0, 108.0, 109.0]
+
+
+def test_time_feed():
+    feed = TimeFeed(2)
+    for time_ in (1, '2', 3.5):
+        feed.append(time_)
+    assert feed.to_list('time') == [2.0, 3.5]
+    assert len(feed) == 2
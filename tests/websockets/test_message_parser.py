@@ -0,0 +1,81 @@
+"""
+    Tests for websocket message decoding and field extraction
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+
+import pytest
+
+import synapsis
+from synapsis.exchanges.interfaces.binance import binance_websocket_utils
+from synapsis.exchanges.interfaces.binance.binance_websocket import Tickers
+from synapsis.exchanges.interfaces.coinbase_pro import coinbase_pro_websocket_utils
+from synapsis.exchanges.interfaces.message_parser import compile_extractors, extract, get_loads, merge_fields
+
+binance_trade = {'e': 'aggTrade', 'E': 1620331254432, 's': 'BTCUSDT', 'a': 12345, 'p': '56178.52', 'q': '0.25',
+                 'f': 100, 'l': 105, 'T': 1620331254430, 'm': True, 'M': True}
+
+coinbase_ticker = {'type': 'ticker', 'sequence': 24587251151, 'product_id': 'BTC-USD', 'price': '56178.52',
+                   'best_bid': '56171.12', 'best_ask': '56178.53', 'side': 'sell', 'time': 1620331254.43236,
+                   'trade_id': 165659167, 'last_size': '0.04'}
+
+
+@pytest.fixture(autouse=True)
+def preferences():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+
+
+@pytest.mark.parametrize('backend', ['auto', 'json'])
+def test_backends_decode_the_same(backend):
+    raw = json.dumps(binance_trade)
+    assert get_loads(backend)(raw) == binance_trade
+    with pytest.raises(ValueError):
+        get_loads('simdjson')
+
+
+@pytest.mark.parametrize('utils, raw', [(binance_websocket_utils, binance_trade),
+                                        (coinbase_pro_websocket_utils, coinbase_ticker)])
+def test_extracted_fields_match_the_interface(utils, raw):
+    normalized = utils.trade_interface(dict(raw))
+    extracted = extract(raw, compile_extractors(utils.trade_fields, tuple(utils.trade_fields)))
+    for field, value in extracted.items():
+        assert value == normalized[field]
+
+
+def test_fields_are_merged_from_callbacks():
+    assert merge_fields((), ('price',)) == ('price',)
+    assert merge_fields(('price',), ('price', 'size')) == ('price', 'size')
+    assert merge_fields(('price',), None) is None
+    assert merge_fields(None, ('price',)) is None
+    # Every field has to be extractable, otherwise the message is normalized as usual
+    assert compile_extractors(binance_websocket_utils.trade_fields, ('price', 'best_bid')) is None
+    assert compile_extractors(binance_websocket_utils.trade_fields, ()) is None
+
+
+def test_ticker_only_parses_declared_fields():
+    ticker = Tickers('btcusdt', 'aggTrade', initially_stopped=True)
+    ticks = []
+    ticker.append_callback(lambda tick: ticks.append(tick), fields=('price',))
+    ticker.on_message(None, json.dumps(binance_trade))
+    # The fields kept in the ticker feed are extracted too, the trade id isn't
+    assert ticks[-1] == {'price': 56178.52, 'symbol': 'BTC-USDT', 'time': 1620331254.43, 'size': 0.25}
+    assert ticker.most_recent_tick == ticks[-1]
+    assert ticker.ticker_feed.to_list('size') == [0.25]
+
+    # A callback that reads the whole tick turns full normalization back on
+    ticker.append_callback(lambda tick: None)
+    ticker.on_message(None, json.dumps(binance_trade))
+    assert ticks[-1]['symbol'] == 'BTC-USDT' and ticks[-1]['size'] == 0.25
@@ -0,0 +1,91 @@
+"""
+    Tests for websocket health metrics and the staleness watchdog
+    Copyright (C) 2022  Emerson Dove
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published
+    by the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+import json
+import time
+
+import pytest
+
+import synapsis
+from synapsis.exchanges.interfaces.binance.binance_websocket import Tickers
+from synapsis.exchanges.interfaces.websocket_health import WebsocketHealth, WebsocketWatchdog
+from synapsis.exchanges.managers.general_stream_manager import GeneralManager
+from synapsis.exchanges.managers.websocket_manager import WebsocketManager
+
+
+@pytest.fixture(autouse=True)
+def preferences():
+    synapsis.utils.load_user_preferences('./tests/config/settings.json')
+
+
+def test_health_measures_latency_and_callbacks():
+    health = WebsocketHealth('BTC-USD@ticker')
+    assert health.get_stats()['seconds_since_message'] is None
+
+    # Milliseconds are detected the same as seconds
+    health.record_message(time.time() * 1000 - 500)
+    health.record_callbacks(0.25)
+    health.record_reconnect()
+
+    stats = health.get_stats()
+    assert stats['messages'] == 1 and stats['reconnects'] == 1
+    assert 0.5 <= stats['latency'] < 1.5
+    assert stats['callback_time'] == stats['max_callback_time'] == 0.25
+    assert stats['seconds_since_message'] < 1
+
+
+def test_watchdog_raises_stale_and_recovered_events():
+    health = {'binance': {'BTCUSDT': {'seconds_since_message': 45.0, 'age': 100.0}}}
+    exported = []
+    watchdog = WebsocketWatchdog(lambda: health, callback=lambda event: None, stale_after=30,
+                                 export=exported.append)
+
+    events = watchdog.check()
+    assert [(event['symbol'], event['stale']) for event in events] == [('BTCUSDT', True)]
+    # Staying stale doesn't raise another event
+    assert watchdog.check() == []
+
+    health['binance']['BTCUSDT']['seconds_since_message'] = 1.0
+    assert [event['stale'] for event in watchdog.check()] == [False]
+    assert len(exported) == 3
+
+
+def test_manager_reports_websocket_health():
+    ticker = Tickers('btcusdt', 'aggTrade', initially_stopped=True)
+    manager = WebsocketManager({'binance': {'BTCUSDT': ticker}}, 'BTC-USDT', 'binance')
+    trade = {'e': 'aggTrade', 'E': int(time.time() * 1000), 's': 'BTCUSDT', 'a': 1, 'p': '100.0', 'q': '1.0',
+             'T': int(time.time() * 1000)}
+    for _ in range(3):
+        ticker.on_message(None, json.dumps(trade))
+
+    stats = manager.get_health()
+    assert stats['messages'] == 3
+    assert stats['latency'] is not None
+    assert manager.get_all_health()['binance']['BTCUSDT']['messages'] == 3
+
+
+def test_general_health_leaves_the_selected_channel():
+    manager = GeneralManager('binance', 'BTC-USDT')
+    trades = {'binance': {'BTCUSDT': Tickers('btcusdt', 'aggTrade', initially_stopped=True)}}
+    depth = {'binance': {'BTCUSDT': Tickers('btcusdt', 'depth', initially_stopped=True)}}
+    manager._GeneralManager__websockets.update({'aggTrade': trades, 'depth': depth})
+    manager.websockets = depth
+
+    assert set(manager.get_all_health()['binance']) == {'BTCUSDT@aggTrade', 'BTCUSDT@depth'}
+    assert set(manager.get_all_health('aggTrade')['binance']) == {'BTCUSDT'}
+    # A user call on another thread could be reading the selected channel
+    assert manager.websockets is depth